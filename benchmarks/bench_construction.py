@@ -0,0 +1,56 @@
+"""
+Compare the throughput of validated construction (model_validate, what all()/get() do by default) with the
+fast read mode (trusted construction, see wooODM.fast) and with validating fast items later on.
+
+    python benchmarks/bench_construction.py [--items 2000] [--repeat 5]
+"""
+import argparse
+from time import perf_counter
+
+from wooODM.fast import trusted, record_class
+from wooODM.orders.order import Order
+from wooODM.products.product import Product
+
+from samples import order_data, product_data
+
+
+def best_rate(function, payloads, repeat: int) -> float:
+    """
+    Returns the best throughput (items per second) of `function` over `repeat` runs.
+    """
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        for data in payloads:
+            function(data)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(payloads) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000, help="Number of payloads per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the best one is reported")
+    args = parser.parse_args()
+
+    for model, sample in [(Product, product_data), (Order, order_data)]:
+        payloads = [sample(item_id) for item_id in range(1, args.items + 1)]
+        record = record_class(model, ("id", "status", "date_modified_gmt"))
+        strategies = {
+            "model_validate": model.model_validate,
+            "model_construct": lambda data: model.model_construct(**data),
+            "fast (trusted)": lambda data: trusted(model, data),
+            "fast + ensure_validated": lambda data: trusted(model, data).ensure_validated(),
+            "record (3 fields)": record.model_validate,
+        }
+        baseline = None
+        print(f"{model.__name__} ({args.items} items, best of {args.repeat})")
+        for name, function in strategies.items():
+            rate = best_rate(function, payloads, args.repeat)
+            baseline = baseline or rate
+            print(f"  {name:<26}{rate:>12,.0f} items/s {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
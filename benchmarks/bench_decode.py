@@ -0,0 +1,60 @@
+"""
+Compare decoding list responses with the stdlib (response.json() then model_validate, what all() does by default)
+with orjson decoding and with validating the raw bytes directly (raw_json, see wooODM.decode).
+
+    python benchmarks/bench_decode.py [--page-size 100] [--pages 20] [--repeat 5]
+"""
+import argparse
+import json
+from time import perf_counter
+
+from wooODM.decode import loads, orjson, validate_list
+from wooODM.orders.order import Order
+
+from samples import order_data
+
+
+def best_rate(function, pages, items: int, repeat: int) -> float:
+    """
+    Returns the best throughput (items per second) of `function` over `repeat` runs.
+    """
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        for content in pages:
+            function(content)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return items / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100, help="Number of orders per page")
+    parser.add_argument("--pages", type=int, default=20, help="Number of pages per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the best one is reported")
+    args = parser.parse_args()
+
+    pages = [
+        json.dumps([order_data(page * args.page_size + i) for i in range(args.page_size)]).encode()
+        for page in range(args.pages)
+    ]
+    strategies = {
+        "json.loads + model_validate": lambda content: [Order.model_validate(item) for item in json.loads(content)],
+        "validate_json (raw bytes)": lambda content: validate_list(Order, content),
+    }
+    if orjson is not None:
+        strategies["orjson.loads + model_validate"] = lambda content: [Order.model_validate(item) for item in loads(content)]
+
+    items = args.page_size * args.pages
+    size = sum(len(content) for content in pages) / len(pages) / 1024
+    print(f"Order ({args.pages} pages of {args.page_size}, {size:,.0f} KiB per page, best of {args.repeat})")
+    baseline = None
+    for name, function in strategies.items():
+        rate = best_rate(function, pages, items, args.repeat)
+        baseline = baseline or rate
+        print(f"  {name:<32}{rate:>12,.0f} items/s {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Realistic WooCommerce REST API payloads used by the benchmarks.
+"""
+
+
+def product_data(item_id: int) -> dict:
+    """
+    A product as returned by GET /products/<id>, with images, categories, attributes and meta data.
+    """
+    return {
+        "id": item_id,
+        "name": f"Awesome Shirt {item_id}",
+        "slug": f"awesome-shirt-{item_id}",
+        "permalink": f"https://shop.example/product/awesome-shirt-{item_id}/",
+        "date_created": "2024-03-01T10:15:00",
+        "date_created_gmt": "2024-03-01T09:15:00",
+        "date_modified": "2024-05-12T08:00:00",
+        "date_modified_gmt": "2024-05-12T07:00:00",
+        "type": "variable",
+        "status": "publish",
+        "featured": False,
+        "catalog_visibility": "visible",
+        "description": "<p>A really awesome shirt, made of organic cotton.</p>" * 4,
+        "short_description": "<p>A really awesome shirt.</p>",
+        "sku": f"SHIRT-{item_id}",
+        "price": "29.99",
+        "regular_price": "29.99",
+        "sale_price": "",
+        "on_sale": False,
+        "purchasable": True,
+        "total_sales": 42,
+        "virtual": False,
+        "downloadable": False,
+        "tax_status": "taxable",
+        "manage_stock": True,
+        "stock_quantity": 20,
+        "stock_status": "instock",
+        "weight": "0.3",
+        "dimensions": {"length": "30", "width": "20", "height": "2"},
+        "shipping_class": "",
+        "reviews_allowed": True,
+        "average_rating": "4.50",
+        "rating_count": 8,
+        "related_ids": [item_id + 1, item_id + 2, item_id + 3],
+        "parent_id": 0,
+        "categories": [{"id": 9, "name": "Clothing", "slug": "clothing"}, {"id": 14, "name": "T-shirts", "slug": "t-shirts"}],
+        "tags": [{"id": 3, "name": "Summer", "slug": "summer"}],
+        "images": [
+            {
+                "id": 100 + index,
+                "date_created": "2024-03-01T10:15:00",
+                "date_created_gmt": "2024-03-01T09:15:00",
+                "date_modified": "2024-03-01T10:15:00",
+                "date_modified_gmt": "2024-03-01T09:15:00",
+                "src": f"https://shop.example/wp-content/uploads/shirt-{item_id}-{index}.jpg",
+                "name": f"shirt-{item_id}-{index}",
+                "alt": "",
+            }
+            for index in range(3)
+        ],
+        "attributes": [
+            {"id": 1, "name": "Size", "position": 0, "visible": True, "variation": True, "options": ["S", "M", "L", "XL"]},
+            {"id": 2, "name": "Color", "position": 1, "visible": True, "variation": True, "options": ["Blue", "Red"]},
+        ],
+        "default_attributes": [],
+        "variations": [item_id * 10 + index for index in range(8)],
+        "menu_order": 0,
+        "meta_data": [{"id": 500 + index, "key": f"_meta_{index}", "value": f"value {index}"} for index in range(5)],
+        "_links": {"self": [{"href": f"https://shop.example/wp-json/wc/v3/products/{item_id}"}]},
+    }
+
+
+def order_data(item_id: int) -> dict:
+    """
+    An order as returned by GET /orders/<id>, with addresses, line items and shipping lines.
+    """
+    address = {
+        "first_name": "John", "last_name": "Doe", "company": "", "address_1": "969 Market", "address_2": "",
+        "city": "San Francisco", "state": "CA", "postcode": "94103", "country": "US",
+    }
+    return {
+        "id": item_id,
+        "parent_id": 0,
+        "number": str(item_id),
+        "order_key": f"wc_order_{item_id}",
+        "created_via": "checkout",
+        "version": "8.9.0",
+        "status": "processing",
+        "currency": "USD",
+        "date_created": "2024-05-12T08:00:00",
+        "date_created_gmt": "2024-05-12T07:00:00",
+        "date_modified": "2024-05-12T08:05:00",
+        "date_modified_gmt": "2024-05-12T07:05:00",
+        "discount_total": "0.00",
+        "discount_tax": "0.00",
+        "shipping_total": "10.00",
+        "shipping_tax": "0.00",
+        "cart_tax": "1.35",
+        "total": "71.33",
+        "total_tax": "1.35",
+        "prices_include_tax": False,
+        "customer_id": 26,
+        "customer_ip_address": "127.0.0.1",
+        "customer_user_agent": "Mozilla/5.0",
+        "customer_note": "",
+        "billing": {**address, "email": "john.doe@example.com", "phone": "(555) 555-5555"},
+        "shipping": address,
+        "payment_method": "bacs",
+        "payment_method_title": "Direct Bank Transfer",
+        "transaction_id": "",
+        "date_paid": "2024-05-12T08:05:00",
+        "date_paid_gmt": "2024-05-12T07:05:00",
+        "date_completed": None,
+        "date_completed_gmt": None,
+        "cart_hash": "",
+        "meta_data": [{"id": 900, "key": "_source", "value": "web"}],
+        "line_items": [
+            {
+                "id": item_id * 10 + index, "name": f"Awesome Shirt {index}", "product_id": 100 + index,
+                "variation_id": 0, "quantity": 2, "tax_class": "", "subtotal": "59.98", "subtotal_tax": "0.45",
+                "total": "59.98", "total_tax": "0.45", "taxes": [{"id": 75, "total": "0.45", "subtotal": "0.45"}],
+                "meta_data": [], "sku": f"SHIRT-{100 + index}", "price": "29.99",
+            }
+            for index in range(3)
+        ],
+        "tax_lines": [{"id": 318, "rate_code": "US-CA-STATE TAX", "rate_id": 75, "label": "State Tax",
+                       "compound": False, "tax_total": "1.35", "shipping_tax_total": "0.00", "meta_data": []}],
+        "shipping_lines": [{"id": 317, "method_title": "Flat Rate", "method_id": "flat_rate", "total": "10.00",
+                            "total_tax": "0.00", "taxes": [], "meta_data": []}],
+        "fee_lines": [],
+        "coupon_lines": [],
+        "refunds": [],
+        "_links": {"self": [{"href": f"https://shop.example/wp-json/wc/v3/orders/{item_id}"}]},
+    }
@@ -0,0 +1,240 @@
+"""
+Benchmark suite for the hot paths of the ODM, saving the results as JSON so versions can be compared.
+It covers decoding and validating 100-item Product and Order pages, building save payloads of large products,
+pagination throughput against a local MockServer at several latencies, and the peak memory of iterating
+over a full catalog.
+
+    python benchmarks/suite.py [--quick] [--output results/current.json] [--compare results/baseline.json]
+
+With --compare, metrics more than --threshold (10% by default) worse than the baseline are reported as
+regressions and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from time import perf_counter
+
+from wooODM.core import WooCommerce
+from wooODM.decode import validate_list
+from wooODM.mock import MockServer, MockStore
+from wooODM.orders.order import Order
+from wooODM.products.product import Product
+
+from samples import order_data, product_data
+
+BENCHMARKS = []  # (name, unit, higher_is_better, function)
+
+
+def benchmark(name: str, unit: str, higher_is_better: bool = True):
+    """
+    Register a benchmark function, called with the parsed arguments and returning a single value.
+    """
+    def register(function):
+        BENCHMARKS.append((name, unit, higher_is_better, function))
+        return function
+    return register
+
+
+def best_rate(function, count: int, repeat: int) -> float:
+    """
+    Returns the best throughput (`count` per second) of `function` over `repeat` runs.
+    """
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def page(sample, size: int = 100) -> bytes:
+    return json.dumps([sample(item_id) for item_id in range(1, size + 1)]).encode()
+
+
+def large_product(item_id: int = 1) -> dict:
+    """
+    A product with many images, attributes and meta data, like the ones imported from an ERP.
+    """
+    data = product_data(item_id)
+    data["images"] = data["images"] * 10
+    data["attributes"] = [{**data["attributes"][0], "id": index, "name": f"Attribute {index}"} for index in range(20)]
+    data["meta_data"] = [{"id": index, "key": f"_erp_{index}", "value": {"code": index, "label": "x" * 40}}
+                         for index in range(200)]
+    return data
+
+
+def catalog(items: int) -> MockStore:
+    return MockStore({"products": [product_data(item_id) for item_id in range(100, 100 + items)]})
+
+
+# Decoding and validation of list responses
+
+def validation_benchmarks(model, sample):
+    content = page(sample)
+    prefix = f"validate.{model.__name__.lower()}_page"
+
+    @benchmark(f"{prefix}.model_validate", "pages/s")
+    def model_validate(args):
+        def run():
+            for _ in range(args.pages):
+                [model.model_validate(item) for item in json.loads(content)]
+        return best_rate(run, args.pages, args.repeat)
+
+    @benchmark(f"{prefix}.validate_json", "pages/s")
+    def validate_json(args):
+        def run():
+            for _ in range(args.pages):
+                validate_list(model, content)
+        return best_rate(run, args.pages, args.repeat)
+
+
+validation_benchmarks(Product, product_data)
+validation_benchmarks(Order, order_data)
+
+
+# Save payloads
+
+@benchmark("save.large_product.create", "payloads/s")
+def save_create(args):
+    data = large_product()
+    del data["id"]
+    product = Product.model_validate(data)
+    return best_rate(lambda: [product._prepare_save() for _ in range(args.payloads)], args.payloads, args.repeat)
+
+
+@benchmark("save.large_product.update_one_field", "payloads/s")
+def save_update(args):
+    product = Product.model_validate(large_product())._take_snapshot()
+
+    def run():
+        for number in range(args.payloads):
+            product.stock_quantity = number
+            product._prepare_save()
+    return best_rate(run, args.payloads, args.repeat)
+
+
+# Pagination against a local server
+
+def iterate(server: MockServer, **kwargs) -> int:
+    WooCommerce.init(server.url, "ck_bench", "cs_bench")
+    try:
+        return sum(1 for _ in Product.iter_all(**kwargs))
+    finally:
+        WooCommerce.get_connection().close()
+        WooCommerce.remove()
+
+
+def pagination_benchmark(latency: float, workers: int = None):
+    mode = f"workers_{workers}" if workers else "sequential"
+
+    @benchmark(f"pagination.latency_{latency * 1000:g}ms.{mode}", "items/s")
+    def pagination(args):
+        with MockServer(catalog(args.catalog), latency=latency) as server:
+            return best_rate(lambda: iterate(server, workers=workers), args.catalog, args.repeat)
+
+
+for latency in (0.0, 0.005, 0.02):
+    pagination_benchmark(latency)
+    pagination_benchmark(latency, workers=4)
+
+
+# Memory
+
+def memory_benchmark(fast: bool):
+    @benchmark(f"memory.iter_all.{'fast' if fast else 'validated'}.peak", "MiB", higher_is_better=False)
+    def peak_memory(args):
+        # The in-process server's page buffers are traced too, they are the same for every version
+        with MockServer(catalog(args.catalog)) as server:
+            tracemalloc.start()
+            try:
+                iterate(server, fast=fast)
+                return tracemalloc.get_traced_memory()[1] / 2 ** 20
+            finally:
+                tracemalloc.stop()
+
+
+memory_benchmark(fast=False)
+memory_benchmark(fast=True)
+
+
+def environment() -> dict:
+    try:
+        package_version = version("wooODM")
+    except PackageNotFoundError:
+        package_version = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "version": package_version,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Print the change of every metric against the baseline. Returns the names of the regressions.
+    """
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or baseline.get('version')} ({baseline.get('date')})")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        change = result["value"] / previous["value"] - 1 if previous["value"] else 0.0
+        worse = -change if result["higher_is_better"] else change
+        flag = "REGRESSION" if worse > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"  {name:<52}{change:>+8.1%} {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads, for a fast sanity check")
+    parser.add_argument("--repeat", type=int, default=None, help="Number of runs, the best one is reported")
+    parser.add_argument("--filter", default="", help="Only run the benchmarks whose name contains this text")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="A JSON file of earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+    args.repeat = args.repeat or (1 if args.quick else 5)
+    args.pages = 2 if args.quick else 20  # 100-item pages per run
+    args.payloads = 20 if args.quick else 200  # Save payloads per run
+    args.catalog = 300 if args.quick else 2000  # Products served by the MockServer
+
+    results = {}
+    for name, unit, higher_is_better, function in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        value = function(args)
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"  {name:<52}{value:>14,.1f} {unit}")
+
+    report = {**environment(), "results": results}
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from .instrumentation import measure, request_event
+
+MAX_BATCH_SIZE = 100  # The largest number of objects accepted by a WooCommerce /batch request
+
+
+@dataclass
+class BatchError:
+    """
+    An item of a batch request that WooCommerce refused to create, update or delete.
+    """
+    item: Any  # The model object the error belongs to
+    action: str  # One of "create", "update" or "delete"
+    code: Optional[str] = None  # WooCommerce error code, e.g. "woocommerce_rest_product_invalid_id"
+    message: Optional[str] = None  # Human readable error message
+    data: Any = None  # Additional error data returned by WooCommerce
+
+    def __repr__(self):
+        return f"BatchError(action={self.action}, item={self.item!r}, code={self.code}, message={self.message})"
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of save_many/delete_many. Failed items are collected in `errors` instead of raising.
+    """
+    created: List[Any] = field(default_factory=list)  # Created objects, updated with the response
+    updated: List[Any] = field(default_factory=list)  # Updated objects, updated with the response
+    deleted: List[Any] = field(default_factory=list)  # Deleted objects
+    unchanged: List[Any] = field(default_factory=list)  # Objects which were not sent, since nothing changed
+    errors: List[BatchError] = field(default_factory=list)  # Items which failed
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if every item of the batch succeeded.
+        """
+        return not self.errors
+
+    def merge(self, other: "BatchResult"):
+        self.created.extend(other.created)
+        self.updated.extend(other.updated)
+        self.deleted.extend(other.deleted)
+        self.unchanged.extend(other.unchanged)
+        self.errors.extend(other.errors)
+        return self
+
+
+def chunk_batch(create: list, update: list, delete: list, batch_size: int = MAX_BATCH_SIZE):
+    """
+    Split create/update/delete lists into (create, update, delete) chunks of at most `batch_size` objects in total.
+    """
+    assert 0 < batch_size <= MAX_BATCH_SIZE, f"batch_size must be between 1 and {MAX_BATCH_SIZE}"
+    queue = [("create", item) for item in create] + \
+            [("update", item) for item in update] + \
+            [("delete", item) for item in delete]
+    for start in range(0, len(queue), batch_size):
+        chunk = {"create": [], "update": [], "delete": []}
+        for action, item in queue[start:start + batch_size]:
+            chunk[action].append(item)
+        yield chunk["create"], chunk["update"], chunk["delete"]
+
+
+def _batch_error(item, action: str, response_item: dict) -> Optional[BatchError]:
+    error = response_item.get("error") if isinstance(response_item, dict) else None
+    if not error:
+        return None
+    return BatchError(item, action, error.get("code"), error.get("message"), error.get("data"))
+
+
+def run_batch(wcapi, endpoint: str, create: list = (), update: list = (), delete: list = (),
+              batch_size: int = MAX_BATCH_SIZE, hooks: list = ()) -> BatchResult:
+    """
+    Send create/update/delete operations to a WooCommerce /batch endpoint, `batch_size` objects per request.
+    Created and updated objects are refreshed with the data returned by WooCommerce, the same way save() does.
+    Objects to update which have no changes since they were loaded are skipped and reported as `unchanged`.
+    Args:
+        wcapi: The WooCommerce API instance.
+        endpoint (str): The batch endpoint, e.g. "products/batch".
+        create (list): Model objects to create.
+        update (list): Model objects to update.
+        delete (list): Model objects to delete.
+        batch_size (int): Maximum number of objects per request (100 at most).
+        hooks (list): RequestHook objects notified of each request.
+    """
+    result = BatchResult()
+    for create_chunk, update_chunk, delete_chunk in chunk_batch(list(create), list(update), list(delete), batch_size):
+        data = {}
+        if create_chunk:
+            data["create"] = [item._prepare_save()[2] for item in create_chunk]
+
+        updates = []
+        for item in update_chunk:
+            prepared = item._prepare_save()
+            if prepared is None:
+                result.unchanged.append(item)
+            else:
+                updates.append((item, prepared[2]))
+        update_chunk = [item for item, _ in updates]
+        if updates:
+            data["update"] = [payload for _, payload in updates]
+
+        if delete_chunk:
+            data["delete"] = [item.id for item in delete_chunk]
+
+        if not data:
+            continue
+        with request_event(hooks, "POST", endpoint):
+            response = wcapi.post(endpoint, data)
+            if response.status_code != 200:
+                raise Exception(response.json().get("message", "Unknown error"))
+            with measure("decode"):
+                response = response.json()
+            result.merge(apply_batch_response(response, create_chunk, update_chunk, delete_chunk))
+    return result
+
+
+def apply_batch_response(response: dict, create: list, update: list, delete: list) -> BatchResult:
+    """
+    Map the items of a batch response back onto the objects that were sent, in order.
+    """
+    result = BatchResult()
+    for action, items, done in (("create", create, result.created), ("update", update, result.updated)):
+        for item, response_item in zip(items, response.get(action, [])):
+            error = _batch_error(item, action, response_item)
+            if error:
+                result.errors.append(error)
+                continue
+            item._apply_batch_item(response_item)
+            done.append(item)
+
+    for item, response_item in zip(delete, response.get("delete", [])):
+        error = _batch_error(item, "delete", response_item)
+        if error:
+            result.errors.append(error)
+        else:
+            item._forget()
+            result.deleted.append(item)
+    return result
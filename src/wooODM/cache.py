@@ -0,0 +1,303 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic, time
+from typing import Optional
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a ModelCache, useful to size it and to pick TTLs.
+    """
+    hits: int = 0  # Lookups answered by the cache
+    misses: int = 0  # Lookups which had to go to WooCommerce
+    evictions: int = 0  # Entries dropped because they expired or the cache was full
+    identity_hits: int = 0  # Lookups answered by the identity map of the current unit of work
+    size: int = 0  # Number of entries currently stored
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by ModelCache. Values are the JSON-compatible dicts returned by WooCommerce.
+    """
+    evictions = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return the value stored under `key`, None if it is missing or expired.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: dict, ttl: Optional[float] = None):
+        """
+        Store `value` under `key` for `ttl` seconds (forever if None).
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """
+    An in-process LRU cache with per-entry expiration.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (None if ttl is None else monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    An on-disk cache in a SQLite database, which can be shared by several worker processes.
+    Least recently used entries are dropped once `max_size` is exceeded.
+    """
+
+    def __init__(self, path: str, max_size: Optional[int] = None):
+        self.path = path
+        self.max_size = max_size
+        self.evictions = 0
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS wooodm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._connection().execute("CREATE INDEX IF NOT EXISTS wooodm_cache_accessed ON wooodm_cache (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared between threads, so each thread opens its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[dict]:
+        db = self._connection()
+        row = db.execute("SELECT value, expires_at FROM wooodm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time()
+        if expires_at is not None and expires_at <= now:
+            db.execute("DELETE FROM wooodm_cache WHERE key = ?", (key,))
+            self.evictions += 1
+            return None
+        db.execute("UPDATE wooodm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None):
+        db = self._connection()
+        now = time()
+        db.execute(
+            "INSERT OR REPLACE INTO wooodm_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), None if ttl is None else now + ttl, now)
+        )
+        if self.max_size is not None:
+            deleted = db.execute(
+                "DELETE FROM wooodm_cache WHERE key IN ("
+                "SELECT key FROM wooodm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,)
+            ).rowcount
+            self.evictions += max(deleted, 0)
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM wooodm_cache WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM wooodm_cache")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM wooodm_cache").fetchone()[0]
+
+
+class ModelCache:
+    """
+    Read cache for get() lookups, keyed by the endpoint of the item (e.g. "products/123").
+    Args:
+        backend (CacheBackend): Where the items are stored, an in-process MemoryBackend by default.
+        ttl (float): Default number of seconds an item stays valid, None to keep items until evicted.
+        ttls (dict): TTL overrides per model, keyed by model class or class name, e.g. {"Order": 30}.
+            A TTL of 0 disables caching for that model.
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttl: Optional[float] = 60, ttls: dict = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.ttls = {(key if isinstance(key, str) else key.__name__): value for key, value in (ttls or {}).items()}
+        self.hits = 0
+        self.misses = 0
+        self.identity_hits = 0
+
+    def ttl_for(self, cls) -> Optional[float]:
+        return self.ttls.get(cls.__name__, self.ttl)
+
+    def get(self, cls, key: str) -> Optional[dict]:
+        """
+        Return the data cached for the item, None on a miss.
+        """
+        if self.ttl_for(cls) == 0:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, cls, key: str, value: dict):
+        ttl = self.ttl_for(cls)
+        if ttl != 0:
+            self.backend.set(key, value, ttl)
+
+    def invalidate(self, key: str):
+        self.backend.delete(key)
+
+    def clear(self):
+        self.backend.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.backend.evictions,
+            identity_hits=self.identity_hits,
+            size=len(self.backend)
+        )
+
+
+_identity_map: ContextVar[Optional[dict]] = ContextVar("wooodm_identity_map", default=None)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Within this block, repeated get() calls for the same item return the same instance.
+    The identity map is bound to the current thread or asyncio task, and holds one map per connection
+    since two stores may have items with the same endpoint.
+    """
+    token = _identity_map.set({})
+    try:
+        yield _identity_map.get()
+    finally:
+        _identity_map.reset(token)
+
+
+def _identities(connection) -> Optional[dict]:
+    """
+    Returns the identity map of a connection in the current unit of work, None outside of one.
+    """
+    identity = _identity_map.get()
+    if identity is None:
+        return None
+    return identity.setdefault(connection, {})
+
+
+def lookup(connection, cls, key: str):
+    """
+    Return the item stored under `key` in the identity map or in the cache of the connection,
+    None if it has to be fetched.
+    """
+    cache = connection.cache
+    identity = _identities(connection)
+    if identity is not None and key in identity:
+        if cache is not None:
+            cache.identity_hits += 1
+        return identity[key]
+
+    if cache is None:
+        return None
+    data = cache.get(cls, key)
+    if data is None:
+        return None
+    item = cls.model_validate(data)._take_snapshot()
+    if identity is not None:
+        identity[key] = item
+    return item
+
+
+def remember(connection, cls, key: str, item, data: dict = None):
+    """
+    Record an item fetched from WooCommerce in the identity map and, if `data` is given, in the cache
+    of the connection.
+    """
+    identity = _identities(connection)
+    if identity is not None:
+        identity[key] = item
+    if connection.cache is not None and data is not None:
+        connection.cache.set(cls, key, data)
+    return item
+
+
+def forget(connection, key: str, keep=None):
+    """
+    Invalidate the cached data of an item after it was saved or deleted.
+    If `keep` is given, it stays the instance returned by the identity map.
+    """
+    if connection.cache is not None:
+        connection.cache.invalidate(key)
+    identity = _identities(connection)
+    if identity is not None:
+        if keep is None:
+            identity.pop(key, None)
+        else:
+            identity[key] = keep
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from .cache import MemoryBackend
+
+
+@dataclass
+class _Validated:
+    etag: Optional[str]  # ETag header of the last 200 response
+    last_modified: Optional[str]  # Last-Modified header of the last 200 response
+    value: Any  # What the response was parsed into (a model or a Page)
+
+
+class ConditionalStore:
+    """
+    Remembers the ETag/Last-Modified validators and the parsed result of get()/all() requests, per URL,
+    so repeated reads can be revalidated with If-None-Match/If-Modified-Since. A 304 response returns the
+    previously parsed result without downloading or validating anything.
+    For servers which ignore those headers, items whose `date_modified_gmt` did not change are not validated
+    again either: the previously parsed instance is reused.
+    Note that, like the identity map, the store hands out the same instances it handed out before.
+    Args:
+        max_size (int): Maximum number of responses and items remembered (least recently used are dropped).
+        compare_modified (bool): Reuse items with an unchanged date_modified_gmt from 200 responses.
+    """
+
+    def __init__(self, max_size: int = 10000, compare_modified: bool = True):
+        self.compare_modified = compare_modified
+        self._responses = MemoryBackend(max_size)  # request key -> _Validated
+        self._items = MemoryBackend(max_size)  # item key -> (date_modified_gmt, model)
+        self.not_modified = 0  # Number of 304 responses served from the store
+        self.reused = 0  # Number of items reused because their date_modified_gmt did not change
+
+    @staticmethod
+    def key(endpoint: str, params: dict = None) -> str:
+        """
+        Return the key of a request, e.g. "products?page=2&per_page=100".
+        """
+        return f"{endpoint}?{urlencode(sorted(params.items()))}" if params else endpoint
+
+    def headers(self, key: str) -> dict:
+        """
+        Return the conditional headers to send for a request, empty if nothing is known about it yet.
+        """
+        entry = self._responses.get(key)
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def not_modified_value(self, key: str):
+        """
+        Return the result remembered for a request which was answered with 304 Not Modified.
+        """
+        entry = self._responses.get(key)
+        if entry is None:
+            raise Exception(f"Received 304 Not Modified for {key}, but no response was remembered for it.")
+        self.not_modified += 1
+        return entry.value
+
+    def store(self, key: str, response, value):
+        """
+        Remember the validators of a 200 response, together with what it was parsed into.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._responses.set(key, _Validated(etag, last_modified, value))
+        return value
+
+    def reuse(self, cls, data: dict):
+        """
+        Return the instance previously parsed from `data`, if its date_modified_gmt did not change since.
+        """
+        if not self.compare_modified or not isinstance(data, dict):
+            return None
+        modified = data.get("date_modified_gmt")
+        if modified is None or data.get("id") is None:
+            return None
+        entry = self._items.get(f"{cls.__name__}:{data['id']}")
+        if entry is None or entry[0] != modified:
+            return None
+        self.reused += 1
+        return entry[1]
+
+    def remember(self, cls, data: dict, item):
+        """
+        Remember the instance parsed from `data`, keyed by its ID and date_modified_gmt.
+        """
+        if self.compare_modified and isinstance(data, dict) and data.get("id") is not None \
+                and data.get("date_modified_gmt") is not None:
+            self._items.set(f"{cls.__name__}:{data['id']}", (data["date_modified_gmt"], item))
+        return item
+
+    def clear(self):
+        self._responses.clear()
+        self._items.clear()
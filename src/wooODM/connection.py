@@ -0,0 +1,107 @@
+from typing import Optional
+
+from .cache import ModelCache
+from .conditional import ConditionalStore
+from .transport import Transport, AsyncTransport, PoolStats
+
+
+class Connection:
+    """
+    A connection to a single WooCommerce store, with its own connection pools, rate limiter, read cache and
+    conditional store. Connections are registered by name on WooCommerce (see WooCommerce.init and WooCommerce.using).
+    Args:
+        transport: The client requests are sent with, e.g. a Transport.
+        cache (ModelCache): Optional read cache for get() lookups.
+        conditional (ConditionalStore): Optional store for conditional requests.
+        async_transport: The async client, created on first use from the credentials of `connect` if not given.
+        replica: Optional local copy of the store answering local() queries (see wooODM.replica.Replica).
+        raw_json (bool): Validate responses straight from their raw bytes instead of decoding them to dicts first
+            (when neither conditional requests nor, for get(), the read cache need the dicts), and decode
+            the others with orjson if it is installed.
+        taxonomy: Optional copy of the product taxonomies resolving product terms by name on save
+            (see wooODM.taxonomy.Taxonomy).
+        hooks (list): RequestHook objects notified of every request sent by the models (see WooCommerce.add_hook).
+    """
+
+    def __init__(self, transport=None, cache: ModelCache = None, conditional: ConditionalStore = None,
+                 async_transport=None, replica=None, raw_json: bool = False, hooks: list = None,
+                 taxonomy=None):
+        self.transport = transport
+        self.async_transport = async_transport
+        self.cache = cache
+        self.conditional = conditional
+        self.replica = replica
+        self.raw_json = raw_json
+        self.hooks = list(hooks or [])
+        self.taxonomy = taxonomy
+        self.credentials = None  # url, consumer_key and consumer_secret, set by connect()
+
+    @classmethod
+    def connect(cls, url, consumer_key, consumer_secret, cache: ModelCache = None,
+                conditional: ConditionalStore = None, raw_json: bool = False, **kwargs) -> "Connection":
+        """
+        Create a connection to the store at `url`. Keyword arguments are passed on to Transport.
+        """
+        connection = cls(
+            Transport(url=url, consumer_key=consumer_key, consumer_secret=consumer_secret, version="wc/v3", **kwargs),
+            cache=cache,
+            conditional=conditional,
+            raw_json=raw_json
+        )
+        connection.credentials = dict(url=url, consumer_key=consumer_key, consumer_secret=consumer_secret)
+        return connection
+
+    def get_instance(self):
+        """
+        Returns the client of this connection.
+        """
+        if self.transport is None:
+            raise Exception("WooCommerce API not initialized. Call WooCommerce.init() first.")
+        return self.transport
+
+    def init_async(self, max_connections: int = 100, max_keepalive_connections: int = 20, **kwargs):
+        """
+        Create the async client of this connection (see WooCommerce.init_async).
+        """
+        if self.credentials is None:
+            raise Exception("WooCommerce API not initialized. Call WooCommerce.init() first.")
+        if isinstance(self.transport, Transport):
+            kwargs.setdefault("rate_limiter", self.transport.rate_limiter)
+            kwargs.setdefault("retry", self.transport.retry)
+        self.async_transport = AsyncTransport(
+            **self.credentials,
+            version="wc/v3",
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            **kwargs
+        )
+        return self.async_transport
+
+    def get_async_instance(self):
+        """
+        Returns the async client of this connection, creating it on first use.
+        """
+        if self.async_transport is None:
+            self.init_async()
+        return self.async_transport
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """
+        Returns the usage of the connection pool, None if the client is not a pooled Transport.
+        """
+        transport = self.get_instance()
+        return transport.pool_stats() if isinstance(transport, Transport) else None
+
+    def close(self):
+        """
+        Close the connections held by the sync client.
+        """
+        if isinstance(self.transport, Transport):
+            self.transport.close()
+
+    async def aclose(self):
+        """
+        Close the connections held by the async client.
+        """
+        if self.async_transport is not None:
+            await self.async_transport.aclose()
@@ -1,44 +1,626 @@
-from datetime import date, datetime
-from typing import Optional
-from pydantic import BaseModel
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, List, Any, ClassVar, Set
+from pydantic import BaseModel, Field, PrivateAttr
 from abc import ABC, abstractmethod
-from woocommerce import API  # Install using `pip install woocommerce`
+from .transport import PoolStats
+from .connection import Connection
+from .batch import MAX_BATCH_SIZE, BatchResult, run_batch
+from .cache import ModelCache, lookup, remember, forget, unit_of_work
+from .conditional import ConditionalStore
+from .sync import SyncCursor, ChangeStream
+from .fast import loader, is_trusted
+from .decode import response_json, can_validate_json, validate_list, validate_item
+from .relations import HasRelations
+from .instrumentation import RequestHook, request_event, measure
 
 class WooCommerce:
     """
-    A singleton class to interact with the WooCommerce API.
+    Registry of the connections to WooCommerce stores. Models use the connection bound with using(),
+    or the "default" one. Bindings are stored in a context variable, so each thread and asyncio task
+    can talk to a different store.
     """
-    _instance = None
+    DEFAULT = "default"
+    _connections = {}  # name -> Connection
+    _current = ContextVar("wooODM_connection", default=None)  # Connection bound by using()
 
     def __init__(self):
         pass
 
     @classmethod
-    def init(cls, url, consumer_key, consumer_secret):
+    def init(cls, url, consumer_key, consumer_secret, cache: ModelCache = None, conditional: ConditionalStore = None,
+             name: str = DEFAULT, raw_json: bool = False, **kwargs) -> Connection:
         """
         Initializes the WooCommerce API instance.
         Args:
             url (str): The base URL for the WooCommerce store.
             consumer_key (str): The consumer key for the WooCommerce API.
             consumer_secret (str): The consumer secret for the WooCommerce API.
+            cache (ModelCache): Optional read cache for get() lookups (see set_cache).
+            conditional (ConditionalStore): Optional store for conditional requests (see set_conditional).
+            name (str): Name of the connection, to talk to several stores (see using).
+            raw_json (bool): Validate responses straight from their raw bytes (see Connection).
+            **kwargs: Passed on to Transport, e.g. pool_size (connections kept alive, match it to the number of
+                worker threads), connect_timeout, read_timeout, compression, rate_limiter (a RateLimiter shared by
+                every model) or retry (a RetryPolicy, None to disable retries).
         """
-        cls._instance = API(
-            url=url,
-            consumer_key=consumer_key,
-            consumer_secret=consumer_secret,
-            version="wc/v3"
-        )
+        return cls.register(name, Connection.connect(url, consumer_key, consumer_secret, cache, conditional, raw_json,
+                                                     **kwargs))
+
+    @classmethod
+    def register(cls, name: str, connection: Connection) -> Connection:
+        """
+        Register a connection under `name`, closing the one previously registered under it.
+        """
+        previous = cls._connections.get(name)
+        cls._connections[name] = connection
+        if previous is not None and previous is not connection:
+            previous.close()
+        return connection
+
+    @classmethod
+    def remove(cls, name: str = DEFAULT):
+        """
+        Unregister and close a connection. Its async client has to be closed with aclose() beforehand.
+        """
+        connection = cls._connections.pop(name, None)
+        if connection is not None:
+            connection.close()
+
+    @classmethod
+    def connections(cls) -> dict:
+        """
+        Returns the registered connections, by name.
+        """
+        return dict(cls._connections)
+
+    @classmethod
+    def has_connection(cls, name: str = None) -> bool:
+        """
+        Returns whether get_connection() would find a connection, instead of raising.
+        """
+        if name is None and cls._current.get() is not None:
+            return True
+        return (name or cls.DEFAULT) in cls._connections
+
+    @classmethod
+    def get_connection(cls, name: str = None) -> Connection:
+        """
+        Returns the connection registered under `name`, by default the one bound with using() or else the default one.
+        """
+        if name is None:
+            bound = cls._current.get()
+            if bound is not None:
+                return bound
+            name = cls.DEFAULT
+        connection = cls._connections.get(name)
+        if connection is None:
+            if name == cls.DEFAULT:
+                raise Exception("WooCommerce API not initialized. Call WooCommerce.init() first.")
+            raise Exception(f"No WooCommerce connection named {name!r}. Call WooCommerce.init(..., name={name!r}) first.")
+        return connection
+
+    @classmethod
+    @contextmanager
+    def using(cls, connection):
+        """
+        Context manager (or decorator) in which models use the given connection, or the one registered under that name:
+            with WooCommerce.using("eu-store"):
+                Product.get(1)
+        Threads started inside the block do not inherit it, run them with contextvars.copy_context().run.
+        """
+        if not isinstance(connection, Connection):
+            connection = cls.get_connection(connection)
+        token = cls._current.set(connection)
+        try:
+            yield connection
+        finally:
+            cls._current.reset(token)
+
+    @classmethod
+    def add_hook(cls, hook: RequestHook, name: str = None) -> RequestHook:
+        """
+        Notify a RequestHook (e.g. a MetricsCollector) of the requests sent through a connection, the current one
+        by default. Returns the hook.
+        """
+        cls.get_connection(name).hooks.append(hook)
+        return hook
+
+    @classmethod
+    def remove_hook(cls, hook: RequestHook, name: str = None):
+        """
+        Stop notifying a hook added with add_hook().
+        """
+        hooks = cls.get_connection(name).hooks
+        if hook in hooks:
+            hooks.remove(hook)
+
+    @classmethod
+    def pool_stats(cls) -> PoolStats:
+        """
+        Returns the usage of the connection pool (connections opened, idle, requests sent, ...).
+        """
+        return cls.get_connection().pool_stats()
+
+    @classmethod
+    def set_cache(cls, cache: ModelCache = None):
+        """
+        Enable (or disable, with None) the read cache used by get(). Saved or deleted items are invalidated.
+        """
+        cls.get_connection().cache = cache
+
+    @classmethod
+    def get_cache(cls) -> Optional[ModelCache]:
+        """
+        Returns the read cache, None if caching is disabled.
+        """
+        return cls.get_connection().cache
+
+    @classmethod
+    def set_conditional(cls, store: ConditionalStore = None):
+        """
+        Enable (or disable, with None) ETag/Last-Modified revalidation of get() and all() requests.
+        """
+        cls.get_connection().conditional = store
+
+    @classmethod
+    def get_conditional(cls) -> Optional[ConditionalStore]:
+        """
+        Returns the store used for conditional requests, None if they are disabled.
+        """
+        return cls.get_connection().conditional
+
+    @classmethod
+    def set_replica(cls, replica=None):
+        """
+        Set (or unset, with None) the local replica answering local() queries (see wooODM.replica.Replica).
+        """
+        cls.get_connection().replica = replica
+
+    @classmethod
+    def get_replica(cls):
+        """
+        Returns the local replica of the store, raising if there is none.
+        """
+        replica = cls.get_connection().replica
+        if replica is None:
+            raise Exception("No local replica. Call WooCommerce.set_replica() first.")
+        return replica
+
+    @classmethod
+    def set_taxonomy(cls, taxonomy=None):
+        """
+        Set (or unset, with None) the copy of the product taxonomies used to resolve the categories, tags
+        and shipping class of products by name when they are saved (see wooODM.taxonomy.Taxonomy).
+        """
+        cls.get_connection().taxonomy = taxonomy
+        return taxonomy
+
+    @classmethod
+    def get_taxonomy(cls):
+        """
+        Returns the copy of the product taxonomies, None if there is none.
+        """
+        return cls.get_connection().taxonomy
+
+    @classmethod
+    def unit_of_work(cls):
+        """
+        Context manager in which repeated get() calls for the same item return the same instance.
+        """
+        return unit_of_work()
+
+    @classmethod
+    def init_async(cls, max_connections: int = 100, max_keepalive_connections: int = 20, **kwargs):
+        """
+        Initializes the async client for the store passed to init(). Calling it is only needed to tune the pool,
+        otherwise the client is created with the default settings the first time it is used.
+        Args:
+            max_connections (int): Maximum number of concurrent connections to the store.
+            max_keepalive_connections (int): Maximum number of idle connections kept open for reuse.
+            **kwargs: Passed on to AsyncTransport (timeout, verify_ssl, query_string_auth, ...).
+                The rate limiter and retry policy of the sync client are shared unless given here.
+        """
+        return cls.get_connection().init_async(max_connections, max_keepalive_connections, **kwargs)
 
     @classmethod
     def get_instance(cls):
         """
         Returns the WooCommerce API instance.
         """
-        if cls._instance is None:
-            raise Exception("WooCommerce API not initialized. Call WooCommerce.init() first.")
-        return cls._instance
-    
-class WooBasicODM(BaseModel, ABC):
+        return cls.get_connection().get_instance()
+
+    @classmethod
+    def get_async_instance(cls):
+        """
+        Returns the async WooCommerce API instance, creating it on first use.
+        """
+        return cls.get_connection().get_async_instance()
+
+    @classmethod
+    async def aclose(cls):
+        """
+        Close the connections held by the async client.
+        """
+        await cls.get_connection().aclose()
+
+
+MAX_PER_PAGE = 100  # The largest page size accepted by the WooCommerce REST API
+
+
+@dataclass
+class Page:
+    """
+    A single page of results, together with the pagination headers returned by WooCommerce.
+    The page number can be persisted and passed back as `page` to resume iteration later.
+    """
+    number: int  # The number of this page (1-based)
+    items: List[Any] = field(default_factory=list)  # The model objects on this page
+    total: Optional[int] = None  # Total number of items (X-WP-Total header)
+    total_pages: Optional[int] = None  # Total number of pages (X-WP-TotalPages header)
+
+    @property
+    def next(self) -> Optional[int]:
+        """
+        The number of the next page, or None if this is the last one.
+        """
+        if self.total_pages is not None:
+            return self.number + 1 if self.number < self.total_pages else None
+        # Without the headers, a short page is the only sign that we reached the end
+        return self.number + 1 if self.items else None
+
+
+def _header_int(response, name: str) -> Optional[int]:
+    """
+    Read an integer header (e.g. X-WP-TotalPages) from a response, None if it is missing.
+    """
+    value = response.headers.get(name)
+    return int(value) if value is not None and value != "" else None
+
+
+def _request_event(method: str, endpoint: str):
+    """
+    Track a request sent through the current connection, if it has hooks (see wooODM.instrumentation).
+    """
+    return request_event(WooCommerce.get_connection().hooks, method, endpoint)
+
+
+def _page_params(per_page: int, page: int, params: dict = None) -> dict:
+    return {**(params or {}), "per_page": per_page, "page": page}
+
+
+def _validate(cls, data: dict):
+    """
+    Validate an item returned by WooCommerce, unless the conditional store still holds it unchanged.
+    """
+    store = WooCommerce.get_conditional()
+    if store is not None:
+        item = store.reuse(cls, data)
+        if item is not None:
+            if isinstance(item, _TrackedModel) and not is_trusted(cls):
+                item.ensure_validated()  # It may have been loaded in fast mode
+            return item
+        return store.remember(cls, data, cls.model_validate(data)._take_snapshot())
+    return cls.model_validate(data)._take_snapshot()
+
+
+def _send_get(wcapi, endpoint: str, params: dict = None, fast: bool = False):
+    """
+    Send a GET request, made conditional if a ConditionalStore is enabled.
+    Returns (response, key), where key identifies the request in the store (None if disabled).
+    For the async client, the response is a coroutine the caller awaits.
+    Fast (unvalidated) results are remembered separately from validated ones.
+    """
+    store = WooCommerce.get_conditional()
+    if store is None:
+        return (wcapi.get(endpoint, params=params) if params else wcapi.get(endpoint)), None
+    key = store.key(endpoint, params)
+    if fast:
+        key = f"fast:{key}"
+    headers = store.headers(key)
+    kwargs = {"headers": headers} if headers else {}
+    if params:
+        kwargs["params"] = params
+    return wcapi.get(endpoint, **kwargs), key
+
+
+def _handle_get(response, key: str, parse):
+    """
+    Parse the response of _send_get, returning the remembered result on 304 Not Modified.
+    """
+    store = WooCommerce.get_conditional()
+    if store is None or key is None:
+        return parse(response)
+    if response.status_code == 304:
+        return store.not_modified_value(key)
+    result = parse(response)
+    return store.store(key, response, result)
+
+
+def _raw_content(response):
+    """
+    Returns the raw body of a response if it can be validated without decoding it first (see Connection.raw_json),
+    None if the decoded data is needed (conditional requests) or decoding was not switched to the fast path.
+    """
+    connection = WooCommerce.get_connection()
+    if not connection.raw_json or connection.conditional is not None:
+        return None
+    content = getattr(response, "content", None)
+    return content if isinstance(content, (bytes, str)) else None
+
+
+def _decode(response):
+    """
+    Decode a response, with orjson if it is installed and the fast path is enabled.
+    """
+    return response_json(response) if WooCommerce.get_connection().raw_json else response.json()
+
+
+def _parse_items(cls, response) -> list:
+    """
+    Validate the items of a list response, straight from the raw bytes when possible.
+    """
+    content = _raw_content(response) if can_validate_json(cls) else None
+    if content is not None:
+        with measure("validate"):  # Decoded and validated in one pass
+            return [item._take_snapshot() for item in validate_list(cls, content)]
+    with measure("decode"):
+        data = _decode(response)
+    with measure("validate"):
+        return [_validate(cls, item) for item in data]
+
+
+def _parse_item(cls, response) -> tuple:
+    """
+    Validate the item of a single item response. Returns (item, data), where data is the decoded item,
+    None if it was validated straight from the raw bytes (the read cache is disabled then).
+    """
+    content = _raw_content(response) if can_validate_json(cls) and WooCommerce.get_cache() is None else None
+    if content is not None:
+        with measure("validate"):
+            return validate_item(cls, content)._take_snapshot(), None
+    with measure("decode"):
+        data = _decode(response)
+    with measure("validate"):
+        return _validate(cls, data), data
+
+
+def _parse_page(cls, response, page: int) -> Page:
+    """
+    Wrap the validated models of a list response in a Page.
+    """
+    if response.status_code == 200:
+        return Page(
+            number=page,
+            items=_parse_items(cls, response),
+            total=_header_int(response, "X-WP-Total"),
+            total_pages=_header_int(response, "X-WP-TotalPages"),
+        )
+
+    raise Exception(response.json().get("message", "Unknown error"))
+
+
+def _fetch_page(cls, endpoint: str, per_page: int, page: int, params: dict = None) -> Page:
+    """
+    Fetch a single page from a list endpoint and wrap the validated models in a Page.
+    """
+    wcapi = WooCommerce.get_instance()
+    with _request_event("GET", endpoint):
+        response, key = _send_get(wcapi, endpoint, _page_params(per_page, page, params), is_trusted(cls))
+        return _handle_get(response, key, lambda response: _parse_page(cls, response, page))
+
+
+async def _afetch_page(cls, endpoint: str, per_page: int, page: int, params: dict = None) -> Page:
+    """
+    Async version of _fetch_page.
+    """
+    wcapi = WooCommerce.get_async_instance()
+    with _request_event("GET", endpoint):
+        response, key = _send_get(wcapi, endpoint, _page_params(per_page, page, params), is_trusted(cls))
+        return _handle_get(await response, key, lambda response: _parse_page(cls, response, page))
+
+
+def _iter_pages(cls, endpoint: str, per_page: int, page: int, params: dict = None,
+                workers: int = None, max_in_flight: int = None, ordered: bool = True):
+    """
+    Lazily walk a list endpoint, yielding one Page at a time until the last page is reached.
+    Only a single page is kept in memory, regardless of how many items the store has.
+    When `workers` is greater than 1, the remaining pages are prefetched concurrently (see _iter_pages_parallel).
+    """
+    if workers is not None and workers > 1:
+        yield from _iter_pages_parallel(cls, endpoint, per_page, page, params, workers, max_in_flight, ordered)
+        return
+
+    current = page
+    while current is not None:
+        result = _fetch_page(cls, endpoint, per_page, current, params)
+        if not result.items:
+            return
+        yield result
+        if result.total_pages is None and len(result.items) < per_page:
+            return
+        current = result.next
+
+
+def _iter_pages_parallel(cls, endpoint: str, per_page: int, page: int, params: dict,
+                         workers: int, max_in_flight: int = None, ordered: bool = True):
+    """
+    Fetch the first page to learn the total page count, then pull the remaining pages through a thread pool.
+    At most `max_in_flight` pages (twice the number of workers by default) are requested or buffered at once.
+    Pages are yielded in page order if `ordered` is True, otherwise as soon as they arrive.
+    """
+    first = _fetch_page(cls, endpoint, per_page, page, params)
+    if not first.items:
+        return
+    yield first
+
+    if first.total_pages is None:
+        # Without the headers there is nothing to plan ahead with, so continue one page at a time
+        if len(first.items) == per_page:
+            yield from _iter_pages(cls, endpoint, per_page, page + 1, params)
+        return
+
+    max_in_flight = max(max_in_flight or workers * 2, 1)
+    remaining = iter(range(page + 1, first.total_pages + 1))
+    in_flight = {}  # page number -> future
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit():
+        for number in islice(remaining, max_in_flight - len(in_flight)):
+            # Workers run in the caller's context, so they use the connection it is bound to
+            in_flight[number] = executor.submit(copy_context().run, _fetch_page, cls, endpoint, per_page, number, params)
+
+    try:
+        submit()
+        while in_flight:
+            if ordered:
+                number = min(in_flight)
+            else:
+                done, _ = wait(in_flight.values(), return_when=FIRST_COMPLETED)
+                number = next(number for number, future in in_flight.items() if future in done)
+            result = in_flight.pop(number).result()
+            submit()
+            if result.items:
+                yield result
+    finally:
+        # Stop prefetching if the consumer stops early or a page fails
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _aiter_pages(cls, endpoint: str, per_page: int, page: int, params: dict = None):
+    """
+    Async version of _iter_pages, yielding one Page at a time until the last page is reached.
+    """
+    current = page
+    while current is not None:
+        result = await _afetch_page(cls, endpoint, per_page, current, params)
+        if not result.items:
+            return
+        yield result
+        if result.total_pages is None and len(result.items) < per_page:
+            return
+        current = result.next
+
+
+def read_only(default=None, **kwargs):
+    """
+    Declare a field set by WooCommerce itself (e.g. date_created): it is loaded, but never sent when saving.
+    """
+    return Field(default, json_schema_extra={"readOnly": True}, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _read_only_fields(cls) -> frozenset:
+    """
+    Returns the names of the fields of a model declared with read_only().
+    """
+    return frozenset(
+        name for name, info in cls.model_fields.items()
+        if isinstance(info.json_schema_extra, dict) and info.json_schema_extra.get("readOnly")
+    )
+
+
+class _TrackedModel(HasRelations):
+    """
+    Keeps a snapshot of the data a model was loaded with, so only the fields changed since then are saved.
+    """
+    _snapshot: Optional[dict] = PrivateAttr(default=None)  # model_dump() of the item as returned by WooCommerce
+    _trusted: bool = PrivateAttr(default=False)  # Loaded in fast mode, i.e. not validated yet
+    _untracked_fields: ClassVar[Set[str]] = set()  # Fields which are never sent to WooCommerce
+
+    def _take_snapshot(self):
+        """
+        Remember the current state of the item as the one stored in WooCommerce.
+        """
+        if self._trusted:
+            return self  # Raw values cannot be dumped, see ensure_validated
+        self._snapshot = self.model_dump()
+        return self
+
+    def ensure_validated(self):
+        """
+        Validate an item loaded in fast mode in place (nested objects become models, dates datetimes).
+        It is called automatically before the item is saved. Since in-place changes made before validation
+        cannot be told apart from the loaded data, such items are saved with all their fields.
+        """
+        if self._trusted:
+            validated = self.model_validate(self.__dict__)
+            self.__dict__.update(validated.__dict__)
+            self._trusted = False
+        return self
+
+    def is_validated(self) -> bool:
+        """
+        Returns False for items loaded in fast mode which were not validated yet.
+        """
+        return not self._trusted
+
+    def changed_fields(self) -> Set[str]:
+        """
+        Returns the names of the top-level fields changed since the item was loaded or saved.
+        Nested models and lists count as a single field. Items which were not loaded from WooCommerce report every field.
+        """
+        current = self.ensure_validated().model_dump()
+        if self._snapshot is None:
+            return set(current) - self._untracked_fields
+        return {
+            name for name, value in current.items()
+            if name not in self._untracked_fields and (name not in self._snapshot or self._snapshot[name] != value)
+        }
+
+    def _before_save(self):
+        """
+        Hook called before the item is sent to WooCommerce, override it to handle model-specific edge cases.
+        May return the names of fields to leave out of the request, without counting them as changes.
+        """
+        pass
+
+    def _save_target(self) -> tuple:
+        """
+        Returns the (method, endpoint) of the request saving this item.
+        """
+        raise NotImplementedError
+
+    def _prepare_save(self):
+        """
+        Returns the (method, endpoint, data) of the request saving this item, or None if there is nothing to save.
+        The data is JSON-compatible (dates are ISO strings) and never contains read-only fields or unset values.
+        Updates only contain the fields changed since the item was loaded. Fields changed to None are sent as null,
+        unless the item was not loaded from WooCommerce, whose unset fields are left untouched.
+        """
+        self.ensure_validated()
+        skipped = self._before_save() or set()
+        exclude = _read_only_fields(type(self)) | self._untracked_fields | set(skipped)
+        if self.id:
+            changed = self.changed_fields() - exclude
+            if not changed:
+                return None
+            data = self.model_dump(mode="json", include=changed | {"id"}, exclude_none=True)
+            snapshot = self._snapshot or {}
+            data.update({name: None for name in changed if name not in data and snapshot.get(name) is not None})
+        else:
+            data = self.model_dump(mode="json", exclude=exclude, exclude_none=True)
+        return (*self._save_target(), data)
+
+    def is_dirty(self) -> bool:
+        """
+        Returns True if the item has unsaved changes.
+        """
+        return bool(self.changed_fields())
+
+    def __eq__(self, other):
+        # The snapshot is bookkeeping, two items holding the same data are equal
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return self.__class__ is other.__class__ and self.__dict__ == other.__dict__ \
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+
+
+class WooBasicODM(_TrackedModel, ABC):
     """
     Abstract base class for WooCommerce models.
     """
@@ -52,63 +634,199 @@ class WooBasicODM(BaseModel, ABC):
         pass
 
     @classmethod
-    def all(cls, per_page: int = 10, page: int = 1):
+    def all(cls, per_page: int = None, page: int = 1, paginate: bool = False, fast: bool = False):
         """
         Fetch all items with pagination and return a list of model objects.
+        Args:
+            per_page (int): Number of items per page (10 by default, 100 when paginating).
+            page (int): The page to fetch, or the page to start from when paginating.
+            paginate (bool): If True, return a generator over every item starting at `page` (see iter_all).
+            fast (bool): Skip validation, values are kept as returned by WooCommerce (see ensure_validated).
         """
-        wcapi = WooCommerce.get_instance()
-        response = wcapi.get(f"{cls.endpoint()}", params={"per_page": per_page, "page": page})
+        if paginate:
+            return cls.iter_all(per_page=per_page or MAX_PER_PAGE, page=page, fast=fast)
+
+        return _fetch_page(loader(cls, fast), cls.endpoint(), per_page or 10, page).items
+
+    @classmethod
+    def iter_pages(cls, per_page: int = MAX_PER_PAGE, page: int = 1,
+                   workers: int = None, max_in_flight: int = None, ordered: bool = True, fast: bool = False):
+        """
+        Lazily iterate over all pages, starting from `page`.
+        Yields Page objects, whose `next` attribute can be stored to resume iteration later.
+        Args:
+            per_page (int): Number of items per page.
+            page (int): The page to start from.
+            workers (int): If greater than 1, prefetch the remaining pages concurrently with this many threads.
+            max_in_flight (int): Maximum number of pages requested or buffered at once (2 * workers by default).
+            ordered (bool): Yield pages in page order (True) or as soon as they arrive (False).
+            fast (bool): Skip validation, values are kept as returned by WooCommerce (see ensure_validated).
+        """
+        return _iter_pages(loader(cls, fast), cls.endpoint(), per_page, page, None, workers, max_in_flight, ordered)
+
+    @classmethod
+    def iter_all(cls, per_page: int = MAX_PER_PAGE, page: int = 1,
+                 workers: int = None, max_in_flight: int = None, ordered: bool = True, fast: bool = False):
+        """
+        Lazily iterate over all items, fetching one page at a time starting from `page`.
+        See iter_pages for the concurrent prefetching and fast mode options.
+        """
+        for result in cls.iter_pages(per_page, page, workers, max_in_flight, ordered, fast):
+            yield from result.items
+
+    @classmethod
+    def query(cls):
+        """
+        Start a chainable query with server-side filtering, ordering and field projection, e.g.
+        Product.query().filter(status="publish", category=12).order_by("modified").only("id", "sku")
+        """
+        from .query import Query
+        return Query(cls)
+
+    @classmethod
+    def local(cls):
+        """
+        Start a query over the local replica instead of the API (see WooCommerce.set_replica), e.g.
+        Product.local().filter(sku="SHIRT-1").first()
+        """
+        return WooCommerce.get_replica().query(cls)
 
+    @classmethod
+    def changed_since(cls, cursor: SyncCursor = None, per_page: int = MAX_PER_PAGE, filters: dict = None) -> ChangeStream:
+        """
+        Stream the items modified after `cursor`, oldest change first (e.g. Order.changed_since(cursor)).
+        Args:
+            cursor (SyncCursor): Where to resume from, None to go through every item once.
+            per_page (int): Number of items per request.
+            filters (dict): Additional request filters, e.g. {"status": "processing"}.
+        Returns:
+            ChangeStream: Iterate over it, and persist its `cursor` to resume the next sync from there.
+        """
+        endpoint = cls.endpoint()
+        return ChangeStream(
+            cls,
+            lambda params, page: _fetch_page(cls, endpoint, per_page, page, {**(filters or {}), **params}),
+            cursor
+        )
+
+    @classmethod
+    async def aall(cls, per_page: int = None, page: int = 1, paginate: bool = False, fast: bool = False):
+        """
+        Async version of all(). With paginate=True an async iterator over every item is returned instead (see aiter_all).
+        """
+        if paginate:
+            return cls.aiter_all(per_page=per_page or MAX_PER_PAGE, page=page, fast=fast)
+
+        return (await _afetch_page(loader(cls, fast), cls.endpoint(), per_page or 10, page)).items
+
+    @classmethod
+    def aiter_pages(cls, per_page: int = MAX_PER_PAGE, page: int = 1, fast: bool = False):
+        """
+        Async version of iter_pages, yielding one Page at a time.
+        """
+        return _aiter_pages(loader(cls, fast), cls.endpoint(), per_page, page)
+
+    @classmethod
+    async def aiter_all(cls, per_page: int = MAX_PER_PAGE, page: int = 1, fast: bool = False):
+        """
+        Async version of iter_all, fetching one page at a time starting from `page`.
+        """
+        async for result in cls.aiter_pages(per_page=per_page, page=page, fast=fast):
+            for item in result.items:
+                yield item
+
+    @classmethod
+    def _parse_get(cls, response, endpoint: str, fast: bool = False):
         if response.status_code == 200:
-            return [cls.model_validate(item) for item in response.json()]
+            item, data = _parse_item(loader(cls, fast), response)
+            return remember(WooCommerce.get_connection(), cls, endpoint, item, data)
         
         raise Exception(response.json().get("message", "Unknown error"))
-    
+
     @classmethod
-    def get(cls, item_id: int):
+    def _lookup(cls, endpoint: str, fast: bool = False):
+        cached = lookup(WooCommerce.get_connection(), loader(cls, fast), endpoint)
+        if cached is not None and not fast:
+            cached.ensure_validated()  # The identity map may hold an item loaded in fast mode
+        return cached
+
+    @classmethod
+    def get(cls, item_id: int, refresh: bool = False, fast: bool = False):
         """
         Retrieve an item from WooCommerce by ID and return a model object.
+        The cache and the identity map are used if enabled, unless `refresh` is True.
+        With `fast`, the item is not validated until it is saved (see ensure_validated).
         """
+        endpoint = cls.endpoint(item_id)
+        cached = None if refresh else cls._lookup(endpoint, fast)
+        if cached is not None:
+            return cached
+
         wcapi = WooCommerce.get_instance()
-        response = wcapi.get(cls.endpoint(item_id))
-        
-        if response.status_code == 200:
-            return cls.model_validate(response.json())
-        
-        raise Exception(response.json().get("message", "Unknown error"))
-    
-    def _remove_datetimes(self, data):
+        with _request_event("GET", endpoint):
+            response, key = _send_get(wcapi, endpoint, fast=fast)
+            return _handle_get(response, key, lambda response: cls._parse_get(response, endpoint, fast))
+
+    @classmethod
+    async def aget(cls, item_id: int, refresh: bool = False, fast: bool = False):
         """
-        Replace date or datetime objects with their ISO formatted strings, since the datetime cannot be serialized.
+        Async version of get().
         """
-        for key, value in data.items():
-            if isinstance(value, (datetime, date)):
-                data[key] = value.isoformat()
-            if isinstance(value, dict):
-                data[key] = self._remove_datetimes(value)
-        return data
+        endpoint = cls.endpoint(item_id)
+        cached = None if refresh else cls._lookup(endpoint, fast)
+        if cached is not None:
+            return cached
 
-    def save(self):
+        wcapi = WooCommerce.get_async_instance()
+        with _request_event("GET", endpoint):
+            response, key = _send_get(wcapi, endpoint, fast=fast)
+            return _handle_get(await response, key, lambda response: cls._parse_get(response, endpoint, fast))
+    
+    def _save_target(self) -> tuple:
+        return ("put", self.endpoint(self.id)) if self.id else ("post", self.endpoint())
+
+    def _apply_save(self, response):
         """
-        Save the item to WooCommerce. Updates if it has an ID, otherwise creates a new one.
+        Update the item with the saved version returned by WooCommerce.
         """
-        wcapi = WooCommerce.get_instance()
-        data = self.model_dump()
-
-        # Datetime objects need to be converted to ISO format before sending
-        data = self._remove_datetimes(data)
-                
-        response = wcapi.put(self.endpoint(self.id), data) if self.id else wcapi.post(self.endpoint(), data)
-        
         if response.status_code in [200, 201]:
-            response = self.model_validate(response.json())
-            self.__dict__.update(response.__dict__)
+            with measure("decode"):
+                data = response.json()
+            self._apply_batch_item(data)
             return self
         response = response.json()
         errorMsg = response.get("message", "Unknown error")
         errorDetails = response.get("data", {}).get("details", "")
         raise Exception(f"Error: {errorMsg} \n Details: {errorDetails}")
 
+    def save(self):
+        """
+        Save the item to WooCommerce. Updates if it has an ID, otherwise creates a new one.
+        """
+        prepared = self._prepare_save()
+        if prepared is None:
+            return self  # Nothing changed since the item was loaded
+
+        wcapi = WooCommerce.get_instance()
+        method, endpoint, data = prepared
+        with _request_event(method, endpoint):
+            response = getattr(wcapi, method)(endpoint, data)
+            return self._apply_save(response)
+
+    async def asave(self):
+        """
+        Async version of save().
+        """
+        prepared = self._prepare_save()
+        if prepared is None:
+            return self  # Nothing changed since the item was loaded
+
+        wcapi = WooCommerce.get_async_instance()
+        method, endpoint, data = prepared
+        with _request_event(method, endpoint):
+            response = await getattr(wcapi, method)(endpoint, data)
+            return self._apply_save(response)
+
     def delete(self):
         """
         Delete the item from WooCommerce.
@@ -117,16 +835,95 @@ class WooBasicODM(BaseModel, ABC):
             raise Exception("Item has no ID. Cannot delete.")
         
         wcapi = WooCommerce.get_instance()
-        response = wcapi.delete(self.endpoint(self.id), params={"force": True})
-        return self.model_validate(response.json())
+        endpoint = self.endpoint(self.id)
+        with _request_event("DELETE", endpoint):
+            response = wcapi.delete(endpoint, params={"force": True})
+            self._forget()
+            with measure("decode"):
+                data = response.json()
+            with measure("validate"):
+                return self.model_validate(data)
+
+    async def adelete(self):
+        """
+        Async version of delete().
+        """
+        if not self.id:
+            raise Exception("Item has no ID. Cannot delete.")
+
+        wcapi = WooCommerce.get_async_instance()
+        endpoint = self.endpoint(self.id)
+        with _request_event("DELETE", endpoint):
+            response = await wcapi.delete(endpoint, params={"force": True})
+            self._forget()
+            with measure("decode"):
+                data = response.json()
+            with measure("validate"):
+                return self.model_validate(data)
+
+    def _forget(self, keep=None):
+        """
+        Invalidate the cached copy of the item.
+        """
+        forget(WooCommerce.get_connection(), self.endpoint(self.id), keep)
+
+    def _apply_batch_item(self, data: dict):
+        """
+        Update the item with its entry from a batch response.
+        """
+        with measure("validate"):
+            self.__dict__.update(self.model_validate(data).__dict__)
+        self._take_snapshot()
+        self._forget(keep=self)
+
+    @classmethod
+    def batch_endpoint(cls) -> str:
+        """
+        Return the batch endpoint for the WooCommerce model.
+        """
+        return f"{cls.endpoint()}/batch"
+
+    @classmethod
+    def save_many(cls, objs, batch_size: int = MAX_BATCH_SIZE) -> BatchResult:
+        """
+        Save many items using the batch endpoint. Items with an ID are updated, the others are created.
+        Items are sent `batch_size` (at most 100) per request and updated with the response, like save() does.
+        Failed items do not stop the batch, they are reported in the `errors` of the returned BatchResult.
+        """
+        objs = list(objs)
+        wcapi = WooCommerce.get_instance()
+        return run_batch(
+            wcapi,
+            cls.batch_endpoint(),
+            create=[obj for obj in objs if not obj.id],
+            update=[obj for obj in objs if obj.id],
+            batch_size=batch_size,
+            hooks=WooCommerce.get_connection().hooks
+        )
+
+    @classmethod
+    def delete_many(cls, objs, batch_size: int = MAX_BATCH_SIZE) -> BatchResult:
+        """
+        Delete many items using the batch endpoint, `batch_size` (at most 100) per request.
+        Failed items do not stop the batch, they are reported in the `errors` of the returned BatchResult.
+        """
+        objs = list(objs)
+        for obj in objs:
+            if not obj.id:
+                raise Exception("Item has no ID. Cannot delete.")
+
+        wcapi = WooCommerce.get_instance()
+        return run_batch(wcapi, cls.batch_endpoint(), delete=objs, batch_size=batch_size,
+                         hooks=WooCommerce.get_connection().hooks)
     
 
-class WooDoubleIdODM(BaseModel, ABC):
+class WooDoubleIdODM(_TrackedModel, ABC):
     """
     Abstract base class for WooCommerce models.
     """
     # This is not optional, however it won't work with Pydantic if it's not set to None
     id1: Optional[int] = None # First ID (often of the product or some other parent object)
+    _untracked_fields: ClassVar[Set[str]] = {"id1"}
 
     @classmethod
     @abstractmethod
@@ -137,56 +934,206 @@ class WooDoubleIdODM(BaseModel, ABC):
         pass
 
     @classmethod
-    def all(cls, id1: int, per_page: int = 10, page: int = 1):
+    def all(cls, id1: int, per_page: int = None, page: int = 1, paginate: bool = False, fast: bool = False):
         """
         Fetch all items with pagination and return a list of model objects.
+        Args:
+            id1 (int): The ID of the parent object.
+            per_page (int): Number of items per page (10 by default, 100 when paginating).
+            page (int): The page to fetch, or the page to start from when paginating.
+            paginate (bool): If True, return a generator over every item starting at `page` (see iter_all).
+            fast (bool): Skip validation, values are kept as returned by WooCommerce (see ensure_validated).
         """
-        wcapi = WooCommerce.get_instance()
-        response = wcapi.get(f"{cls.endpoint(id1)}", params={"per_page": per_page, "page": page})
+        if paginate:
+            return cls.iter_all(id1, per_page=per_page or MAX_PER_PAGE, page=page, fast=fast)
+
+        items = _fetch_page(loader(cls, fast), cls.endpoint(id1), per_page or 10, page).items
+        for item in items:
+            item.id1 = id1
+        return items
 
-        if response.status_code == 200:
-            return [cls.model_validate(item) for item in response.json()]
-        
-        raise Exception(response.json().get("message", "Unknown error"))
-    
     @classmethod
-    def get(cls, id1: int, id2: int):
+    def iter_pages(cls, id1: int, per_page: int = MAX_PER_PAGE, page: int = 1,
+                   workers: int = None, max_in_flight: int = None, ordered: bool = True, fast: bool = False):
         """
-        Retrieve an item from WooCommerce by ID and return a model object.
+        Lazily iterate over all pages of the parent object, starting from `page`.
+        Yields Page objects, whose `next` attribute can be stored to resume iteration later.
+        See WooBasicODM.iter_pages for the concurrent prefetching and fast mode options.
         """
-        wcapi = WooCommerce.get_instance()
-        response = wcapi.get(cls.endpoint(id1, id2))
-        
+        for result in _iter_pages(loader(cls, fast), cls.endpoint(id1), per_page, page, None,
+                                  workers, max_in_flight, ordered):
+            for item in result.items:
+                item.id1 = id1
+            yield result
+
+    @classmethod
+    def iter_all(cls, id1: int, per_page: int = MAX_PER_PAGE, page: int = 1,
+                 workers: int = None, max_in_flight: int = None, ordered: bool = True, fast: bool = False):
+        """
+        Lazily iterate over all items of the parent object, fetching one page at a time starting from `page`.
+        """
+        for result in cls.iter_pages(id1, per_page, page, workers, max_in_flight, ordered, fast):
+            yield from result.items
+
+    @classmethod
+    def query(cls, id1: int):
+        """
+        Start a chainable query over the items of the parent object (see WooBasicODM.query).
+        """
+        from .query import Query
+        return Query(cls, id1)
+
+    @classmethod
+    def local(cls, id1: int = None):
+        """
+        Start a query over the local replica, optionally restricted to the items of a parent object
+        (see WooBasicODM.local).
+        """
+        return WooCommerce.get_replica().query(cls, id1)
+
+    @classmethod
+    def changed_since(cls, id1: int, cursor: SyncCursor = None, per_page: int = MAX_PER_PAGE,
+                      filters: dict = None) -> ChangeStream:
+        """
+        Stream the items of the parent object modified after `cursor`, oldest change first.
+        See WooBasicODM.changed_since.
+        """
+        def fetch(params, page):
+            result = _fetch_page(cls, cls.endpoint(id1), per_page, page, {**(filters or {}), **params})
+            for item in result.items:
+                item.id1 = id1
+            return result
+
+        return ChangeStream(cls, fetch, cursor)
+
+    @classmethod
+    async def aall(cls, id1: int, per_page: int = None, page: int = 1, paginate: bool = False, fast: bool = False):
+        """
+        Async version of all(). With paginate=True an async iterator over every item is returned instead (see aiter_all).
+        """
+        if paginate:
+            return cls.aiter_all(id1, per_page=per_page or MAX_PER_PAGE, page=page, fast=fast)
+
+        items = (await _afetch_page(loader(cls, fast), cls.endpoint(id1), per_page or 10, page)).items
+        for item in items:
+            item.id1 = id1
+        return items
+
+    @classmethod
+    async def aiter_pages(cls, id1: int, per_page: int = MAX_PER_PAGE, page: int = 1, fast: bool = False):
+        """
+        Async version of iter_pages, yielding one Page at a time.
+        """
+        async for result in _aiter_pages(loader(cls, fast), cls.endpoint(id1), per_page, page):
+            for item in result.items:
+                item.id1 = id1
+            yield result
+
+    @classmethod
+    async def aiter_all(cls, id1: int, per_page: int = MAX_PER_PAGE, page: int = 1, fast: bool = False):
+        """
+        Async version of iter_all, fetching one page at a time starting from `page`.
+        """
+        async for result in cls.aiter_pages(id1, per_page=per_page, page=page, fast=fast):
+            for item in result.items:
+                yield item
+
+    @classmethod
+    def _parse_get(cls, response, id1: int, endpoint: str, fast: bool = False):
         if response.status_code == 200:
-            response_obj = cls.model_validate(response.json())
+            response_obj, data = _parse_item(loader(cls, fast), response)
             response_obj.id1 = id1
-            return response_obj
+            return remember(WooCommerce.get_connection(), cls, endpoint, response_obj, data)
         
         raise Exception(response.json().get("message", "Unknown error"))
 
-    def save(self):
+    @classmethod
+    def _lookup(cls, id1: int, endpoint: str, fast: bool = False):
+        cached = lookup(WooCommerce.get_connection(), loader(cls, fast), endpoint)
+        if cached is not None:
+            cached.id1 = id1
+            if not fast:
+                cached.ensure_validated()  # The identity map may hold an item loaded in fast mode
+        return cached
+
+    @classmethod
+    def get(cls, id1: int, id2: int, refresh: bool = False, fast: bool = False):
         """
-        Save the item to WooCommerce. Updates if it has an ID, otherwise creates a new one.
+        Retrieve an item from WooCommerce by ID and return a model object.
+        The cache and the identity map are used if enabled, unless `refresh` is True.
+        With `fast`, the item is not validated until it is saved (see ensure_validated).
         """
-        assert self.id1 is not None, "ID1 is mandatory for this model."
+        endpoint = cls.endpoint(id1, id2)
+        cached = None if refresh else cls._lookup(id1, endpoint, fast)
+        if cached is not None:
+            return cached
 
         wcapi = WooCommerce.get_instance()
-        data = self.model_dump()
+        with _request_event("GET", endpoint):
+            response, key = _send_get(wcapi, endpoint, fast=fast)
+            return _handle_get(response, key, lambda response: cls._parse_get(response, id1, endpoint, fast))
 
-        # Datetime objects need to be converted to ISO format before sending
-        data = self._remove_datetimes(data)
+    @classmethod
+    async def aget(cls, id1: int, id2: int, refresh: bool = False, fast: bool = False):
+        """
+        Async version of get().
+        """
+        endpoint = cls.endpoint(id1, id2)
+        cached = None if refresh else cls._lookup(id1, endpoint, fast)
+        if cached is not None:
+            return cached
 
-        response = wcapi.put(self.endpoint(self.id1, self.id), data) if self.id else wcapi.post(self.endpoint(self.id1), data)
-        
+        wcapi = WooCommerce.get_async_instance()
+        with _request_event("GET", endpoint):
+            response, key = _send_get(wcapi, endpoint, fast=fast)
+            return _handle_get(await response, key, lambda response: cls._parse_get(response, id1, endpoint, fast))
+
+    def _save_target(self) -> tuple:
+        assert self.id1 is not None, "ID1 is mandatory for this model."
+        return ("put", self.endpoint(self.id1, self.id)) if self.id else ("post", self.endpoint(self.id1))
+
+    def _apply_save(self, response):
+        """
+        Update the item with the saved version returned by WooCommerce.
+        """
         if response.status_code in [200, 201]:
-            response = self.model_validate(response.json())
-            self.__dict__.update(response.__dict__)
+            with measure("decode"):
+                data = response.json()
+            self._apply_batch_item(data)
             return self
         
         errorMsg = response.json().get("message", "Unknown error")
         errorDetails = response.json().get("details", "")
         raise Exception(f"Error: {errorMsg} \n Details: {errorDetails}")
 
+    def save(self):
+        """
+        Save the item to WooCommerce. Updates if it has an ID, otherwise creates a new one.
+        """
+        prepared = self._prepare_save()
+        if prepared is None:
+            return self  # Nothing changed since the item was loaded
+
+        wcapi = WooCommerce.get_instance()
+        method, endpoint, data = prepared
+        with _request_event(method, endpoint):
+            response = getattr(wcapi, method)(endpoint, data)
+            return self._apply_save(response)
+
+    async def asave(self):
+        """
+        Async version of save().
+        """
+        prepared = self._prepare_save()
+        if prepared is None:
+            return self  # Nothing changed since the item was loaded
+
+        wcapi = WooCommerce.get_async_instance()
+        method, endpoint, data = prepared
+        with _request_event(method, endpoint):
+            response = await getattr(wcapi, method)(endpoint, data)
+            return self._apply_save(response)
+
     def delete(self):
         """
         Delete the item from WooCommerce.
@@ -195,5 +1142,95 @@ class WooDoubleIdODM(BaseModel, ABC):
             raise Exception("Item has no ID. Cannot delete.")
         
         wcapi = WooCommerce.get_instance()
-        response = wcapi.delete(self.endpoint(self.id1, self.id), params={"force": True})
-        return self.model_validate(response.json())
\ No newline at end of file
+        endpoint = self.endpoint(self.id1, self.id)
+        with _request_event("DELETE", endpoint):
+            response = wcapi.delete(endpoint, params={"force": True})
+            self._forget()
+            with measure("decode"):
+                data = response.json()
+            with measure("validate"):
+                return self.model_validate(data)
+
+    async def adelete(self):
+        """
+        Async version of delete().
+        """
+        if not self.id:
+            raise Exception("Item has no ID. Cannot delete.")
+
+        wcapi = WooCommerce.get_async_instance()
+        endpoint = self.endpoint(self.id1, self.id)
+        with _request_event("DELETE", endpoint):
+            response = await wcapi.delete(endpoint, params={"force": True})
+            self._forget()
+            with measure("decode"):
+                data = response.json()
+            with measure("validate"):
+                return self.model_validate(data)
+
+    def _forget(self, keep=None):
+        """
+        Invalidate the cached copy of the item.
+        """
+        forget(WooCommerce.get_connection(), self.endpoint(self.id1, self.id), keep)
+
+    def _apply_batch_item(self, data: dict):
+        """
+        Update the item with its entry from a response, keeping the parent ID (which is not part of the response).
+        """
+        id1 = self.id1
+        with measure("validate"):
+            self.__dict__.update(self.model_validate(data).__dict__)
+        self.id1 = id1
+        self._take_snapshot()
+        self._forget(keep=self)
+
+    @classmethod
+    def batch_endpoint(cls, id1: int) -> str:
+        """
+        Return the batch endpoint for the WooCommerce model, e.g. products/{id1}/variations/batch.
+        """
+        return f"{cls.endpoint(id1).rstrip('/')}/batch"
+
+    @classmethod
+    def _group_by_parent(cls, objs) -> dict:
+        groups = {}
+        for obj in objs:
+            assert obj.id1 is not None, "ID1 is mandatory for this model."
+            groups.setdefault(obj.id1, []).append(obj)
+        return groups
+
+    @classmethod
+    def save_many(cls, objs, batch_size: int = MAX_BATCH_SIZE) -> BatchResult:
+        """
+        Save many items using the batch endpoint of their parent object (one or more requests per parent).
+        Items with an ID are updated, the others are created. Failed items are reported in the returned BatchResult.
+        """
+        wcapi = WooCommerce.get_instance()
+        result = BatchResult()
+        for id1, group in cls._group_by_parent(objs).items():
+            result.merge(run_batch(
+                wcapi,
+                cls.batch_endpoint(id1),
+                create=[obj for obj in group if not obj.id],
+                update=[obj for obj in group if obj.id],
+                batch_size=batch_size,
+                hooks=WooCommerce.get_connection().hooks
+            ))
+        return result
+
+    @classmethod
+    def delete_many(cls, objs, batch_size: int = MAX_BATCH_SIZE) -> BatchResult:
+        """
+        Delete many items using the batch endpoint of their parent object.
+        Failed items are reported in the returned BatchResult.
+        """
+        wcapi = WooCommerce.get_instance()
+        result = BatchResult()
+        for id1, group in cls._group_by_parent(objs).items():
+            for obj in group:
+                if not obj.id:
+                    raise Exception("Item has no ID. Cannot delete.")
+            result.merge(run_batch(wcapi, cls.batch_endpoint(id1), delete=group, batch_size=batch_size,
+                                   hooks=WooCommerce.get_connection().hooks))
+        return result
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+from functools import lru_cache
+from typing import List
+
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson  # Optional, install using `pip install wooODM[fast-json]`
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(content):
+    """
+    Decode a JSON document (bytes or str), with orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps(data) -> bytes:
+    """
+    Encode a JSON-compatible payload to UTF-8 bytes, with orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def response_json(response):
+    """
+    Decode the body of a response, like response.json() but with orjson if it is installed.
+    Responses without a raw body (e.g. test doubles) are decoded by their own json() method.
+    """
+    content = getattr(response, "content", None)
+    if not isinstance(content, (bytes, str)):
+        return response.json()
+    return loads(content)
+
+
+def can_validate_json(cls) -> bool:
+    """
+    Returns True if items of `cls` can be validated straight from the raw response (pydantic models, including
+    partial ones). Loaders which need the decoded dicts, like the fast read mode, return False.
+    """
+    return isinstance(cls, type) and issubclass(cls, BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(cls) -> TypeAdapter:
+    return TypeAdapter(List[cls])
+
+
+def validate_list(cls, content) -> list:
+    """
+    Validate a JSON array of items of `cls` in a single pass over the raw bytes, without building
+    intermediate dicts (pydantic's Rust JSON parser does the decoding).
+    """
+    return _list_adapter(cls).validate_json(content)
+
+
+def validate_item(cls, content):
+    """
+    Validate a single JSON object of `cls` straight from the raw bytes.
+    """
+    return cls.model_validate_json(content)
@@ -0,0 +1,251 @@
+import gzip
+import json
+import os
+import re
+import typing
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .core import MAX_PER_PAGE, WooDoubleIdODM, _iter_pages
+from .fast import TrustedLoader
+from .fields import scalar_kind, unwrap
+
+try:
+    import pyarrow  # Optional, install using `pip install wooODM[arrow]`
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - depends on the environment
+    pyarrow = None
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    A column of an exported table: where its value is read from in the item, and its type.
+    `kind` is one of "int", "float", "bool", "string", "datetime" or "json" (nested values, encoded as JSON strings).
+    """
+    name: str
+    path: tuple
+    kind: str
+
+    def value(self, data: dict):
+        for key in self.path:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+        if self.kind == "json":
+            return None if data is None else json.dumps(data, separators=(",", ":"))
+        if data == "" and self.kind != "string":
+            return None  # WooCommerce sends empty strings for unset numbers and dates
+        if isinstance(data, str) and self.kind in ("int", "float"):
+            return int(data) if self.kind == "int" else float(data)  # Items are not validated, coerce like pydantic
+        return data
+
+
+@dataclass
+class Table:
+    """
+    The fixed schema of an exported table. Child tables (e.g. order_line_items) are keyed by the ID of their parent.
+    """
+    name: str
+    columns: List[Column] = field(default_factory=list)
+    source: Optional[str] = None  # The list field of the parent item the rows come from, None for the main table
+
+    def rows(self, item: dict, parent_key: Optional[Column] = None) -> list:
+        if self.source is None:
+            return [{column.name: column.value(item) for column in self.columns}]
+        parent_id = item.get("id")
+        return [
+            {parent_key.name: parent_id, **{column.name: column.value(child) for column in self.columns[1:]}}
+            for child in item.get(self.source) or () if isinstance(child, dict)
+        ]
+
+
+def _snake(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _child_model(annotation):
+    """
+    Returns the model of a List[Model] annotation, None for anything else.
+    """
+    annotation = unwrap(annotation)
+    if typing.get_origin(annotation) in (list, List):
+        (item,) = typing.get_args(annotation) or (None,)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return item
+    return None
+
+
+def _columns(model, prefix: tuple = ()) -> List[Column]:
+    """
+    Derive the columns of a model: scalar fields map to typed columns, nested models are flattened into
+    prefixed columns (billing_first_name, ...) and anything else is kept as JSON.
+    """
+    columns = []
+    for name, info in model.model_fields.items():
+        path = prefix + (name,)
+        kind = scalar_kind(info.annotation)
+        nested = unwrap(info.annotation)
+        if kind is not None:
+            columns.append(Column("_".join(path), path, kind))
+        elif isinstance(nested, type) and issubclass(nested, BaseModel) and not prefix:
+            columns += _columns(nested, path)
+        else:
+            columns.append(Column("_".join(path), path, "json"))
+    return columns
+
+
+class Exporter:
+    """
+    Streams every item of a model into flat tables, one API page at a time, so memory use does not depend on
+    the size of the store. Items are read in fast mode: no model is validated, rows are built from the raw data.
+    The main table has a column per field, nested models are flattened (billing_first_name, ...).
+    Lists of nested models (e.g. Order.line_items, meta_data, tax_lines) become child tables keyed by the
+    ID of their parent (order_line_items.order_id), other nested values are encoded as JSON strings.
+
+        Exporter(Order, filters={"status": "completed"}).to_parquet("export/")
+
+    Args:
+        model: The model class to export.
+        id1 (int): The parent object, for models with two IDs (e.g. the product of variations).
+        filters (dict): Request filters, e.g. {"status": "completed", "after": "2024-01-01T00:00:00"}.
+        children (tuple): The list fields exported as child tables, all lists of nested models by default.
+        per_page (int): Number of items per request.
+        workers (int): If greater than 1, prefetch pages concurrently with this many threads (see iter_pages).
+    """
+
+    def __init__(self, model, id1: int = None, filters: dict = None, children: tuple = None,
+                 per_page: int = MAX_PER_PAGE, workers: int = None):
+        if issubclass(model, WooDoubleIdODM) and id1 is None:
+            raise Exception(f"{model.__name__} has a parent object, pass its ID as id1.")
+        self.model = model
+        self.id1 = id1
+        self.filters = dict(filters or {})
+        self.per_page = per_page
+        self.workers = workers
+        self.tables = self._tables(children)
+
+    def _tables(self, children: tuple = None) -> dict:
+        name = _snake(self.model.__name__)
+        child_fields = {
+            field_name: _child_model(info.annotation) for field_name, info in self.model.model_fields.items()
+            if _child_model(info.annotation) is not None
+        }
+        if children is None:
+            children = tuple(child_fields)
+        unknown = [child for child in children if child not in child_fields]
+        if unknown:
+            raise ValueError(f"Not a list of nested objects of {self.model.__name__}: {', '.join(unknown)}")
+
+        main = Table(name, [
+            column for column in _columns(self.model) if column.path[0] not in children
+        ])
+        tables = {name: main}
+        self.parent_key = Column(f"{name}_id", ("id",), "int")
+        for child in children:
+            tables[f"{name}_{child}"] = Table(f"{name}_{child}", [self.parent_key] + _columns(child_fields[child]), child)
+        return tables
+
+    def _endpoint(self) -> str:
+        return self.model.endpoint() if self.id1 is None else self.model.endpoint(self.id1)
+
+    def pages(self):
+        """
+        Yields, for every page of items, a dict of table name -> list of rows.
+        """
+        for page in _iter_pages(TrustedLoader(self.model), self._endpoint(), self.per_page, 1, self.filters or None,
+                                self.workers):
+            rows = {name: [] for name in self.tables}
+            for item in page.items:
+                data = item.__dict__
+                for name, table in self.tables.items():
+                    rows[name] += table.rows(data, self.parent_key)
+            yield rows
+
+    def arrow_schema(self, table: str):
+        """
+        Returns the Arrow schema of a table.
+        """
+        _require_pyarrow()
+        types = {
+            "int": pyarrow.int64(),
+            "float": pyarrow.float64(),
+            "bool": pyarrow.bool_(),
+            "string": pyarrow.string(),
+            "datetime": pyarrow.timestamp("s"),
+            "json": pyarrow.string(),
+        }
+        return pyarrow.schema([(column.name, types[column.kind]) for column in self.tables[table].columns])
+
+    def _record_batch(self, table: str, rows: list):
+        schema = self.arrow_schema(table)
+        arrays = []
+        for column, arrow_field in zip(self.tables[table].columns, schema):
+            values = [row[column.name] for row in rows]
+            if column.kind == "datetime":
+                # Parsed column-wise by Arrow instead of one datetime at a time in Python
+                arrays.append(pyarrow.array(values, pyarrow.string()).cast(arrow_field.type))
+            else:
+                arrays.append(pyarrow.array(values, arrow_field.type))
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def record_batches(self):
+        """
+        Yields (table name, pyarrow.RecordBatch) tuples, one batch per table and page.
+        """
+        _require_pyarrow()
+        for rows in self.pages():
+            for table, table_rows in rows.items():
+                if table_rows:
+                    yield table, self._record_batch(table, table_rows)
+
+    def to_ndjson(self, directory: str, compression: str = None) -> dict:
+        """
+        Write each table to <directory>/<table>.ndjson (.ndjson.gz with compression="gzip").
+        Returns the number of rows written per table.
+        """
+        if compression not in (None, "gzip"):
+            raise ValueError("NDJSON exports can only be compressed with gzip.")
+        os.makedirs(directory, exist_ok=True)
+        extension = ".ndjson.gz" if compression else ".ndjson"
+        opener = gzip.open if compression else open
+        files = {name: opener(os.path.join(directory, name + extension), "wt", encoding="utf-8") for name in self.tables}
+        counts = {name: 0 for name in self.tables}
+        try:
+            for rows in self.pages():
+                for name, table_rows in rows.items():
+                    files[name].writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in table_rows)
+                    counts[name] += len(table_rows)
+        finally:
+            for file in files.values():
+                file.close()
+        return counts
+
+    def to_parquet(self, directory: str, compression: str = "zstd") -> dict:
+        """
+        Write each table to <directory>/<table>.parquet, one row group per page.
+        Returns the number of rows written per table.
+        """
+        _require_pyarrow()
+        os.makedirs(directory, exist_ok=True)
+        writers = {
+            name: pyarrow.parquet.ParquetWriter(os.path.join(directory, f"{name}.parquet"), self.arrow_schema(name),
+                                                compression=compression)
+            for name in self.tables
+        }
+        counts = {name: 0 for name in self.tables}
+        try:
+            for name, batch in self.record_batches():
+                writers[name].write_batch(batch)
+                counts[name] += batch.num_rows
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return counts
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("Arrow and Parquet exports require pyarrow. Install it using `pip install wooODM[arrow]`.")
@@ -0,0 +1,84 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from itertools import count
+
+from .core import MAX_PER_PAGE
+from .products.product import Product
+from .products.variations import ProductVariation
+
+
+def _variations(product, per_page: int, fast: bool) -> list:
+    """
+    Fetch every variation of a product, page after page, with id1 set to the product.
+    """
+    if not product.variations:
+        return []  # The product lists the IDs of its variations, there is nothing to fetch
+    return ProductVariation.query(product.id).per_page(per_page).fast(fast).all()
+
+
+class VariationLoader:
+    """
+    Streams variable products together with all their variations, as (product, [variations]) pairs.
+    Products are read page by page while the variations of up to `workers` products are fetched concurrently,
+    so the time spent waiting on one product's variations overlaps with the others instead of adding up.
+    At most `max_in_flight` products (twice the number of workers by default) are requested or buffered at once,
+    which keeps memory bounded however large the catalog is.
+
+        for product, variations in VariationLoader(workers=16):
+            print(product.sku, sum(variation.stock_quantity or 0 for variation in variations))
+
+    Args:
+        products: The products to load the variations of, the variable products of the store by default.
+        filters (dict): Extra request filters of the default products query, e.g. {"status": "publish"}.
+        workers (int): Number of variation requests sent concurrently.
+        max_in_flight (int): Maximum number of products whose variations are requested or buffered at once.
+        per_page (int): Number of items per request, for products and variations.
+        ordered (bool): Yield the products in order (True) or as soon as their variations arrive (False).
+        fast (bool): Skip validation of products and variations (see ensure_validated).
+    """
+
+    def __init__(self, products=None, filters: dict = None, workers: int = 8, max_in_flight: int = None,
+                 per_page: int = MAX_PER_PAGE, ordered: bool = False, fast: bool = False):
+        self.products = products
+        self.filters = dict(filters or {})
+        self.workers = max(workers, 1)
+        self.max_in_flight = max(max_in_flight or self.workers * 2, 1)
+        self.per_page = per_page
+        self.ordered = ordered
+        self.fast = fast
+
+    def _products(self):
+        if self.products is not None:
+            return iter(self.products)
+        return iter(Product.query().filter(type="variable", **self.filters).per_page(self.per_page).fast(self.fast))
+
+    def __iter__(self):
+        products = self._products()
+        in_flight = {}  # position -> (product, future)
+        positions = count()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        def submit():
+            while len(in_flight) < self.max_in_flight:
+                product = next(products, None)
+                if product is None:
+                    return
+                # Workers run in the caller's context, so they use the connection it is bound to
+                future = executor.submit(copy_context().run, _variations, product, self.per_page, self.fast)
+                in_flight[next(positions)] = (product, future)
+
+        try:
+            submit()
+            while in_flight:
+                if self.ordered:
+                    position = min(in_flight)
+                else:
+                    done, _ = wait([future for _, future in in_flight.values()], return_when=FIRST_COMPLETED)
+                    position = next(position for position, (_, future) in in_flight.items() if future in done)
+                product, future = in_flight.pop(position)
+                variations = future.result()
+                submit()
+                yield product, variations
+        finally:
+            # Stop fetching if the consumer stops early or a request fails
+            executor.shutdown(wait=False, cancel_futures=True)
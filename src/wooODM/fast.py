@@ -0,0 +1,125 @@
+from copy import copy
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _defaults(cls):
+    """
+    Returns (defaults, mutable) for a model class: the default value of every optional field,
+    and the names of the fields whose default has to be copied for each instance.
+    """
+    defaults = {}
+    for name, field in cls.model_fields.items():
+        if not field.is_required():
+            defaults[name] = field.get_default(call_default_factory=True)
+    mutable = tuple(name for name, value in defaults.items() if isinstance(value, (list, dict, set)))
+    return defaults, mutable
+
+
+def trusted(cls, data: dict):
+    """
+    Build a model from data returned by WooCommerce without validating it, like model_construct() but much cheaper.
+    Values are kept as they are in the JSON response: nested objects stay dicts and dates stay strings.
+    The item is validated in place the first time it is saved, or when ensure_validated() is called.
+    """
+    defaults, mutable = _defaults(cls)
+    fields = cls.model_fields
+    values = dict(defaults)
+    for name in mutable:
+        values[name] = copy(values[name])
+    fields_set = set()
+    for name, value in data.items():
+        if name in fields:
+            values[name] = value
+            fields_set.add(name)
+
+    item = cls.__new__(cls)
+    object.__setattr__(item, "__dict__", values)
+    object.__setattr__(item, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(item, "__pydantic_extra__", None)
+    object.__setattr__(item, "__pydantic_private__", {"_snapshot": None, "_trusted": True, "_related": {}})
+    return item
+
+
+class TrustedLoader:
+    """
+    Stands in for a model class wherever responses are parsed (pages, get(), the cache), building trusted items.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.__name__ = model.__name__  # Used by the cache (TTLs) and the conditional store
+
+    def model_validate(self, data: dict):
+        return trusted(self.model, data)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+
+def loader(cls, fast: bool = False):
+    """
+    Returns what responses of `cls` are parsed with: the class itself, or a TrustedLoader in fast mode.
+    """
+    return TrustedLoader(cls) if fast else cls
+
+
+def is_trusted(cls) -> bool:
+    """
+    Returns True if responses parsed with `cls` are not validated (a TrustedLoader or a Record class).
+    """
+    return isinstance(cls, TrustedLoader) or (isinstance(cls, type) and issubclass(cls, Record))
+
+
+class Record:
+    """
+    Base class of the compact, read-only records returned by fast projected queries (see Query.fast).
+    Records only hold the requested fields in __slots__ and are not validated at all.
+    """
+    __slots__ = ()
+    _model = None  # The model class this record was derived from
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def model_validate(cls, data: dict):
+        record = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(record, name, data.get(name))
+        return record
+
+    def _take_snapshot(self):
+        # Records are read-only, so there is nothing to track
+        return self
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def load(self):
+        """
+        Fetch the full, validated item (for models with a single ID).
+        """
+        return self._model.get(self.id)
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return self.__class__ is other.__class__ and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({values})"
+
+
+@lru_cache(maxsize=None)
+def record_class(cls, fields: tuple):
+    """
+    Returns a Record class with slots for `fields` of `cls`. Classes are created once per projection.
+    """
+    unknown = [name for name in fields if name not in cls.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields for {cls.__name__}: {', '.join(unknown)}")
+
+    return type(f"{cls.__name__}Record", (Record,), {"__slots__": fields, "_model": cls})
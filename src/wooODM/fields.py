@@ -0,0 +1,35 @@
+import typing
+from datetime import date, datetime
+from typing import Optional
+
+
+def unwrap(annotation):
+    """
+    Returns the annotation of a model field without Optional[...].
+    """
+    if typing.get_origin(annotation) is typing.Union:
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        if len(arguments) == 1:
+            return unwrap(arguments[0])
+    return annotation
+
+
+def scalar_kind(annotation) -> Optional[str]:
+    """
+    Returns the kind of a scalar field annotation: "bool", "int", "float", "string" or "datetime",
+    None for nested models and lists.
+    """
+    annotation = unwrap(annotation)
+    if not isinstance(annotation, type):
+        return None
+    if issubclass(annotation, bool):
+        return "bool"
+    if issubclass(annotation, int):
+        return "int"
+    if issubclass(annotation, float):
+        return "float"
+    if issubclass(annotation, str):
+        return "string"
+    if issubclass(annotation, (datetime, date)):
+        return "datetime"
+    return None
@@ -0,0 +1,267 @@
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import asdict, dataclass
+from itertools import islice
+from typing import Optional
+
+from pydantic import ValidationError
+
+from .batch import MAX_BATCH_SIZE, BatchResult
+from .fields import scalar_kind
+from .products.product import Product
+from .products.variations import ProductVariation
+from .query import partial_model
+
+
+def read_csv(path: str, encoding: str = "utf-8"):
+    """
+    Lazily read the rows of a CSV file with a header line, as dicts of strings.
+    Empty cells are left out, cells of list and nested fields (e.g. categories, attributes) hold JSON.
+    """
+    with open(path, newline="", encoding=encoding) as file:
+        for row in csv.DictReader(file):
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def read_ndjson(path: str, encoding: str = "utf-8"):
+    """
+    Lazily read a file holding one JSON object per line. Blank lines are skipped.
+    """
+    with open(path, encoding=encoding) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _decode_nested(cls, row: dict) -> dict:
+    """
+    Decode the JSON text of list and nested fields, as found in CSV cells.
+    """
+    fields = cls.model_fields
+    return {
+        key: json.loads(value) if key in fields and isinstance(value, str) and scalar_kind(fields[key].annotation) is None
+        else value
+        for key, value in row.items()
+    }
+
+
+@dataclass
+class ImportResult:
+    """
+    Totals of an import, including the rows processed before it was resumed from a checkpoint.
+    """
+    rows: int = 0  # Rows read from the source
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0  # Rows listed in the error report
+
+    def add(self, result: BatchResult):
+        self.created += len(result.created)
+        self.updated += len(result.updated)
+        self.unchanged += len(result.unchanged)
+
+
+class Importer:
+    """
+    Upsert products and variations by SKU from a stream of rows (see read_csv and read_ndjson).
+    A SKU -> ID index of the products is built once up front, so each row is either updated (only the fields
+    present in the row are sent) or created, through the batch endpoints. Rows with a `parent_sku` are
+    variations of that product, their index is loaded per parent when first needed.
+
+    Rows are processed `chunk_size` at a time, with up to `workers` batch requests in flight. After each chunk
+    the number of rows done is written to the checkpoint file, and rows which failed (invalid data, or refused
+    by WooCommerce) are appended to the error report, a CSV file. Running the same import again with the same
+    checkpoint skips the rows which were done; rows of an interrupted chunk are sent again, which is safe
+    since they are matched by SKU.
+
+        importer = Importer(checkpoint="erp.checkpoint.json", errors="erp.errors.csv", workers=4)
+        importer.run(read_csv("erp.csv"))
+
+    Args:
+        checkpoint (str): Path of the checkpoint file, None to always start from the first row.
+        errors (str): Path of the error report, None to only count failed rows.
+        chunk_size (int): Number of rows read and written at a time.
+        batch_size (int): Number of items per batch request (100 at most).
+        workers (int): Number of batch requests sent concurrently.
+        parent_column (str): The column holding the SKU of the parent product of variations.
+    """
+
+    def __init__(self, checkpoint: str = None, errors: str = None, chunk_size: int = 1000,
+                 batch_size: int = MAX_BATCH_SIZE, workers: int = 4, parent_column: str = "parent_sku"):
+        assert 0 < batch_size <= MAX_BATCH_SIZE, f"batch_size must be between 1 and {MAX_BATCH_SIZE}"
+        self.checkpoint = checkpoint
+        self.errors = errors
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.workers = max(workers, 1)
+        self.parent_column = parent_column
+        self.products = None  # SKU -> product ID, see build_index
+        self.variations = {}  # Product ID -> {SKU -> variation ID}, loaded per parent
+
+    def build_index(self) -> dict:
+        """
+        Load the SKU and ID of every product, with only these fields requested.
+        """
+        query = Product.query().only("id", "sku").fast()
+        self.products = {
+            item.sku: item.id
+            for page in query.iter_pages(workers=self.workers) for item in page.items if item.sku
+        }
+        return self.products
+
+    def _variation_index(self, parent_id: int) -> dict:
+        if parent_id not in self.variations:
+            self.variations[parent_id] = {
+                item.sku: item.id for item in ProductVariation.query(parent_id).only("id", "sku").fast() if item.sku
+            }
+        return self.variations[parent_id]
+
+    def load_checkpoint(self) -> ImportResult:
+        """
+        Returns the totals saved by a previous run, whose `rows` are skipped.
+        """
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return ImportResult()
+        with open(self.checkpoint, encoding="utf-8") as file:
+            return ImportResult(**json.load(file))
+
+    def _save_checkpoint(self, result: ImportResult):
+        if self.checkpoint is None:
+            return
+        temporary = f"{self.checkpoint}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(asdict(result), file)
+        os.replace(temporary, self.checkpoint)  # Atomic, a crash leaves either the old or the new checkpoint
+
+    def _report(self, failures: list):
+        if self.errors is None or not failures:
+            return
+        new = not os.path.exists(self.errors)
+        with open(self.errors, "a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if new:
+                writer.writerow(["row", "sku", "action", "code", "message"])
+            writer.writerows(sorted(failures, key=lambda failure: failure[0]))
+
+    def _item(self, cls, row: dict, item_id: Optional[int], parent_id: Optional[int] = None):
+        """
+        Build the item saving a row: a full, validated model for new items, and for existing ones an item
+        which only reports the fields of the row as changed.
+        """
+        if parent_id is not None:
+            row = {**row, "id1": parent_id}
+        partial = partial_model(cls, tuple(row)).model_validate(row)  # Also rejects unknown columns
+        if item_id is None:
+            return cls.model_validate(row)
+        item = cls.model_construct(**{name: getattr(partial, name) for name in partial.model_fields_set}, id=item_id)
+        # Only the fields of the row may differ from the stored item (the SKU matched), the others must not be sent
+        changed = set(row) - {"sku"}
+        item._snapshot = {name: value for name, value in item.model_dump().items() if name not in changed}
+        return item
+
+    def _prepare(self, chunk: list, failures: list) -> tuple:
+        """
+        Split a chunk into the product items to save and the variation rows, with the row number of each.
+        Variations are built once the products of the chunk are saved, as their parent may be one of them.
+        """
+        products, variations = [], []
+        for number, row in chunk:
+            if row.get(self.parent_column) is not None:
+                variations.append((number, row))
+                continue
+            try:
+                products.append((number, self._item(Product, _decode_nested(Product, row), self.products.get(row.get("sku")))))
+            except (ValidationError, ValueError) as error:
+                failures.append((number, row.get("sku"), "validate", "invalid_row", str(error).replace("\n", " ")))
+        return products, variations
+
+    def _prepare_variations(self, rows: list, failures: list) -> list:
+        """
+        Build the variation items to save, with the row each item comes from, resolving their parent by SKU.
+        """
+        variations = []
+        for number, row in rows:
+            sku, parent_sku = row.get("sku"), row[self.parent_column]
+            parent_id = self.products.get(parent_sku)
+            if parent_id is None:
+                failures.append((number, sku, "create", "unknown_parent", f"No product with SKU {parent_sku}."))
+                continue
+            try:
+                row = _decode_nested(ProductVariation, {k: v for k, v in row.items() if k != self.parent_column})
+                variations.append((number, self._item(ProductVariation, row, self._variation_index(parent_id).get(sku), parent_id)))
+            except (ValidationError, ValueError) as error:
+                failures.append((number, sku, "validate", "invalid_row", str(error).replace("\n", " ")))
+        return variations
+
+    def _save(self, executor, cls, rows: list, failures: list) -> BatchResult:
+        """
+        Save the items through the batch endpoint, `batch_size` per request with up to `workers` requests at once.
+        """
+        result = BatchResult()
+        futures = [
+            executor.submit(copy_context().run, cls.save_many, [item for _, item in rows[start:start + self.batch_size]],
+                            self.batch_size)
+            for start in range(0, len(rows), self.batch_size)
+        ]
+        for future in futures:
+            result.merge(future.result())
+
+        numbers = {id(item): number for number, item in rows}
+        for error in result.errors:
+            failures.append((numbers[id(error.item)], error.item.sku, error.action, error.code, error.message))
+        return result
+
+    def run(self, rows) -> ImportResult:
+        """
+        Import an iterable of rows (dicts of field values), resuming from the checkpoint if there is one.
+        """
+        result = self.load_checkpoint()
+        if self.products is None:
+            self.build_index()
+        numbered = enumerate(rows, start=1)
+        for _ in islice(numbered, result.rows):
+            pass  # Done by a previous run
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                chunk = list(islice(numbered, self.chunk_size))
+                if not chunk:
+                    break
+                failures = []
+                products, variations = self._prepare(chunk, failures)
+
+                saved = self._save(executor, Product, products, failures)
+                for item in saved.created:
+                    if item.sku:
+                        self.products[item.sku] = item.id
+                    self.variations[item.id] = {}  # New products have no variations yet
+                result.add(saved)
+
+                variations = self._prepare_variations(variations, failures)
+                saved = self._save(executor, ProductVariation, variations, failures)
+                for item in saved.created:
+                    if item.sku:
+                        self.variations[item.id1][item.sku] = item.id
+                result.add(saved)
+
+                result.rows += len(chunk)
+                result.failed += len(failures)
+                self._report(failures)
+                self._save_checkpoint(result)
+        return result
+
+    def import_csv(self, path: str, encoding: str = "utf-8") -> ImportResult:
+        """
+        Import the rows of a CSV file (see read_csv).
+        """
+        return self.run(read_csv(path, encoding))
+
+    def import_ndjson(self, path: str, encoding: str = "utf-8") -> ImportResult:
+        """
+        Import the rows of an NDJSON file (see read_ndjson).
+        """
+        return self.run(read_ndjson(path, encoding))
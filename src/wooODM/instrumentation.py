@@ -0,0 +1,285 @@
+import re
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter, time
+from typing import Optional
+
+try:
+    from opentelemetry import metrics as otel_metrics  # Optional, install using `pip install wooODM[otel]`
+except ImportError:  # pragma: no cover - depends on the environment
+    otel_metrics = None
+
+PHASES = ("network", "decode", "validate", "total")
+
+_current = ContextVar("wooODM_request_event", default=None)  # The RequestEvent of the request in progress
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Replace the IDs of an endpoint with {id}, e.g. products/12/variations/34 -> products/{id}/variations/{id},
+    so metrics are grouped per route instead of per object.
+    """
+    return re.sub(r"(?<=/)\d+(?=/|$)", "{id}", endpoint.strip("/"))
+
+
+@dataclass
+class RequestEvent:
+    """
+    A request sent by a model, from the moment it is sent until its response is parsed. Durations are in seconds:
+    `network` is spent in the client (all attempts), `decode` turning the body into dicts and `validate` building
+    the models (responses validated straight from their raw bytes count as validation only, see raw_json).
+    """
+    method: str
+    endpoint: str
+    template: str
+    started: float = field(default_factory=time)  # Unix time the request started at
+    status: Optional[int] = None  # Status of the last response, None if the store could not be reached
+    network: float = 0.0
+    decode: float = 0.0
+    validate: float = 0.0
+    total: float = 0.0  # Everything, including waiting for the rate limiter and between retries
+    bytes: int = 0  # Size of the response body
+    retries: int = 0  # Number of times the request was sent again
+    error: Optional[str] = None  # The exception raised, if any
+
+
+class RequestHook:
+    """
+    Base class of the objects notified of the requests sent by the models (see WooCommerce.add_hook).
+    Hooks are called from the thread sending the request, they must be thread-safe and fast.
+    """
+
+    def before_request(self, event: RequestEvent):
+        pass
+
+    def after_request(self, event: RequestEvent):
+        pass
+
+
+def current_event() -> Optional[RequestEvent]:
+    """
+    Returns the event of the request in progress, None if no hook is registered.
+    """
+    return _current.get()
+
+
+@contextmanager
+def request_event(hooks: list, method: str, endpoint: str):
+    """
+    Track a request from the moment it is sent until its response is parsed, notifying the hooks.
+    Yields the event, or None without any overhead if there are no hooks.
+    """
+    if not hooks:
+        yield None
+        return
+    event = RequestEvent(method.upper(), endpoint, endpoint_template(endpoint))
+    for hook in hooks:
+        hook.before_request(event)
+    token = _current.set(event)
+    start = perf_counter()
+    try:
+        yield event
+    except BaseException as error:
+        event.error = f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        event.total = perf_counter() - start
+        _current.reset(token)
+        for hook in hooks:
+            hook.after_request(event)
+
+
+@contextmanager
+def measure(phase: str):
+    """
+    Add the time spent in the block to a phase ("decode" or "validate") of the request in progress, if it is tracked.
+    """
+    event = _current.get()
+    if event is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        setattr(event, phase, getattr(event, phase) + perf_counter() - start)
+
+
+def record_attempt(event: Optional[RequestEvent], attempt: int, start: float, response=None):
+    """
+    Record an attempt of the client at sending the request of an event: the time since `start` (a perf_counter value)
+    and the response, None if the store could not be reached.
+    """
+    if event is None:
+        return
+    event.network += perf_counter() - start
+    event.retries = attempt - 1
+    if response is not None:
+        event.status = response.status_code
+        event.bytes = len(response.content or b"")
+
+
+# Bucket upper bounds in seconds, from 0.1 ms to 60 s, about 25% apart
+BUCKETS = tuple(round(0.0001 * 1.25 ** exponent, 6) for exponent in range(60) if 0.0001 * 1.25 ** exponent <= 60) + (60.0,)
+
+
+class Histogram:
+    """
+    A distribution of durations with fixed buckets, so memory does not grow with the number of requests.
+    Percentiles are interpolated within their bucket, which is precise to about 25%.
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last bucket holds values above the largest bound
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+@dataclass
+class RouteMetrics:
+    """
+    Aggregated metrics of the requests to one route, e.g. GET products/{id}.
+    """
+    requests: int = 0
+    errors: int = 0  # Requests which raised, or were answered with a 4xx/5xx status
+    bytes: int = 0
+    retries: int = 0
+    statuses: dict = field(default_factory=dict)  # Status -> number of responses
+    durations: dict = field(default_factory=lambda: {phase: Histogram() for phase in PHASES})
+
+
+class MetricsCollector(RequestHook):
+    """
+    Collects request metrics in memory, per method and endpoint template: counts, statuses, response sizes,
+    retries and p50/p95/p99 histograms of the network, decode, validate and total durations.
+
+        metrics = WooCommerce.add_hook(MetricsCollector())
+        run_sync_job()
+        print(metrics.summary())  # or metrics.prometheus() for a /metrics endpoint
+    """
+
+    def __init__(self):
+        self.routes = {}  # (method, template) -> RouteMetrics
+        self._lock = Lock()
+
+    def after_request(self, event: RequestEvent):
+        with self._lock:
+            route = self.routes.setdefault((event.method, event.template), RouteMetrics())
+            route.requests += 1
+            route.bytes += event.bytes
+            route.retries += event.retries
+            if event.error is not None or (event.status or 0) >= 400:
+                route.errors += 1
+            if event.status is not None:
+                route.statuses[event.status] = route.statuses.get(event.status, 0) + 1
+            for phase in PHASES:
+                route.durations[phase].observe(getattr(event, phase))
+
+    def reset(self):
+        with self._lock:
+            self.routes = {}
+
+    def summary(self) -> dict:
+        """
+        Returns the metrics of each route, e.g. {"GET products": {"requests": 12, "network": {"p50": ...}, ...}}.
+        """
+        with self._lock:
+            return {
+                f"{method} {template}": {
+                    "requests": route.requests,
+                    "errors": route.errors,
+                    "bytes": route.bytes,
+                    "retries": route.retries,
+                    "statuses": dict(route.statuses),
+                    **{phase: histogram.summary() for phase, histogram in route.durations.items()},
+                }
+                for (method, template), route in self.routes.items()
+            }
+
+    def prometheus(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format, to serve from a /metrics endpoint.
+        """
+        lines = [
+            "# TYPE wooodm_requests_total counter",
+            "# TYPE wooodm_request_errors_total counter",
+            "# TYPE wooodm_response_bytes_total counter",
+            "# TYPE wooodm_request_retries_total counter",
+            "# TYPE wooodm_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (method, template), route in self.routes.items():
+                labels = f'method="{method}",endpoint="{template}"'
+                for status, count in route.statuses.items():
+                    lines.append(f'wooodm_requests_total{{{labels},status="{status}"}} {count}')
+                lines.append(f"wooodm_request_errors_total{{{labels}}} {route.errors}")
+                lines.append(f"wooodm_response_bytes_total{{{labels}}} {route.bytes}")
+                lines.append(f"wooodm_request_retries_total{{{labels}}} {route.retries}")
+                for phase, histogram in route.durations.items():
+                    phase_labels = f'{labels},phase="{phase}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'wooodm_request_duration_seconds_bucket{{{phase_labels},le="{bound:g}"}} {cumulative}')
+                    lines.append(f'wooodm_request_duration_seconds_bucket{{{phase_labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"wooodm_request_duration_seconds_sum{{{phase_labels}}} {histogram.sum}")
+                    lines.append(f"wooodm_request_duration_seconds_count{{{phase_labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryHook(RequestHook):
+    """
+    Records request metrics with OpenTelemetry instruments (wooodm.request.duration by phase,
+    wooodm.response.size and wooodm.request.retries), exported by whatever MeterProvider is configured.
+    Args:
+        meter: The meter to create the instruments with, the "wooODM" meter of the global provider by default.
+    """
+
+    def __init__(self, meter=None):
+        if otel_metrics is None:
+            raise ImportError("OpenTelemetry metrics require opentelemetry-api. Install it using `pip install wooODM[otel]`.")
+        meter = meter or otel_metrics.get_meter("wooODM")
+        self.duration = meter.create_histogram("wooodm.request.duration", unit="s",
+                                               description="Duration of WooCommerce requests, by phase")
+        self.size = meter.create_counter("wooodm.response.size", unit="By", description="Size of the response bodies")
+        self.retries = meter.create_counter("wooodm.request.retries", description="Requests sent again after a failure")
+
+    def after_request(self, event: RequestEvent):
+        attributes = {"http.request.method": event.method, "wooodm.endpoint": event.template,
+                      "http.response.status_code": event.status or 0}
+        for phase in PHASES:
+            self.duration.record(getattr(event, phase), {**attributes, "wooodm.phase": phase})
+        self.size.add(event.bytes, attributes)
+        if event.retries:
+            self.retries.add(event.retries, attributes)
@@ -0,0 +1,364 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from copy import deepcopy
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+MAX_PER_PAGE = 100  # WooCommerce refuses larger pages with a 400 error
+
+# The collections nested in an item of a parent collection
+CHILD_COLLECTIONS = {"variations": "products", "refunds": "orders", "notes": "orders"}
+# Taxonomies, whose terms get a slug from their name and must have a unique slug
+TERM_COLLECTIONS = ("products/categories", "products/tags", "products/shipping_classes", "products/attributes")
+
+_ROUTE = re.compile(
+    r"^(?P<collection>products/categories|products/tags|products/shipping_classes|products/attributes"
+    r"|products|orders|customers)"
+    r"(?:/(?P<parent>\d+)/(?P<child>variations|refunds|notes))?"
+    r"(?:/(?P<id>\d+)|/(?P<batch>batch))?/?$"
+)
+
+
+class MockError(Exception):
+    """
+    An error answered the way WooCommerce does: {"code": ..., "message": ..., "data": {"status": ...}}.
+    """
+
+    def __init__(self, status: int, code: str, message: str, **data):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def body(self) -> dict:
+        return {"code": self.code, "message": self.message, "data": {"status": self.status, **self.data}}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None).isoformat()
+
+
+class MockStore:
+    """
+    The in-memory data of a MockServer: items by collection path (e.g. "products", "products/12/variations").
+    IDs are shared by all collections, like WordPress post IDs. Dates are set on create and update,
+    the site timezone is GMT. Seeded with the "Uncategorized" category every store has (ID 1).
+    """
+
+    def __init__(self, data: dict = None):
+        self.collections = {}
+        self.next_id = 1
+        self.lock = threading.RLock()
+        self.load({"products/categories": [{"id": 1, "name": "Uncategorized", "slug": "uncategorized"}]})
+        if data:
+            self.load(data)
+
+    def load(self, data: dict):
+        """
+        Add items to collections as they are, e.g. load({"products": [...], "products/12/variations": [...]}).
+        """
+        with self.lock:
+            for path, items in data.items():
+                collection = self.collections.setdefault(path.strip("/"), {})
+                for item in items:
+                    item = deepcopy(item)
+                    if not item.get("id"):
+                        item["id"] = self._new_id()
+                    self.next_id = max(self.next_id, item["id"] + 1)
+                    collection[item["id"]] = item
+
+    def items(self, path: str) -> list:
+        with self.lock:
+            return list(self.collections.get(path, {}).values())
+
+    def _new_id(self) -> int:
+        item_id = self.next_id
+        self.next_id += 1
+        return item_id
+
+    def _collection(self, path: str) -> dict:
+        return self.collections.setdefault(path, {})
+
+    def _get(self, path: str, item_id: int) -> dict:
+        item = self.collections.get(path, {}).get(item_id)
+        if item is None:
+            raise MockError(404, "woocommerce_rest_invalid_id", "Invalid ID.")
+        return item
+
+    def _check_sku(self, path: str, data: dict, item_id: int = None):
+        sku = data.get("sku")
+        if not sku or not (path == "products" or path.endswith("/variations")):
+            return
+        for collection_path, collection in self.collections.items():
+            if collection_path == "products" or collection_path.endswith("/variations"):
+                if any(item.get("sku") == sku and item["id"] != item_id for item in collection.values()):
+                    raise MockError(400, "product_invalid_sku", "Invalid or duplicated SKU.")
+
+    def _check_term(self, path: str, data: dict, item_id: int = None):
+        if path not in TERM_COLLECTIONS or "name" not in data:
+            return
+        data.setdefault("slug", re.sub(r"[^a-z0-9]+", "-", str(data["name"]).lower()).strip("-"))
+        for item in self.collections.get(path, {}).values():
+            if item.get("slug") == data["slug"] and item["id"] != item_id:
+                raise MockError(400, "term_exists", "A term with the name provided already exists.",
+                                resource_id=item["id"])
+
+    def create(self, path: str, data: dict) -> dict:
+        with self.lock:
+            self._check_sku(path, data)
+            data = dict(data)
+            self._check_term(path, data)
+            now = _now()  # The site timezone is GMT
+            item = {**deepcopy(data), "id": self._new_id(), "date_created": now, "date_created_gmt": now,
+                    "date_modified": now, "date_modified_gmt": now}
+            if path == "products" and item.get("type") == "variable":
+                item.setdefault("variations", [])
+            self._collection(path)[item["id"]] = item
+            parent = self._parent(path)
+            if parent is not None and path.endswith("/variations"):
+                parent.setdefault("variations", []).append(item["id"])
+            return deepcopy(item)
+
+    def update(self, path: str, item_id: int, data: dict) -> dict:
+        with self.lock:
+            item = self._get(path, item_id)
+            self._check_sku(path, data, item_id)
+            now = _now()
+            item.update({key: deepcopy(value) for key, value in data.items() if key != "id"})
+            item.update({"date_modified": now, "date_modified_gmt": now})
+            return deepcopy(item)
+
+    def delete(self, path: str, item_id: int) -> dict:
+        with self.lock:
+            item = self._get(path, item_id)
+            del self.collections[path][item_id]
+            parent = self._parent(path)
+            if parent is not None and item_id in parent.get("variations", []):
+                parent["variations"].remove(item_id)
+            return deepcopy(item)
+
+    def _parent(self, path: str) -> Optional[dict]:
+        parts = path.split("/")
+        if len(parts) != 3:
+            return None
+        return self.collections.get(parts[0], {}).get(int(parts[1]))
+
+    def batch(self, path: str, data: dict) -> dict:
+        """
+        Apply a /batch request, reporting failed items in place like WooCommerce.
+        """
+        if sum(len(data.get(action) or []) for action in ("create", "update", "delete")) > MAX_PER_PAGE:
+            raise MockError(413, "rest_request_entity_too_large", f"Unable to accept more than {MAX_PER_PAGE} items.")
+        response = {}
+        for action in ("create", "update", "delete"):
+            if action not in data:
+                continue
+            response[action] = []
+            for entry in data[action]:
+                try:
+                    if action == "create":
+                        result = self.create(path, entry)
+                    elif action == "update":
+                        result = self.update(path, int(entry.get("id") or 0), entry)
+                    else:
+                        result = self.delete(path, int(entry))
+                except MockError as error:
+                    item_id = entry if action == "delete" else entry.get("id", 0)
+                    result = {"id": item_id, "error": error.body()}
+                response[action].append(result)
+        return response
+
+    def query(self, path: str, params: dict) -> tuple:
+        """
+        Returns (items of the requested page, total number of items, total number of pages).
+        Supports include, exclude, sku, status, type, parent, slug, search, modified_after, orderby, order,
+        per_page, page and _fields. Items are ordered by ID unless `orderby` is given.
+        """
+        per_page = int(params.get("per_page", 10))
+        page = int(params.get("page", 1))
+        if not 1 <= per_page <= MAX_PER_PAGE:
+            raise MockError(400, "rest_invalid_param", f"per_page must be between 1 and {MAX_PER_PAGE}.")
+        items = self.items(path)
+
+        def ids(name):
+            return {int(value) for value in str(params[name]).split(",") if value}
+
+        if "include" in params:
+            items = [item for item in items if item["id"] in ids("include")]
+        if "exclude" in params:
+            items = [item for item in items if item["id"] not in ids("exclude")]
+        for name in ("sku", "status", "type", "parent", "slug"):
+            if name in params:
+                values = set(str(params[name]).split(","))
+                items = [item for item in items if str(item.get(name)) in values]
+        if "search" in params:
+            search = params["search"].lower()
+            items = [item for item in items if search in str(item.get("name", "")).lower()]
+        if "modified_after" in params:
+            items = [item for item in items if (item.get("date_modified_gmt") or "") > params["modified_after"]]
+
+        orderby = {"modified": "date_modified_gmt", "date": "date_created_gmt", "title": "name"}.get(
+            params.get("orderby"), params.get("orderby", "id"))
+        items.sort(key=lambda item: (item.get(orderby) is None, item.get(orderby) or 0, item["id"]),
+                   reverse=params.get("order", "desc" if orderby == "date_created_gmt" else "asc") == "desc")
+
+        total = len(items)
+        items = deepcopy(items[(page - 1) * per_page:page * per_page])
+        if "_fields" in params:
+            fields = params["_fields"].split(",")
+            items = [{name: item[name] for name in fields if name in item} for item in items]
+        return items, total, -(-total // per_page)
+
+
+class MockServer:
+    """
+    A local stand-in for the WooCommerce REST API, serving a MockStore over HTTP in a background thread,
+    so the whole client stack (Transport, pagination, batches, retries) runs without a live store.
+
+        with MockServer(latency=0.05, throttle_every=10) as server:
+            WooCommerce.init(server.url, "ck_test", "cs_test")
+            Product.all()
+
+    Routes: products, products/categories, products/tags, products/{id}/variations, orders, orders/{id}/refunds,
+    orders/{id}/notes and customers, each with list/create, get/update/delete by ID and /batch.
+    Lists send the X-WP-Total and X-WP-TotalPages headers, GET responses an ETag (If-None-Match gets a 304).
+    Credentials are not checked.
+    Args:
+        store (MockStore): The data to serve, an empty store by default.
+        latency (float): Seconds every request waits before being answered.
+        throttle_every (int): Answer every nth request with 429 Too Many Requests, None to never throttle.
+        retry_after (float): The Retry-After header of throttled responses, in seconds.
+        host (str): The interface to listen on. The port is picked by the system.
+    """
+
+    def __init__(self, store: MockStore = None, latency: float = 0.0, throttle_every: int = None,
+                 retry_after: float = 0, host: str = "127.0.0.1"):
+        self.store = store if store is not None else MockStore()
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.requests = 0  # Requests received so far
+        self.throttled = 0  # Requests answered with 429
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, 0), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="wooODM-mock", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _throttle(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            throttle = bool(self.throttle_every) and self.requests % self.throttle_every == 0
+            self.throttled += throttle
+            return throttle
+
+    def handle(self, method: str, path: str, params: dict, body: Optional[bytes]) -> tuple:
+        """
+        Answer a request. Returns (status, headers, payload).
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        if self._throttle():
+            error = MockError(429, "woocommerce_rest_too_many_requests", "Too many requests.")
+            return 429, {"Retry-After": str(self.retry_after)}, error.body()
+
+        route = _ROUTE.match(path)
+        if route is None:
+            return 404, {}, MockError(404, "rest_no_route", "No route was found matching the URL and request method.").body()
+        collection = route["collection"]
+        item_id = int(route["id"]) if route["id"] else None
+        data = json.loads(body) if body else {}
+
+        try:
+            if route["child"]:
+                if collection != CHILD_COLLECTIONS[route["child"]]:
+                    raise MockError(404, "rest_no_route", "No route was found matching the URL and request method.")
+                with self.store.lock:
+                    self.store._get(collection, int(route["parent"]))  # The parent has to exist
+                collection = f"{collection}/{route['parent']}/{route['child']}"
+            if route["batch"]:
+                if method != "POST":
+                    raise MockError(404, "rest_no_route", "No route was found.")
+                return 200, {}, self.store.batch(collection, data)
+            if item_id is None:
+                if method == "GET":
+                    items, total, pages = self.store.query(collection, params)
+                    return 200, {"X-WP-Total": str(total), "X-WP-TotalPages": str(pages)}, items
+                if method == "POST":
+                    return 201, {}, self.store.create(collection, data)
+            elif method == "GET":
+                with self.store.lock:
+                    return 200, {}, deepcopy(self.store._get(collection, item_id))
+            elif method in ("PUT", "POST", "PATCH"):
+                return 200, {}, self.store.update(collection, item_id, data)
+            elif method == "DELETE":
+                return 200, {}, self.store.delete(collection, item_id)
+            raise MockError(404, "rest_no_route", "No route was found matching the URL and request method.")
+        except MockError as error:
+            return error.status, {}, error.body()
+
+
+def _handler(server: MockServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like a real store
+
+        def _respond(self):
+            url = urlsplit(self.path)
+            path = url.path
+            for prefix in ("/wp-json/wc/v3/", "/wc-api/wc/v3/"):
+                if path.startswith(prefix):
+                    path = path[len(prefix):]
+            params = {key: value for key, value in parse_qsl(url.query) if not key.startswith(("oauth_", "consumer_"))}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+
+            status, headers, payload = server.handle(self.command, path, params, body)
+            content = json.dumps(payload).encode("utf-8")
+            if self.command == "GET" and status == 200:
+                etag = f'"{hashlib.md5(content).hexdigest()}"'
+                headers["ETag"] = etag
+                if self.headers.get("If-None-Match") == etag:
+                    status, content = 304, b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+        def log_message(self, format, *args):
+            pass  # Keep test and benchmark output clean
+
+    return Handler
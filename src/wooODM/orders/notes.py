@@ -1,15 +1,15 @@
 from typing import Optional
 from datetime import datetime
-from wooODM.core import WooDoubleIdODM
+from wooODM.core import WooDoubleIdODM, read_only
 
 class OrderNote(WooDoubleIdODM):
     """
     Represents a WooCommerce order note using Pydantic for validation & deserialization.
     """
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
-    author: Optional[str] = None  # Order note author (read-only)
-    date_created: Optional[datetime] = None  # The date the order note was created (site's timezone) (read-only)
-    date_created_gmt: Optional[datetime] = None  # The date the order note was created (GMT) (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
+    author: Optional[str] = read_only()  # Order note author (read-only)
+    date_created: Optional[datetime] = read_only()  # The date the order note was created (site's timezone) (read-only)
+    date_created_gmt: Optional[datetime] = read_only()  # The date the order note was created (GMT) (read-only)
     note: str  # Order note content (mandatory)
     customer_note: bool = False  # If true, the note will be shown to customers and they will be notified. Default is false.
     added_by_user: bool = False  # If true, this note will be attributed to the current user. Default is false.
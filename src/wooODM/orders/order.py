@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from wooODM.core import WooBasicODM
+from wooODM.core import WooBasicODM, read_only
+from wooODM.relations import HasRelations, Related
 
 class BillingProperties(BaseModel):
     first_name: Optional[str] = None  # First name
@@ -32,7 +33,7 @@ class MetaDataProperties(BaseModel):
     key: Optional[str] = None  # Meta key
     value: Optional[Any] = None  # Meta value
 
-class LineItemProperties(BaseModel):
+class LineItemProperties(HasRelations):
     id: Optional[int] = None  # Item ID (read-only)
     name: Optional[str] = None  # Product name
     product_id: Optional[int] = None  # Product ID
@@ -48,6 +49,9 @@ class LineItemProperties(BaseModel):
     sku: Optional[str] = None  # Product SKU (read-only)
     price: Optional[str] = None  # Product price (read-only)
 
+    product = Related("wooODM.products.product.Product", "product_id")  # The ordered product
+    variation = Related("wooODM.products.variations.ProductVariation", "variation_id", parent="product_id")  # The ordered variation, if any
+
 class TaxLineProperties(BaseModel):
     id: Optional[int] = None  # Item ID (read-only)
     rate_code: Optional[str] = None  # Tax rate code (read-only)
@@ -90,61 +94,51 @@ class RefundProperties(BaseModel):
     total: Optional[str] = None  # Refund total (read-only)
 
 class Order(WooBasicODM):
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
     parent_id: Optional[int] = None  # Parent order ID
-    number: Optional[str] = None  # Order number (read-only)
-    order_key: Optional[str] = None  # Order key (read-only)
-    created_via: Optional[str] = None  # Shows where the order was created (read-only)
-    version: Optional[str] = None  # Version of WooCommerce which last updated the order (read-only)
+    number: Optional[str] = read_only()  # Order number (read-only)
+    order_key: Optional[str] = read_only()  # Order key (read-only)
+    created_via: Optional[str] = read_only()  # Shows where the order was created (read-only)
+    version: Optional[str] = read_only()  # Version of WooCommerce which last updated the order (read-only)
     status: str = "pending"  # Order status (default is 'pending')
     currency: str = "USD"  # Currency the order was created with (default is 'USD')
-    date_created: Optional[datetime] = None  # The date the order was created (site's timezone) (read-only)
-    date_created_gmt: Optional[datetime] = None  # The date the order was created (GMT) (read-only)
-    date_modified: Optional[datetime] = None  # The date the order was last modified (site's timezone) (read-only)
-    date_modified_gmt: Optional[datetime] = None  # The date the order was last modified (GMT) (read-only)
-    discount_total: Optional[str] = None  # Total discount amount for the order (read-only)
-    discount_tax: Optional[str] = None  # Total discount tax amount for the order (read-only)
-    shipping_total: Optional[str] = None  # Total shipping amount for the order (read-only)
-    shipping_tax: Optional[str] = None  # Total shipping tax amount for the order (read-only)
-    cart_tax: Optional[str] = None  # Sum of line item taxes only (read-only)
-    total: Optional[str] = None  # Grand total (read-only)
-    total_tax: Optional[str] = None  # Sum of all taxes (read-only)
-    prices_include_tax: Optional[bool] = None  # True if the prices included tax during checkout (read-only)
+    date_created: Optional[datetime] = read_only()  # The date the order was created (site's timezone) (read-only)
+    date_created_gmt: Optional[datetime] = read_only()  # The date the order was created (GMT) (read-only)
+    date_modified: Optional[datetime] = read_only()  # The date the order was last modified (site's timezone) (read-only)
+    date_modified_gmt: Optional[datetime] = read_only()  # The date the order was last modified (GMT) (read-only)
+    discount_total: Optional[str] = read_only()  # Total discount amount for the order (read-only)
+    discount_tax: Optional[str] = read_only()  # Total discount tax amount for the order (read-only)
+    shipping_total: Optional[str] = read_only()  # Total shipping amount for the order (read-only)
+    shipping_tax: Optional[str] = read_only()  # Total shipping tax amount for the order (read-only)
+    cart_tax: Optional[str] = read_only()  # Sum of line item taxes only (read-only)
+    total: Optional[str] = read_only()  # Grand total (read-only)
+    total_tax: Optional[str] = read_only()  # Sum of all taxes (read-only)
+    prices_include_tax: Optional[bool] = read_only()  # True if the prices included tax during checkout (read-only)
     customer_id: int = 0  # User ID who owns the order (0 for guests) (default is 0)
-    customer_ip_address: Optional[str] = None  # Customer's IP address (read-only)
-    customer_user_agent: Optional[str] = None  # User agent of the customer (read-only)
+    customer_ip_address: Optional[str] = read_only()  # Customer's IP address (read-only)
+    customer_user_agent: Optional[str] = read_only()  # User agent of the customer (read-only)
     customer_note: Optional[str] = None  # Note left by customer during checkout
     billing: Optional[BillingProperties] = None  # Billing address
     shipping: Optional[ShippingProperties] = None  # Shipping address
     payment_method: Optional[str] = None  # Payment method ID
     payment_method_title: Optional[str] = None  # Payment method title
     transaction_id: Optional[str] = None  # Unique transaction ID
-    date_paid: Optional[datetime] = None  # The date the order was paid (site's timezone) (read-only)
-    date_paid_gmt: Optional[datetime] = None  # The date the order was paid (GMT) (read-only)
-    date_completed: Optional[datetime] = None  # The date the order was completed (site's timezone) (read-only)
-    date_completed_gmt: Optional[datetime] = None  # The date the order was completed (GMT) (read-only)
-    cart_hash: Optional[str] = None  # MD5 hash of cart items to ensure orders are not modified (read-only)
+    date_paid: Optional[datetime] = read_only()  # The date the order was paid (site's timezone) (read-only)
+    date_paid_gmt: Optional[datetime] = read_only()  # The date the order was paid (GMT) (read-only)
+    date_completed: Optional[datetime] = read_only()  # The date the order was completed (site's timezone) (read-only)
+    date_completed_gmt: Optional[datetime] = read_only()  # The date the order was completed (GMT) (read-only)
+    cart_hash: Optional[str] = read_only()  # MD5 hash of cart items to ensure orders are not modified (read-only)
     meta_data: List[MetaDataProperties] = Field(default=[])  # Meta data
     line_items: List[LineItemProperties] = Field(default=[])  # Line items data
-    tax_lines: List[TaxLineProperties] = Field(default=[])  # Tax lines data (read-only)
+    tax_lines: List[TaxLineProperties] = read_only(default=[])  # Tax lines data (read-only)
     shipping_lines: List[ShippingLineProperties] = Field(default=[])  # Shipping lines data
     fee_lines: List[FeeLineProperties] = Field(default=[])  # Fee lines data
     coupon_lines: List[CouponLineProperties] = Field(default=[])  # Coupons line data
-    refunds: List[RefundProperties] = Field(default=[])  # List of refunds (read-only)
+    refunds: List[RefundProperties] = read_only(default=[])  # List of refunds (read-only)
     set_paid: Optional[bool] = None  # Define if the order is paid (write-only)
-    
-    def save(self):
-        """
-        Save the product to WooCommerce. Updates if it has an ID, otherwise creates a new one.
-        """
-        # Save categories and tags first
-        for category in self.categories:
-            category.save()
-        for tag in self.tags:
-            tag.save()
-        
-        # Then proceed with the product
-        return super().save()
+
+    # The customer, None for guests. WooCommerce only lists users with the customer role by default
+    customer = Related("wooODM.customers.customer.Customer", "customer_id", filters={"role": "all"})
 
     @classmethod
     def endpoint(cls, id: int = None) -> str:
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Any
 from datetime import datetime
-from wooODM.core import WooDoubleIdODM
+from wooODM.core import WooDoubleIdODM, read_only
 
 class MetaDataProperties(BaseModel):
     id: Optional[int] = None  # Meta ID (read-only)
@@ -59,16 +59,16 @@ class FeeLineProperties(BaseModel):
     meta_data: List[MetaDataProperties] = Field(default=[])  # Meta data
 
 class Refund(WooDoubleIdODM):
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
-    date_created: Optional[datetime] = None  # The date the order refund was created (site's timezone) (read-only)
-    date_created_gmt: Optional[datetime] = None  # The date the order refund was created (GMT) (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
+    date_created: Optional[datetime] = read_only()  # The date the order refund was created (site's timezone) (read-only)
+    date_created_gmt: Optional[datetime] = read_only()  # The date the order refund was created (GMT) (read-only)
     amount: Optional[str] = None  # Total refund amount
     reason: Optional[str] = None  # Reason for refund
     refunded_by: Optional[int] = None  # User ID of user who created the refund
-    refunded_payment: Optional[bool] = None  # If the payment was refunded via the API (read-only)
+    refunded_payment: Optional[bool] = read_only()  # If the payment was refunded via the API (read-only)
     meta_data: List[MetaDataProperties] = Field(default=[])  # Meta data
     line_items: List[LineItemProperties] = Field(default=[])  # Line items data
-    tax_lines: List[TaxLineProperties] = Field(default=[])  # Tax lines data (read-only)
+    tax_lines: List[TaxLineProperties] = read_only(default=[])  # Tax lines data (read-only)
     shipping_lines: List[ShippingLineProperties] = Field(default=[])  # Shipping lines data
     fee_lines: List[FeeLineProperties] = Field(default=[])  # Fee lines data
     api_refund: bool = True  # When true, the payment gateway API is used to generate the refund (write-only)
@@ -1,11 +1,11 @@
 from typing import Optional
-from wooODM.core import WooBasicODM
+from wooODM.core import WooBasicODM, read_only
 
 class ProductAttribute(WooBasicODM):
     """
     Represents a WooCommerce product attribute using Pydantic for validation & deserialization.
     """
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
     name: str  # Attribute name (mandatory)
     slug: Optional[str] = None  # An alphanumeric identifier for the resource unique to its type
     type: str = "select"  # Type of attribute. By default only 'select' is supported
@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from wooODM.core import WooBasicODM
+from wooODM.core import WooBasicODM, read_only
 class ImageProperties(BaseModel):
     """
     Represents the image properties for a WooCommerce product category.
@@ -20,7 +20,7 @@ class Category(WooBasicODM):
     """
     Represents a WooCommerce product category using Pydantic for validation & deserialization.
     """
-    id: Optional[int] = None  # Unique identifier for the category (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the category (read-only)
     name: str  # Category name (mandatory)
     slug: str  # Alphanumeric identifier for the category
     parent: Optional[int] = 0  # Parent ID of the category, 0 means no parent (optional)
@@ -28,7 +28,7 @@ class Category(WooBasicODM):
     display: str = "default"  # Category archive display type, default is 'default'
     image: Optional[ImageProperties] = None  # Image data, see Product category - Image properties
     menu_order: int = 0  # Menu order for custom sorting the category
-    count: Optional[int] = 0  # Number of published products in the category (read-only)
+    count: Optional[int] = read_only(default=0)  # Number of published products in the category (read-only)
 
     @classmethod
     def endpoint(cls, id: int = None) -> str:
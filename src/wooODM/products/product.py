@@ -2,7 +2,9 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
-from wooODM.core import WooBasicODM
+from wooODM.batch import MAX_BATCH_SIZE, BatchResult
+from wooODM.core import WooBasicODM, WooCommerce, read_only
+from wooODM.relations import Related
 
 class DownloadProperties(BaseModel):
     id: Optional[str] = None  # File ID
@@ -56,14 +58,14 @@ class Product(WooBasicODM):
     """
     Represents a WooCommerce product using Pydantic for validation & deserialization.
     """
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
     name: str  # Product name
     slug: Optional[str] = None  # Product slug
-    permalink: Optional[str] = None  # Product URL (read-only)
-    date_created: Optional[datetime] = None  # Date product created (site's timezone, read-only)
-    date_created_gmt: Optional[datetime] = None  # Date product created (GMT, read-only)
-    date_modified: Optional[datetime] = None  # Date product last modified (site's timezone, read-only)
-    date_modified_gmt: Optional[datetime] = None  # Date product last modified (GMT, read-only)
+    permalink: Optional[str] = read_only()  # Product URL (read-only)
+    date_created: Optional[datetime] = read_only()  # Date product created (site's timezone, read-only)
+    date_created_gmt: Optional[datetime] = read_only()  # Date product created (GMT, read-only)
+    date_modified: Optional[datetime] = read_only()  # Date product last modified (site's timezone, read-only)
+    date_modified_gmt: Optional[datetime] = read_only()  # Date product last modified (GMT, read-only)
     type: str = "simple"  # Product type (default is 'simple')
     status: str = "publish"  # Product status (default is 'publish')
     featured: bool = False  # Featured product (default is False)
@@ -71,17 +73,17 @@ class Product(WooBasicODM):
     description: Optional[str] = None  # Product description
     short_description: Optional[str] = None  # Product short description
     sku: Optional[str] = None  # Unique identifier (SKU)
-    price: Optional[str] = None  # Current product price (read-only)
+    price: Optional[str] = read_only()  # Current product price (read-only)
     regular_price: Optional[str] = None  # Product regular price
     sale_price: Optional[str] = None  # Product sale price
     date_on_sale_from: Optional[datetime] = None  # Sale price start date
     date_on_sale_from_gmt: Optional[datetime] = None  # Sale price start date (GMT)
     date_on_sale_to: Optional[datetime] = None  # Sale price end date
     date_on_sale_to_gmt: Optional[datetime] = None  # Sale price end date (GMT)
-    price_html: Optional[str] = None  # Price formatted in HTML (read-only)
-    on_sale: Optional[bool] = None  # If the product is on sale (read-only)
-    purchasable: Optional[bool] = None  # If the product can be purchased (read-only)
-    total_sales: Optional[int] = None  # Amount of sales (read-only)
+    price_html: Optional[str] = read_only()  # Price formatted in HTML (read-only)
+    on_sale: Optional[bool] = read_only()  # If the product is on sale (read-only)
+    purchasable: Optional[bool] = read_only()  # If the product can be purchased (read-only)
+    total_sales: Optional[int] = read_only()  # Amount of sales (read-only)
     virtual: bool = False  # Whether the product is virtual (default is False)
     downloadable: bool = False  # Whether the product is downloadable (default is False)
     downloads: List[DownloadProperties] = Field(default=[])  # List of downloadable files
@@ -95,19 +97,19 @@ class Product(WooBasicODM):
     stock_quantity: Optional[int] = None  # Stock quantity
     stock_status: str = "instock"  # Stock status (default is 'instock')
     backorders: str = "no"  # If backorders are allowed (default is 'no')
-    backorders_allowed: Optional[bool] = None  # If backorders are allowed (read-only)
-    backordered: Optional[bool] = None  # If the product is backordered (read-only)
+    backorders_allowed: Optional[bool] = read_only()  # If backorders are allowed (read-only)
+    backordered: Optional[bool] = read_only()  # If the product is backordered (read-only)
     sold_individually: bool = False  # Allow one item per order (default is False)
     weight: Optional[str] = None  # Product weight
     dimensions: Optional[DimensionsProperties] = None  # Product dimensions
-    shipping_required: Optional[bool] = None  # Whether the product requires shipping (read-only)
-    shipping_taxable: Optional[bool] = None  # Whether product shipping is taxable (read-only)
+    shipping_required: Optional[bool] = read_only()  # Whether the product requires shipping (read-only)
+    shipping_taxable: Optional[bool] = read_only()  # Whether product shipping is taxable (read-only)
     shipping_class: Optional[str] = None  # Shipping class slug
-    shipping_class_id: Optional[int] = None  # Shipping class ID (read-only)
+    shipping_class_id: Optional[int] = read_only()  # Shipping class ID (read-only)
     reviews_allowed: bool = True  # Allow reviews (default is True)
-    average_rating: Optional[str] = None  # Reviews average rating (read-only)
-    rating_count: Optional[int] = None  # Amount of reviews the product has (read-only)
-    related_ids: List[int] = Field(default=[])  # List of related product IDs (read-only)
+    average_rating: Optional[str] = read_only()  # Reviews average rating (read-only)
+    rating_count: Optional[int] = read_only()  # Amount of reviews the product has (read-only)
+    related_ids: List[int] = read_only(default=[])  # List of related product IDs (read-only)
     upsell_ids: List[int] = Field(default=[])  # List of upsell product IDs
     cross_sell_ids: List[int] = Field(default=[])  # List of cross-sell product IDs
     parent_id: Optional[int] = None  # Product parent ID
@@ -117,11 +119,41 @@ class Product(WooBasicODM):
     images: List[ImageProperties] = Field(default=[])  # List of images
     attributes: List[AttributeProperties] = Field(default=[])  # List of attributes
     default_attributes: List[DefaultAttributeProperties] = Field(default=[])  # Default variation attributes
-    variations: List[int] = Field(default=[])  # List of variation IDs (read-only)
+    variations: List[int] = read_only(default=[])  # List of variation IDs (read-only)
     grouped_products: List[int] = Field(default=[])  # List of grouped product IDs
     menu_order: int = 0  # Menu order for sorting products
     meta_data: List[MetaDataProperties] = Field(default=[])  # List of meta data
 
+    parent = Related("wooODM.products.product.Product", "parent_id")  # The parent product
+    related_products = Related("wooODM.products.product.Product", "related_ids")  # Related products
+    upsells = Related("wooODM.products.product.Product", "upsell_ids")  # Upsell products
+    cross_sells = Related("wooODM.products.product.Product", "cross_sell_ids")  # Cross-sell products
+    grouped = Related("wooODM.products.product.Product", "grouped_products")  # Products of a grouped product
+    product_variations = Related("wooODM.products.variations.ProductVariation", "variations", parent="id")  # Variations
+
+    def _before_save(self):
+        """
+        With a Taxonomy set (see WooCommerce.set_taxonomy), resolve the categories, tags and shipping class
+        given by name, creating the missing ones.
+        """
+        if WooCommerce.has_connection():
+            taxonomy = WooCommerce.get_taxonomy()
+            if taxonomy is not None:
+                taxonomy.assign([self])
+
+    @classmethod
+    def save_many(cls, objs, batch_size: int = MAX_BATCH_SIZE) -> BatchResult:
+        """
+        Save many products using the batch endpoint, resolving the terms of all the products up front
+        with one request per taxonomy, instead of one per product.
+        """
+        objs = list(objs)
+        if WooCommerce.has_connection():
+            taxonomy = WooCommerce.get_taxonomy()
+            if taxonomy is not None:
+                taxonomy.assign(objs)
+        return super().save_many(objs, batch_size)
+
     @classmethod
     def endpoint(cls, id: int = None) -> str:
         return "products" if id is None else f"products/{id}"
@@ -1,15 +1,16 @@
 from pydantic import Field, EmailStr
 from typing import Optional
 from datetime import datetime
-from wooODM.core import WooBasicODM
+from wooODM.core import WooBasicODM, read_only
+from wooODM.relations import Related
 
 class ProductReview(WooBasicODM):
     """
     Represents a WooCommerce product review using Pydantic for validation & deserialization.
     """
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
-    date_created: Optional[datetime] = None  # The date the review was created (site's timezone, read-only)
-    date_created_gmt: Optional[datetime] = None  # The date the review was created (GMT, read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
+    date_created: Optional[datetime] = read_only()  # The date the review was created (site's timezone, read-only)
+    date_created_gmt: Optional[datetime] = read_only()  # The date the review was created (GMT, read-only)
     product_id: int  # Unique identifier for the product that the review belongs to
     status: str = "approved"  # Status of the review (default is 'approved')
     reviewer: str  # Reviewer name
@@ -18,6 +19,8 @@ class ProductReview(WooBasicODM):
     rating: int = Field(..., ge=0, le=5)  # Review rating (0 to 5)
     verified: bool  # Shows if the reviewer bought the product or not
 
+    product = Related("wooODM.products.product.Product", "product_id")  # The reviewed product
+
     @classmethod
     def endpoint(cls, id: int = None) -> str:
         return "products/reviews" if id is None else f"products/reviews/{id}"
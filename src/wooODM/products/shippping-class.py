@@ -1,15 +1,15 @@
 from typing import Optional
-from wooODM.core import WooBasicODM
+from wooODM.core import WooBasicODM, read_only
 
 class ShippingClass(WooBasicODM):
     """
     Represents a WooCommerce product shipping class using Pydantic for validation & deserialization.
     """
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
     name: str  # Shipping class name (mandatory)
     slug: Optional[str] = None  # An alphanumeric identifier for the resource unique to its type
     description: Optional[str] = None  # HTML description of the resource
-    count: Optional[int] = None  # Number of published products for the resource (read-only)
+    count: Optional[int] = read_only()  # Number of published products for the resource (read-only)
 
     @classmethod
     def endpoint(cls, id: int = None) -> str:
@@ -1,15 +1,15 @@
 from typing import Optional
-from wooODM.core import WooBasicODM
+from wooODM.core import WooBasicODM, read_only
 
 class ProductTag(WooBasicODM):
     """
     Represents a WooCommerce product tag using Pydantic for validation & deserialization.
     """
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
     name: str  # Tag name (mandatory)
     slug: Optional[str] = None  # Alphanumeric identifier unique to the tag
     description: Optional[str] = None  # HTML description of the tag
-    count: Optional[int] = None  # Number of published products associated with the tag (read-only)
+    count: Optional[int] = read_only()  # Number of published products associated with the tag (read-only)
 
     @classmethod
     def endpoint(cls, id: int = None) -> str:
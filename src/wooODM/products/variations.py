@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Dict, Optional, List, Any
 from datetime import datetime
-from ..core import WooDoubleIdODM
+from ..core import WooDoubleIdODM, read_only
 
 class VariationDimensions(BaseModel):
     length: Optional[str] = None
@@ -34,24 +34,24 @@ class VariationMetaData(BaseModel):
     value: Optional[Any] = None  # Meta value
 
 class ProductVariation(WooDoubleIdODM):
-    id: Optional[int] = None  # Unique identifier for the resource (read-only)
-    date_created: Optional[datetime] = None  # The date the variation was created, in the site's timezone (read-only)
-    date_created_gmt: Optional[datetime] = None  # The date the variation was created, as GMT (read-only)
-    date_modified: Optional[datetime] = None  # The date the variation was last modified, in the site's timezone (read-only)
-    date_modified_gmt: Optional[datetime] = None  # The date the variation was last modified, as GMT (read-only)
+    id: Optional[int] = read_only()  # Unique identifier for the resource (read-only)
+    date_created: Optional[datetime] = read_only()  # The date the variation was created, in the site's timezone (read-only)
+    date_created_gmt: Optional[datetime] = read_only()  # The date the variation was created, as GMT (read-only)
+    date_modified: Optional[datetime] = read_only()  # The date the variation was last modified, in the site's timezone (read-only)
+    date_modified_gmt: Optional[datetime] = read_only()  # The date the variation was last modified, as GMT (read-only)
     description: Optional[str] = None  # Variation description
-    permalink: Optional[str] = None  # Variation URL (read-only)
+    permalink: Optional[str] = read_only()  # Variation URL (read-only)
     sku: Optional[str] = None  # Unique identifier
-    price: Optional[str] = None  # Current variation price (read-only)
+    price: Optional[str] = read_only()  # Current variation price (read-only)
     regular_price: Optional[str] = None  # Variation regular price
     sale_price: Optional[str] = None  # Variation sale price
     date_on_sale_from: Optional[datetime] = None  # Start date of sale price, in the site's timezone
     date_on_sale_from_gmt: Optional[datetime] = None  # Start date of sale price, as GMT
     date_on_sale_to: Optional[datetime] = None  # End date of sale price, in the site's timezone
     date_on_sale_to_gmt: Optional[datetime] = None  # End date of sale price, as GMT
-    on_sale: Optional[bool] = None  # Shows if the variation is on sale (read-only)
+    on_sale: Optional[bool] = read_only()  # Shows if the variation is on sale (read-only)
     status: str = "publish"  # Variation status
-    purchasable: Optional[bool] = None  # Shows if the variation can be bought (read-only)
+    purchasable: Optional[bool] = read_only()  # Shows if the variation can be bought (read-only)
     virtual: bool = False  # If the variation is virtual
     downloadable: bool = False  # If the variation is downloadable
     downloads: List[VariationDownload] = Field(default=[])  # List of downloadable files
@@ -63,12 +63,12 @@ class ProductVariation(WooDoubleIdODM):
     stock_quantity: Optional[int] = None  # Stock quantity
     stock_status: str = "instock"  # Controls the stock status of the product
     backorders: str = "no"  # If managing stock, this controls if backorders are allowed
-    backorders_allowed: Optional[bool] = None  # Shows if backorders are allowed (read-only)
-    backordered: Optional[bool] = None  # Shows if the variation is on backordered (read-only)
+    backorders_allowed: Optional[bool] = read_only()  # Shows if backorders are allowed (read-only)
+    backordered: Optional[bool] = read_only()  # Shows if the variation is on backordered (read-only)
     weight: Optional[str] = None  # Variation weight
     dimensions: Optional[VariationDimensions] = None  # Variation dimensions
     shipping_class: Optional[str] = None  # Shipping class slug
-    shipping_class_id: Optional[int] = None  # Shipping class ID (read-only)
+    shipping_class_id: Optional[int] = read_only()  # Shipping class ID (read-only)
     image: Optional[VariationImage] = None  # Variation image data
     attributes: List[VariationAttribute] = Field(default=[])  # List of attributes
     menu_order: int = 0  # Menu order, used to custom sort products
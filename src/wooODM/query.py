@@ -0,0 +1,213 @@
+from copy import copy
+from datetime import date, datetime
+from functools import lru_cache
+from typing import ClassVar, Optional
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+from .core import MAX_PER_PAGE, _fetch_page, _iter_pages
+from .fast import TrustedLoader, record_class
+from .relations import prefetch
+
+
+class PartialModel(BaseModel):
+    """
+    Base class of the lightweight models returned by projected queries (see Query.only).
+    Only the requested fields are validated, they cannot be saved.
+    """
+    model_config = ConfigDict(extra="ignore")
+    _model: ClassVar = None  # The model class this partial model was derived from
+
+    def _take_snapshot(self):
+        # Partial models are read-only, so there is nothing to track
+        return self
+
+    @classmethod
+    def full_model(cls):
+        """
+        Returns the model class this partial model was derived from.
+        """
+        return cls._model
+
+    def load(self):
+        """
+        Fetch the full, validated item (for models with a single ID).
+        """
+        return self.full_model().get(self.id)
+
+
+@lru_cache(maxsize=None)
+def partial_model(cls, fields: tuple):
+    """
+    Returns a model class with only `fields` of `cls`, all of them optional. Classes are created once per projection.
+    """
+    unknown = [name for name in fields if name not in cls.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields for {cls.__name__}: {', '.join(unknown)}")
+
+    definitions = {
+        name: (Optional[cls.model_fields[name].annotation], None)
+        for name in fields
+    }
+    partial = create_model(f"Partial{cls.__name__}[{','.join(fields)}]", __base__=PartialModel, **definitions)
+    partial._model = cls
+    return partial
+
+
+def _param(value):
+    """
+    Format a filter value the way the WooCommerce REST API expects it.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set)):
+        return ",".join(str(_param(item)) for item in value)
+    return value
+
+
+class Query:
+    """
+    A chainable query, turned into the filter, ordering and `_fields` parameters of the REST API.
+    Every method returns a new Query, so partial queries can be reused.
+
+        Product.query().filter(status="publish", category=12).order_by("-modified").only("id", "sku")
+
+    Filters are passed through as request parameters (e.g. status, sku, category, tag, after, before, include,
+    search), lists are joined with commas and dates formatted in ISO 8601.
+    """
+
+    def __init__(self, model, id1: int = None):
+        self.model = model
+        self.id1 = id1
+        self._filters = {}
+        self._fields = None
+        self._per_page = MAX_PER_PAGE
+        self._fast = False
+        self._prefetch = ()
+
+    def _clone(self, **changes) -> "Query":
+        query = copy(self)
+        query._filters = dict(self._filters)
+        for key, value in changes.items():
+            setattr(query, key, value)
+        return query
+
+    def filter(self, **filters) -> "Query":
+        """
+        Add request filters, e.g. filter(status="publish", sku="SHIRT-1").
+        """
+        query = self._clone()
+        query._filters.update({key: _param(value) for key, value in filters.items()})
+        return query
+
+    def order_by(self, field: str) -> "Query":
+        """
+        Order by a field supported by the endpoint (e.g. "date", "modified", "id", "title", "price"),
+        prefixed with "-" for descending order.
+        """
+        descending = field.startswith("-")
+        return self.filter(orderby=field.lstrip("-"), order="desc" if descending else "asc")
+
+    def only(self, *fields: str) -> "Query":
+        """
+        Only request these top-level fields (using `_fields`) and return lightweight partial models.
+        """
+        fields = tuple(dict.fromkeys(("id",) + fields))  # Keep the ID, so partial items can be loaded fully
+        return self._clone(_fields=fields)
+
+    def per_page(self, per_page: int) -> "Query":
+        return self._clone(_per_page=per_page)
+
+    def fast(self, fast: bool = True) -> "Query":
+        """
+        Skip validation: results are built from the raw response and validated when saved (see ensure_validated),
+        projected results become compact __slots__ records.
+        """
+        return self._clone(_fast=fast)
+
+    def prefetch(self, *paths: str) -> "Query":
+        """
+        Resolve relations of each page of results with a few `include=` filtered requests, instead of one
+        request per item on access, e.g. Order.query().prefetch("customer", "line_items.product").
+        """
+        return self._clone(_prefetch=self._prefetch + paths)
+
+    @property
+    def result_model(self):
+        """
+        The class the results are parsed into: the model itself, a partial model or a record class.
+        """
+        if self._fields:
+            return record_class(self.model, self._fields) if self._fast else partial_model(self.model, self._fields)
+        return TrustedLoader(self.model) if self._fast else self.model
+
+    @property
+    def endpoint(self) -> str:
+        return self.model.endpoint() if self.id1 is None else self.model.endpoint(self.id1)
+
+    def params(self) -> dict:
+        params = dict(self._filters)
+        if self._fields:
+            params["_fields"] = ",".join(self._fields)
+        return params
+
+    def _complete(self, items):
+        """
+        Set the parent ID of the results and resolve the prefetched relations.
+        """
+        if self.id1 is not None and not self._fields:
+            for item in items:
+                item.id1 = self.id1
+        if self._prefetch:
+            prefetch(items, *self._prefetch)
+        return items
+
+    def page(self, page: int = 1):
+        """
+        Fetch a single page of results, as a Page.
+        """
+        result = _fetch_page(self.result_model, self.endpoint, self._per_page, page, self.params())
+        self._complete(result.items)
+        return result
+
+    def iter_pages(self, page: int = 1, workers: int = None, max_in_flight: int = None, ordered: bool = True):
+        """
+        Lazily iterate over the pages of results. See WooBasicODM.iter_pages for the options.
+        """
+        for result in _iter_pages(self.result_model, self.endpoint, self._per_page, page, self.params(),
+                                  workers, max_in_flight, ordered):
+            self._complete(result.items)
+            yield result
+
+    def __iter__(self):
+        for result in self.iter_pages():
+            yield from result.items
+
+    def all(self) -> list:
+        """
+        Fetch every result into a list.
+        """
+        return list(self)
+
+    def first(self):
+        """
+        Returns the first result, None if there is none.
+        """
+        items = self.per_page(1).page().items
+        return items[0] if items else None
+
+    def count(self) -> int:
+        """
+        Returns the number of results, from the X-WP-Total header, or by paging through their IDs
+        if the store does not send it.
+        """
+        query = self._clone(_prefetch=()).only("id").fast()
+        result = query.per_page(1).page()
+        if result.total is not None:
+            return result.total
+        return sum(len(page.items) for page in query.iter_pages())
+
+    def __repr__(self):
+        return f"Query({self.model.__name__}, {self.params()}{', fast' if self._fast else ''})"
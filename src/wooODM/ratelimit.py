@@ -0,0 +1,167 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from time import monotonic, sleep, time
+from typing import Optional, Tuple
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+THROTTLE_STATUSES = frozenset({429, 503})  # Responses telling us to slow down
+
+
+@dataclass
+class RateLimiterStats:
+    """
+    Counters of a RateLimiter, to see how hard the store pushed back.
+    """
+    rate: float = 0.0  # Current request rate, in requests per second
+    requests: int = 0  # Requests let through so far
+    throttled: int = 0  # Throttling responses (429/503) reported so far
+    waited: float = 0.0  # Total time callers spent waiting for a token, in seconds
+
+
+class RateLimiter:
+    """
+    A token bucket shared by every request sent through a transport, whose rate adapts to the store (AIMD):
+    each throttling response divides the rate by `1 / decrease`, while successful requests raise it again by
+    `increase` requests per second for every second of traffic. A Retry-After header pauses all requests until then.
+    Reservations are thread-safe and work for both the sync and the async transport.
+    Args:
+        rate (float): Initial number of requests per second.
+        burst (int): Number of requests which can be sent at once after an idle period (`rate` by default).
+        min_rate (float): The rate is never lowered below this.
+        max_rate (float): The rate is never raised above this (unbounded by default).
+        increase (float): Requests per second added for every second of successful requests.
+        decrease (float): Factor the rate is multiplied with on throttling.
+        cooldown (float): Throttling responses within this many seconds of a decrease are counted only once,
+            since they are usually requests which were already in flight.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = None, min_rate: float = 0.5, max_rate: float = None,
+                 increase: float = 1.0, decrease: float = 0.5, cooldown: float = 1.0, clock=monotonic):
+        self.rate = float(rate)
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._last_decrease = None
+        self._lock = Lock()
+        self.stats = RateLimiterStats(rate=self.rate)
+
+    @property
+    def capacity(self) -> float:
+        return float(self.burst) if self.burst is not None else max(self.rate, 1.0)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, returning how many seconds the caller has to wait before sending its request.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            delay = max(delay, self._paused_until - now)
+            self.stats.requests += 1
+            self.stats.waited += delay
+            return delay
+
+    def acquire(self):
+        """
+        Wait until a request can be sent.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            sleep(delay)
+
+    async def aacquire(self):
+        """
+        Async version of acquire().
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        """
+        Additive increase, called for every response which was not throttled.
+        """
+        with self._lock:
+            rate = self.rate + self.increase / self.rate
+            self._set_rate(min(rate, self.max_rate) if self.max_rate is not None else rate)
+
+    def on_throttle(self, retry_after: float = None):
+        """
+        Multiplicative decrease, called for every throttling response. Requests are paused for `retry_after` seconds.
+        """
+        with self._lock:
+            now = self._clock()
+            self.stats.throttled += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._set_rate(max(self.rate * self.decrease, self.min_rate))
+
+    def _set_rate(self, rate: float):
+        self._refill(self._clock())
+        self.rate = rate
+        self._tokens = min(self._tokens, self.capacity)
+        self.stats.rate = rate
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date. Returns seconds, None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+    Only idempotent methods are retried: a POST which timed out may have created the item already.
+    Delays grow exponentially with full jitter, unless the response says how long to wait (Retry-After).
+    """
+    retries: int = 5  # Number of retries after the first attempt, 0 to disable retrying
+    backoff: float = 0.5  # Base delay, in seconds
+    max_backoff: float = 60.0  # Longest delay between two attempts, in seconds
+    max_retry_after: float = 300.0  # Give up instead of waiting longer than this for a Retry-After
+    statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)  # Responses which are retried
+    methods: frozenset = IDEMPOTENT_METHODS  # Methods which are retried
+
+    def should_retry(self, method: str, attempt: int) -> bool:
+        """
+        Returns True if the `attempt`-th retry (1-based) of a request is allowed.
+        """
+        return attempt <= self.retries and method.upper() in self.methods
+
+    def delay(self, attempt: int, retry_after: float = None) -> Optional[float]:
+        """
+        Seconds to wait before the `attempt`-th retry, None if the Retry-After is too long to wait for.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
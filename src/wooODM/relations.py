@@ -0,0 +1,134 @@
+import importlib
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+MAX_INCLUDE = 100  # IDs per `include=` request, the largest page size accepted by the WooCommerce REST API
+
+
+class Related:
+    """
+    Lazy accessor of the object, or list of objects, an ID field refers to. The objects are fetched on first
+    access and kept on the instance until the ID field changes; prefetch() resolves them for many instances at once.
+
+        class Order(WooBasicODM):
+            customer_id: int = 0
+            customer = Related("wooODM.customers.customer.Customer", "customer_id")
+
+    Args:
+        model (str): Dotted path of the model referred to, imported on first use since models refer to each other.
+        key (str): The field holding the ID, or the list of IDs. Empty IDs (None or 0, e.g. guest customers) refer to nothing.
+        parent (str): For models with two IDs (variations), the field holding the ID of the parent object.
+        filters (dict): Extra filters of the requests, to lift default filters of the endpoint (e.g. role="all").
+    """
+
+    def __init__(self, model: str, key: str, parent: str = None, filters: dict = None):
+        self.path = model
+        self.key = key
+        self.parent = parent
+        self.filters = filters or {}
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    @cached_property
+    def model(self):
+        module, _, name = self.path.rpartition(".")
+        return getattr(importlib.import_module(module), name)
+
+    def keys(self, instance) -> list:
+        """
+        Returns the (parent ID, ID) pairs an instance refers to.
+        """
+        value = getattr(instance, self.key)
+        parent = getattr(instance, self.parent) if self.parent else None
+        ids = value if isinstance(value, list) else [value]
+        return [(parent, item_id) for item_id in ids if item_id]
+
+    def value(self, instance, found: dict):
+        """
+        Returns the related object(s) of an instance out of the loaded ones, a list if the key is a list of IDs.
+        Objects which do not exist (anymore) are left out.
+        """
+        keys = self.keys(instance)
+        if isinstance(getattr(instance, self.key), list):
+            return [found[key] for key in keys if key in found]
+        return found.get(keys[0]) if keys else None
+
+    def load(self, keys) -> dict:
+        """
+        Fetch the objects of (parent ID, ID) pairs with `include=` filtered list requests,
+        one per parent object and MAX_INCLUDE IDs. Returns a dict of (parent ID, ID) -> object.
+        """
+        groups = {}
+        for parent, item_id in keys:
+            groups.setdefault(parent, set()).add(item_id)
+
+        found = {}
+        for parent, ids in groups.items():
+            ids = sorted(ids)
+            query = self.model.query() if parent is None else self.model.query(parent)
+            for start in range(0, len(ids), MAX_INCLUDE):
+                chunk = ids[start:start + MAX_INCLUDE]
+                for item in query.filter(include=chunk, **self.filters).per_page(len(chunk)):
+                    found[(parent, item.id)] = item
+        return found
+
+    def attach(self, instance, found: dict):
+        """
+        Store the related object(s) of an instance, so accessing the relation does not send a request.
+        """
+        keys = self.keys(instance)
+        instance._related[self.name] = (keys, self.value(instance, found))
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        keys = self.keys(instance)
+        cached = instance._related.get(self.name)
+        if cached is None or cached[0] != keys:
+            self.attach(instance, self.load(keys) if keys else {})
+        return instance._related[self.name][1]
+
+
+class HasRelations(BaseModel):
+    """
+    Base class of the models declaring Related accessors, which keeps the loaded related objects.
+    """
+    model_config = ConfigDict(ignored_types=(Related,))
+    _related: dict = PrivateAttr(default_factory=dict)  # Relation name -> (keys, related object(s))
+
+
+def _children(owner, name: str) -> list:
+    value = getattr(owner, name)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def prefetch(items, *paths: str):
+    """
+    Resolve relations of many items at once: the IDs of all the items are collected and fetched with a few
+    `include=` filtered requests, instead of one get() per item. Paths go through nested objects and
+    relations with dots, e.g. prefetch(orders, "customer", "line_items.product").
+    Returns the items.
+    """
+    items = list(items)
+    for path in paths:
+        *nested, name = path.split(".")
+        owners = items
+        for field in nested:
+            owners = [child for owner in owners for child in _children(owner, field)]
+        if not owners:
+            continue
+        if any(isinstance(owner, dict) for owner in owners):
+            raise ValueError(f"Cannot prefetch {path} of items loaded in fast mode, their nested objects are not validated.")
+
+        relation = getattr(type(owners[0]), name, None)
+        if not isinstance(relation, Related):
+            raise ValueError(f"{type(owners[0]).__name__} has no relation {name}")
+        found = relation.load({key for owner in owners for key in relation.keys(owner)})
+        for owner in owners:
+            relation.attach(owner, found)
+    return items
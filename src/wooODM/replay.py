@@ -0,0 +1,145 @@
+import json
+from collections import deque
+from threading import Lock
+
+from requests.structures import CaseInsensitiveDict
+
+RECORDED_HEADERS = ("X-WP-Total", "X-WP-TotalPages", "ETag", "Retry-After", "Content-Type")
+
+
+def _key(method: str, endpoint: str, params: dict = None) -> str:
+    """
+    Identify a request by its method, endpoint and parameters (in any order).
+    """
+    params = sorted((str(name), str(value)) for name, value in (params or {}).items())
+    return json.dumps([method.upper(), endpoint.strip("/"), params])
+
+
+class RecordedResponse:
+    """
+    A response read from a cassette, exposing what the models use of a `requests.Response`.
+    """
+
+    def __init__(self, status_code: int, headers: dict, content: bytes):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+class RecordingTransport:
+    """
+    Wraps a client (e.g. a Transport connected to a real store) and appends every exchange to a cassette,
+    a file with one JSON object per request, which a ReplayTransport can answer from later.
+
+        transport = RecordingTransport(Transport(url, key, secret), "catalog.jsonl")
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(transport))
+    """
+
+    def __init__(self, transport, path: str):
+        self.transport = transport
+        self.path = path
+        self._lock = Lock()
+
+    def request(self, method: str, endpoint: str, data=None, params: dict = None, headers: dict = None):
+        kwargs = {"params": params, "headers": headers}
+        if method.upper() in ("POST", "PUT"):
+            response = getattr(self.transport, method.lower())(endpoint, data, **kwargs)
+        else:
+            response = getattr(self.transport, method.lower())(endpoint, **kwargs)
+        self.record(method, endpoint, params, data, response)
+        return response
+
+    def record(self, method: str, endpoint: str, params: dict, data, response):
+        if isinstance(data, bytes):
+            data = json.loads(data)
+        entry = {
+            "method": method.upper(),
+            "endpoint": endpoint,
+            "params": params or {},
+            "data": data,
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "body": response.content.decode("utf-8"),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+
+    def get(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("GET", endpoint, params=params, headers=headers)
+
+    def post(self, endpoint, data, params: dict = None, headers: dict = None):
+        return self.request("POST", endpoint, data, params, headers)
+
+    def put(self, endpoint, data, params: dict = None, headers: dict = None):
+        return self.request("PUT", endpoint, data, params, headers)
+
+    def delete(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("DELETE", endpoint, params=params, headers=headers)
+
+    def options(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("OPTIONS", endpoint, params=params, headers=headers)
+
+
+class ReplayTransport:
+    """
+    Answers requests from a cassette written by RecordingTransport, without any network access, so benchmarks
+    and tests run against realistic captured payloads. Requests are matched by method, endpoint and parameters;
+    when a request was recorded several times the responses are returned in the recorded order.
+    Args:
+        path (str): The cassette.
+        loop (bool): Start over from the first recorded response once they have all been returned,
+            so a benchmark can replay the same session many times. Otherwise unknown and exhausted requests fail.
+    """
+
+    def __init__(self, path: str, loop: bool = True):
+        self.loop = loop
+        self.responses = {}  # Request key -> recorded responses
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = (entry["status"], entry["headers"], entry["body"].encode("utf-8"))
+                self.responses.setdefault(_key(entry["method"], entry["endpoint"], entry["params"]), []).append(response)
+        self._queues = {key: deque(responses) for key, responses in self.responses.items()}
+        self._lock = Lock()
+        self.requests = 0  # Requests answered so far
+
+    def request(self, method: str, endpoint: str, data=None, params: dict = None, headers: dict = None):
+        key = _key(method, endpoint, params)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is not None and not queue and self.loop:
+                queue.extend(self.responses[key])
+            if not queue:
+                raise LookupError(f"No recorded response for {method.upper()} {endpoint} {params or {}}")
+            status, response_headers, content = queue.popleft()
+            self.requests += 1
+        return RecordedResponse(status, response_headers, content)
+
+    def get(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("GET", endpoint, params=params, headers=headers)
+
+    def post(self, endpoint, data, params: dict = None, headers: dict = None):
+        return self.request("POST", endpoint, data, params, headers)
+
+    def put(self, endpoint, data, params: dict = None, headers: dict = None):
+        return self.request("PUT", endpoint, data, params, headers)
+
+    def delete(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("DELETE", endpoint, params=params, headers=headers)
+
+    def options(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("OPTIONS", endpoint, params=params, headers=headers)
@@ -0,0 +1,416 @@
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Optional
+
+from .core import WooDoubleIdODM, MAX_PER_PAGE
+from .fast import loader
+from .sync import SyncCursor, _gmt
+from .products.product import Product
+from .products.variations import ProductVariation
+from .products.category import Category
+from .products.tag import ProductTag
+from .customers.customer import Customer
+from .orders.order import Order
+
+DEFAULT_MODELS = (Category, ProductTag, Product, ProductVariation, Customer, Order)
+INCREMENTAL_MODELS = (Product, Order)  # Endpoints supporting the modified_after filter
+INDEXED_FIELDS = ("sku", "status", "slug", "email", "parent_id", "customer_id", "date_created_gmt", "date_modified_gmt")
+LINE_ITEM_FIELDS = ("id", "product_id", "variation_id", "sku", "name", "quantity", "total")
+OPERATORS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "ne": "!="}
+
+
+def _table(cls) -> str:
+    """
+    Table name of a model, e.g. ProductVariation -> wooodm_product_variation.
+    """
+    return "wooodm_" + re.sub(r"(?<!^)(?=[A-Z])", "_", cls.__name__).lower()
+
+
+def _state_key(cls, id1: int = None) -> str:
+    """
+    Key of the sync cursor of a model, or of the items of a parent object, e.g. ProductVariation:12.
+    """
+    return cls.__name__ if id1 is None else f"{cls.__name__}:{id1}"
+
+
+def _columns(cls) -> tuple:
+    """
+    The top-level fields of a model which get their own indexed column.
+    """
+    return tuple(name for name in INDEXED_FIELDS if name in cls.model_fields)
+
+
+def _value(value):
+    """
+    Convert a filter value to how it is stored: dates as naive GMT ISO strings, booleans as integers.
+    """
+    if isinstance(value, datetime):
+        return _gmt(value).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class Replica:
+    """
+    A local copy of the catalog and the orders of a store in a SQLite database, for reporting queries
+    which would otherwise page through the API (see WooBasicODM.local).
+    Products and orders are refreshed incrementally by date_modified_gmt, the variations of the variable products
+    which changed are fetched again, those of the other variable products are refreshed incrementally (one request
+    per variable product, as WooCommerce has no store-wide variations endpoint) and the other models
+    (categories, tags, customers) are copied in full.
+    Items deleted from the store are only noticed by the full copies, trashed products and orders are kept with
+    their "trash" status.
+    Each model is stored in its own table, with an indexed column for each of INDEXED_FIELDS it has and the full
+    item as JSON. Order line items are also stored in a `wooodm_order_line_item` table, indexed by product, variation
+    and SKU.
+    Args:
+        path (str): Path of the database, shared by every thread (and process) using the replica.
+        models (tuple): The models to replicate.
+    """
+
+    def __init__(self, path: str, models: tuple = DEFAULT_MODELS):
+        self.path = path
+        self.models = tuple(models)
+        self._local = threading.local()
+        self._create()
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared between threads, so each thread opens its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connection()
+        db.execute("BEGIN")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _create(self):
+        with self._transaction() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS wooodm_replica_state (model TEXT PRIMARY KEY, cursor TEXT)")
+            for cls in self.models:
+                table = _table(cls)
+                parent = ["id1 INTEGER"] if issubclass(cls, WooDoubleIdODM) else []
+                columns = list(_columns(cls))  # No type affinity, values are compared as stored
+                db.execute(f"CREATE TABLE IF NOT EXISTS {table} ("
+                           f"{', '.join(['id INTEGER PRIMARY KEY'] + parent + columns + ['data TEXT NOT NULL'])})")
+                for name in ["id1"] * bool(parent) + list(_columns(cls)):
+                    db.execute(f"CREATE INDEX IF NOT EXISTS {table}_{name} ON {table} ({name})")
+            if Order in self.models:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS wooodm_order_line_item (order_id INTEGER NOT NULL, id INTEGER, "
+                    "product_id INTEGER, variation_id INTEGER, sku TEXT, name TEXT, quantity INTEGER, total TEXT)"
+                )
+                for name in ("order_id", "product_id", "variation_id", "sku"):
+                    db.execute(f"CREATE INDEX IF NOT EXISTS wooodm_order_line_item_{name} "
+                               f"ON wooodm_order_line_item ({name})")
+
+    def cursor(self, cls, id1: int = None) -> Optional[SyncCursor]:
+        """
+        Returns how far the incremental sync of a model (or of the items of a parent object) got,
+        None if it was never synced.
+        """
+        row = self._connection().execute(
+            "SELECT cursor FROM wooodm_replica_state WHERE model = ?", (_state_key(cls, id1),)
+        ).fetchone()
+        return SyncCursor.parse(row[0]) if row and row[0] else None
+
+    def _save_cursor(self, db, cls, cursor: Optional[SyncCursor], id1: int = None):
+        if cursor is None:
+            db.execute("DELETE FROM wooodm_replica_state WHERE model = ?", (_state_key(cls, id1),))
+        else:
+            db.execute("INSERT OR REPLACE INTO wooodm_replica_state (model, cursor) VALUES (?, ?)",
+                       (_state_key(cls, id1), str(cursor)))
+
+    def _write(self, db, cls, items):
+        table = _table(cls)
+        columns = _columns(cls)
+        parent = ("id1",) if issubclass(cls, WooDoubleIdODM) else ()
+        rows = []
+        for item in items:
+            data = item.model_dump(mode="json")
+            rows.append(tuple([item.id] + [getattr(item, name) for name in parent]
+                              + [data.get(name) for name in columns] + [json.dumps(data)]))
+        names = ("id",) + parent + columns + ("data",)
+        db.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})", rows
+        )
+        if cls is Order:
+            ids = [(item.id,) for item in items]
+            db.executemany("DELETE FROM wooodm_order_line_item WHERE order_id = ?", ids)
+            db.executemany(
+                f"INSERT INTO wooodm_order_line_item (order_id, {', '.join(LINE_ITEM_FIELDS)}) "
+                f"VALUES ({', '.join('?' * (len(LINE_ITEM_FIELDS) + 1))})",
+                [(item.id,) + tuple(getattr(line, name) for name in LINE_ITEM_FIELDS)
+                 for item in items for line in item.line_items]
+            )
+
+    def _sync_incremental(self, cls, per_page: int, variable: list, id1: int = None) -> int:
+        """
+        Write the items (of a parent object) changed since the last sync, saving the cursor after each page
+        so an interrupted sync resumes where it stopped. The IDs of the changed variable products are added
+        to `variable`. Returns the number of items written.
+        """
+        if id1 is None:
+            stream = cls.changed_since(self.cursor(cls), per_page=per_page)
+        else:
+            stream = cls.changed_since(id1, self.cursor(cls, id1), per_page=per_page)
+        page = []
+
+        def flush():
+            with self._transaction() as db:
+                self._write(db, cls, page)
+                self._save_cursor(db, cls, stream.cursor, id1)
+            variable.extend(item.id for item in page if getattr(item, "type", None) == "variable")
+            page.clear()
+
+        for item in stream:
+            page.append(item)
+            if len(page) >= per_page:
+                flush()
+        if page:
+            flush()
+        return stream.count
+
+    def _sync_full(self, cls, per_page: int, id1: int = None) -> int:
+        """
+        Replace the stored items of a model (or of a parent object) with the ones in the store.
+        Returns the number of items written.
+        """
+        if id1 is None:
+            items = list(cls.iter_all(per_page=per_page))
+        else:
+            items = list(cls.iter_all(id1, per_page=per_page))
+        with self._transaction() as db:
+            if id1 is None:
+                db.execute(f"DELETE FROM {_table(cls)}")
+            else:
+                db.execute(f"DELETE FROM {_table(cls)} WHERE id1 = ?", (id1,))
+                self._save_cursor(db, cls, SyncCursor.after(items), id1)
+            self._write(db, cls, items)
+        return len(items)
+
+    def _sync_children(self, cls, per_page: int, variable: list) -> int:
+        """
+        Copy the variations of the variable products which changed in full, so deleted variations are dropped,
+        and write the variations of the other stored variable products which changed since the last sync.
+        Returns the number of items written.
+        """
+        parents = [row[0] for row in self._connection().execute(
+            f"SELECT id FROM {_table(Product)} WHERE json_extract(data, '$.type') = 'variable' ORDER BY id"
+        )]
+        written = 0
+        for id1 in parents:
+            if id1 in variable or self.cursor(cls, id1) is None:
+                written += self._sync_full(cls, per_page, id1)
+            else:
+                written += self._sync_incremental(cls, per_page, [], id1)
+        return written
+
+    def sync(self, per_page: int = MAX_PER_PAGE) -> dict:
+        """
+        Bring the replica up to date with the store of the current connection.
+        Returns the number of items written per model name.
+        """
+        written = {}
+        variable = []  # IDs of the variable products which changed
+        # Variations come after their parent products, whose changes decide which ones are fetched
+        for cls in sorted(self.models, key=lambda cls: issubclass(cls, WooDoubleIdODM)):
+            if cls in INCREMENTAL_MODELS:
+                written[cls.__name__] = self._sync_incremental(cls, per_page, variable)
+            elif issubclass(cls, WooDoubleIdODM):
+                if Product not in self.models:
+                    raise Exception(f"{cls.__name__} can only be replicated together with its parent Product.")
+                written[cls.__name__] = self._sync_children(cls, per_page, set(variable))
+            else:
+                written[cls.__name__] = self._sync_full(cls, per_page)
+        return written
+
+    def write(self, cls, items):
+        """
+        Store items received outside of sync(), e.g. from webhooks, replacing the stored copies.
+        """
+        items = list(items)
+        if items:
+            with self._transaction() as db:
+                self._write(db, cls, items)
+
+    def modified(self, cls, item_id: int) -> Optional[datetime]:
+        """
+        Returns the date_modified_gmt of the stored copy of an item, None if it is not stored or has no such date.
+        """
+        if "date_modified_gmt" not in _columns(cls):
+            return None
+        row = self._connection().execute(
+            f"SELECT date_modified_gmt FROM {_table(cls)} WHERE id = ?", (item_id,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def delete(self, cls, ids):
+        """
+        Remove the items with the given IDs, e.g. when a webhook reports they were deleted.
+        """
+        ids = [(item_id,) for item_id in ids]
+        with self._transaction() as db:
+            db.executemany(f"DELETE FROM {_table(cls)} WHERE id = ?", ids)
+            if cls is Order:
+                db.executemany("DELETE FROM wooodm_order_line_item WHERE order_id = ?", ids)
+
+    def query(self, cls, id1: int = None) -> "LocalQuery":
+        """
+        Start a query over the stored items of a model, see WooBasicODM.local.
+        """
+        if cls not in self.models:
+            raise Exception(f"{cls.__name__} is not replicated.")
+        query = LocalQuery(self, cls)
+        return query if id1 is None else query.filter(id1=id1)
+
+    def execute(self, sql: str, params: tuple = ()) -> list:
+        """
+        Run a raw SQL query against the replica, e.g. to aggregate wooodm_order_line_item rows. Returns the rows.
+        """
+        return self._connection().execute(sql, params).fetchall()
+
+    def clear(self):
+        with self._transaction() as db:
+            db.execute("DELETE FROM wooodm_replica_state")
+            for cls in self.models:
+                db.execute(f"DELETE FROM {_table(cls)}")
+            if Order in self.models:
+                db.execute("DELETE FROM wooodm_order_line_item")
+
+
+class LocalQuery:
+    """
+    A chainable query over the items stored in a Replica, answered by SQLite instead of the API.
+    Every method returns a new LocalQuery.
+
+        Product.local().filter(sku="SHIRT-1").first()
+        Order.local().filter(line_items__sku="SHIRT-1", date_created_gmt__gte=last_week).count()
+
+    Filters compare a field with a value, or with an operator suffix: __gt, __gte, __lt, __lte, __ne and __in.
+    Indexed fields (see INDEXED_FIELDS) use their column, other top-level fields are read from the stored JSON.
+    Orders can also be filtered on their line items with line_items__<field> (product_id, variation_id, sku, ...).
+    """
+
+    def __init__(self, replica: Replica, model):
+        self.replica = replica
+        self.model = model
+        self._where = []  # (sql, params)
+        self._order = None
+        self._limit = None
+        self._fast = False
+
+    def _clone(self, **changes) -> "LocalQuery":
+        query = LocalQuery(self.replica, self.model)
+        query.__dict__.update({**self.__dict__, "_where": list(self._where), **changes})
+        return query
+
+    def _column(self, name: str) -> str:
+        if name in ("id", "id1") or name in _columns(self.model):
+            return name
+        if name not in self.model.model_fields:
+            raise ValueError(f"Unknown field for {self.model.__name__}: {name}")
+        return f"json_extract(data, '$.{name}')"
+
+    def _condition(self, column: str, operator: str, value) -> tuple:
+        if operator == "in":
+            values = [_value(item) for item in value]
+            return f"{column} IN ({', '.join('?' * len(values))})", values
+        if value is None:
+            return f"{column} IS {'NOT ' if operator == 'ne' else ''}NULL", []
+        return f"{column} {OPERATORS.get(operator, '=')} ?", [_value(value)]
+
+    def filter(self, **filters) -> "LocalQuery":
+        """
+        Add conditions, e.g. filter(status="publish", date_modified_gmt__gte=datetime(2024, 1, 1)).
+        """
+        where = []
+        for key, value in filters.items():
+            name, _, operator = key.partition("__")
+            if name == "line_items" and self.model is Order:
+                field, _, operator = operator.partition("__")
+                if field not in LINE_ITEM_FIELDS:
+                    raise ValueError(f"Unknown line item field: {field}")
+                sql, params = self._condition(f"line.{field}", operator, value)
+                where.append((f"id IN (SELECT line.order_id FROM wooodm_order_line_item AS line WHERE {sql})", params))
+                continue
+            if operator and operator != "in" and operator not in OPERATORS:
+                raise ValueError(f"Unknown operator: {operator}")
+            where.append(self._condition(self._column(name), operator, value))
+        return self._clone(_where=self._where + where)
+
+    def order_by(self, field: str) -> "LocalQuery":
+        """
+        Order by a field, prefixed with "-" for descending order.
+        """
+        return self._clone(_order=f"{self._column(field.lstrip('-'))} {'DESC' if field.startswith('-') else 'ASC'}")
+
+    def limit(self, limit: int) -> "LocalQuery":
+        return self._clone(_limit=limit)
+
+    def fast(self, fast: bool = True) -> "LocalQuery":
+        """
+        Skip validation, like the fast read mode of the API (see ensure_validated).
+        """
+        return self._clone(_fast=fast)
+
+    def _sql(self, select: str) -> tuple:
+        sql = f"SELECT {select} FROM {_table(self.model)}"
+        params = []
+        if self._where:
+            sql += " WHERE " + " AND ".join(condition for condition, _ in self._where)
+            for _, values in self._where:
+                params += values
+        if self._order:
+            sql += f" ORDER BY {self._order}"
+        if self._limit is not None:
+            sql += f" LIMIT {int(self._limit)}"
+        return sql, params
+
+    def __iter__(self):
+        parse = loader(self.model, self._fast)
+        parent = issubclass(self.model, WooDoubleIdODM)
+        sql, params = self._sql("id1, data" if parent else "data")
+        for row in self.replica._connection().execute(sql, params):
+            item = parse.model_validate(json.loads(row[-1]))._take_snapshot()
+            if parent:
+                item.id1 = row[0]
+            yield item
+
+    def all(self) -> list:
+        return list(self)
+
+    def first(self):
+        """
+        Returns the first result, None if there is none.
+        """
+        return next(iter(self.limit(1)), None)
+
+    def count(self) -> int:
+        sql, params = self._clone(_order=None, _limit=None)._sql("COUNT(*)")
+        return self.replica._connection().execute(sql, params).fetchone()[0]
+
+    def ids(self) -> list:
+        """
+        Returns the IDs of the results, without parsing the items.
+        """
+        sql, params = self._sql("id")
+        return [row[0] for row in self.replica._connection().execute(sql, params)]
+
+    def __repr__(self):
+        return f"LocalQuery({self.model.__name__}, {self._sql('*')})"
@@ -0,0 +1,133 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+
+def _gmt(value: datetime) -> datetime:
+    """
+    Convert aware datetimes to naive GMT ones, which is how WooCommerce reports *_gmt dates.
+    """
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass(frozen=True, order=True)
+class SyncCursor:
+    """
+    Position in the stream of changes of a model: the modification date (GMT) of the last item seen,
+    its ID, and the IDs of every item seen with that modification date. WooCommerce does not order
+    items modified in the same second by ID, so those are needed to resume without skipping any.
+    Use str(cursor) / SyncCursor.parse() or to_dict() / from_dict() to persist it.
+    """
+    modified: datetime  # date_modified_gmt of the last item seen (naive, GMT)
+    last_id: int = 0  # ID of the last item seen
+    seen: frozenset = field(default=frozenset(), compare=False)  # IDs seen with the modification date
+
+    @classmethod
+    def since(cls, modified: datetime) -> "SyncCursor":
+        """
+        A cursor returning every item modified at or after `modified`. Aware datetimes are converted to GMT.
+        """
+        return cls(_gmt(modified), 0)
+
+    @classmethod
+    def after(cls, items) -> Optional["SyncCursor"]:
+        """
+        The cursor positioned after every given item, None if none of them has a modification date.
+        """
+        positions = [cls(_gmt(item.date_modified_gmt), item.id or 0) for item in items
+                     if item.date_modified_gmt is not None]
+        if not positions:
+            return None
+        latest = max(positions)
+        seen = frozenset(position.last_id for position in positions if position.modified == latest.modified)
+        return cls(latest.modified, latest.last_id, seen)
+
+    def __str__(self):
+        value = f"{self.modified.isoformat()}|{self.last_id}"
+        if self.seen:
+            value += "|" + ",".join(str(item_id) for item_id in sorted(self.seen))
+        return value
+
+    @classmethod
+    def parse(cls, value: str) -> "SyncCursor":
+        modified, last_id, *seen = value.split("|")
+        seen = frozenset(int(item_id) for item_id in seen[0].split(",")) if seen and seen[0] else frozenset()
+        return cls(datetime.fromisoformat(modified), int(last_id), seen)
+
+    def to_dict(self) -> dict:
+        return {"modified": self.modified.isoformat(), "last_id": self.last_id, "seen": sorted(self.seen)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SyncCursor":
+        return cls(datetime.fromisoformat(data["modified"]), int(data.get("last_id", 0)),
+                   frozenset(int(item_id) for item_id in data.get("seen", ())))
+
+
+class ChangeStream:
+    """
+    Iterates over the items modified after a cursor, oldest change first, using the `modified_after`,
+    `dates_are_gmt` and `orderby=modified` filters of the WooCommerce REST API.
+    Pages are requested by keyset: each request asks for the first page of the items modified after the cursor,
+    so items modified during the sync (which move to the end of the ordering) cannot shift unseen items
+    onto a page which was already read.
+    `cursor` advances as items are consumed, so it can be persisted at any point and passed back
+    to changed_since() to resume.
+    Args:
+        cls: The model class, which must have a date_modified_gmt field.
+        fetch: Callable taking the request filters and a page number, and returning that Page.
+        cursor (SyncCursor): Where to start from, None to go through every item.
+    """
+
+    def __init__(self, cls, fetch, cursor: Optional[SyncCursor] = None):
+        if "date_modified_gmt" not in cls.model_fields:
+            raise Exception(f"{cls.__name__} has no modification date, so its changes cannot be followed.")
+        self.model = cls
+        self.cursor = cursor
+        self._fetch = fetch
+        # IDs seen with the modification date of the cursor (only last_id for cursors persisted without them)
+        self._ids_at_cursor = set(cursor.seen) | {cursor.last_id} if cursor is not None else set()
+        self.count = 0  # Number of changed items yielded so far
+
+    def filters(self) -> dict:
+        filters = {"orderby": "modified", "order": "asc", "dates_are_gmt": "true"}
+        if self.cursor is not None:
+            # modified_after is exclusive and has a one second resolution, so ask for the second before
+            # the cursor and drop the items which were already seen
+            filters["modified_after"] = (self.cursor.modified - timedelta(seconds=1)).isoformat()
+        return filters
+
+    def _seen(self, position: SyncCursor) -> bool:
+        if self.cursor is None or position.modified > self.cursor.modified:
+            return False
+        # Items modified in the same second are not ordered by ID, so remember which ones were yielded
+        return position.modified < self.cursor.modified or position.last_id in self._ids_at_cursor
+
+    def _advance(self, position: SyncCursor):
+        if self.cursor is None or position.modified > self.cursor.modified:
+            self._ids_at_cursor = set()
+        self._ids_at_cursor.add(position.last_id)
+        latest = position if self.cursor is None or position > self.cursor else self.cursor
+        self.cursor = SyncCursor(latest.modified, latest.last_id, frozenset(self._ids_at_cursor))
+
+    def __iter__(self):
+        number = 1
+        while True:
+            page = self._fetch(self.filters(), number)
+            progressed = False
+            for item in page.items:
+                if item.date_modified_gmt is None:
+                    continue
+                position = SyncCursor(_gmt(item.date_modified_gmt), item.id or 0)
+                if self._seen(position):
+                    continue
+                self._advance(position)
+                progressed = True
+                self.count += 1
+                yield item
+            if page.next is None:
+                return
+            # Start over from the new cursor, unless a whole page was already seen
+            # (more items modified within the same second than fit on a page)
+            number = 1 if progressed else page.next
@@ -0,0 +1,295 @@
+import importlib
+import re
+import threading
+from time import monotonic
+from typing import Optional
+
+from .core import MAX_PER_PAGE
+from .products.attributes import ProductAttribute
+from .products.category import Category
+from .products.tag import ProductTag
+from .relations import MAX_INCLUDE
+
+# The module name has a dash, so it cannot be imported with an import statement
+ShippingClass = importlib.import_module("wooODM.products.shippping-class").ShippingClass
+
+DEFAULT_MODELS = (Category, ProductTag, ShippingClass, ProductAttribute)
+
+
+def slugify(name: str) -> str:
+    """
+    A slug for a term name, e.g. "Men's Shirts" -> "men-s-shirts". WooCommerce may still adjust it on creation.
+    """
+    return re.sub(r"[^\w]+", "-", name.strip().lower()).strip("-_")
+
+
+class TermIndex:
+    """
+    The terms of one taxonomy (e.g. every Category), indexed by ID, slug and name. Names are matched without case,
+    and are only unique among the children of a category.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.by_id = {}
+        self.by_slug = {}
+        self.by_name = {}  # Lower-case name -> terms with that name
+        self.loaded = None  # monotonic() time of the last full load, None if never loaded
+
+    def add(self, term):
+        self.remove(term.id)
+        self.by_id[term.id] = term
+        if term.slug:
+            self.by_slug[term.slug] = term
+        self.by_name.setdefault(term.name.casefold(), []).append(term)
+
+    def remove(self, term_id: int):
+        term = self.by_id.pop(term_id, None)
+        if term is None:
+            return
+        if self.by_slug.get(term.slug) is term:
+            del self.by_slug[term.slug]
+        named = self.by_name.get(term.name.casefold(), [])
+        if term in named:
+            named.remove(term)
+
+    def replace(self, terms):
+        self.by_id, self.by_slug, self.by_name = {}, {}, {}
+        for term in terms:
+            self.add(term)
+        self.loaded = monotonic()
+
+    def find(self, value: str, parent: int = None):
+        """
+        Returns the term with this slug or name, None if there is none. With `parent`, only the children of that
+        category match; otherwise top-level categories are preferred over subcategories of the same name.
+        """
+        if parent is None and value in self.by_slug:
+            return self.by_slug[value]
+        terms = self.by_name.get(value.strip().casefold(), [])
+        if parent is not None:
+            terms = [term for term in terms if (getattr(term, "parent", 0) or 0) == parent]
+        if not terms:
+            return None
+        return min(terms, key=lambda term: (bool(getattr(term, "parent", 0)), term.id))
+
+    def __iter__(self):
+        return iter(list(self.by_id.values()))
+
+    def __len__(self):
+        return len(self.by_id)
+
+
+class Taxonomy:
+    """
+    An in-memory copy of the product taxonomies of a store (categories with their hierarchy, tags, shipping classes
+    and attributes), so product terms can be resolved by name or slug without a request per lookup.
+    Each taxonomy is loaded in full on first use. The terms endpoints cannot be filtered by modification date, so
+    the copy is kept current by reloading a taxonomy once it is older than `ttl`, by fetching unknown IDs on demand
+    and by adding the terms created through ensure().
+
+        taxonomy = WooCommerce.set_taxonomy(Taxonomy())
+        product = Product(name="Shirt", categories=[{"name": "Men > Shirts"}], tags=[{"name": "summer"}])
+        product.save()  # Creates the missing terms in one batch request per taxonomy, then fills in their IDs
+
+    Args:
+        models (tuple): The taxonomies to hold.
+        ttl (float): Number of seconds after which a taxonomy is reloaded, None to keep it until refresh().
+        separator (str): Separates the levels of category paths, e.g. "Men > Shirts".
+    """
+
+    def __init__(self, models: tuple = DEFAULT_MODELS, ttl: Optional[float] = None, separator: str = ">"):
+        self.indexes = {cls: TermIndex(cls) for cls in models}
+        self.ttl = ttl
+        self.separator = separator
+        self._lock = threading.RLock()
+
+    def _stale(self, index: TermIndex) -> bool:
+        return index.loaded is None or (self.ttl is not None and monotonic() - index.loaded > self.ttl)
+
+    def index(self, cls) -> TermIndex:
+        """
+        Returns the index of a taxonomy, loading it first if needed.
+        """
+        if cls not in self.indexes:
+            raise Exception(f"{cls.__name__} is not part of the taxonomy.")
+        index = self.indexes[cls]
+        if self._stale(index):
+            self.load(cls)
+        return index
+
+    def load(self, *models):
+        """
+        Load taxonomies in full, all of them by default.
+        """
+        for cls in models or tuple(self.indexes):
+            terms = list(cls.iter_all(per_page=MAX_PER_PAGE))
+            with self._lock:
+                self.indexes[cls].replace(terms)
+        return self
+
+    def refresh(self):
+        """
+        Reload the taxonomies which were never loaded or are older than the TTL.
+        """
+        return self.load(*[cls for cls, index in self.indexes.items() if self._stale(index)])
+
+    def add(self, *terms):
+        """
+        Add or replace terms, e.g. after creating or renaming them elsewhere.
+        """
+        with self._lock:
+            for term in terms:
+                self.index(type(term)).add(term)
+
+    def discard(self, cls, *ids):
+        """
+        Remove deleted terms.
+        """
+        with self._lock:
+            for term_id in ids:
+                self.index(cls).remove(term_id)
+
+    def fetch(self, cls, ids) -> list:
+        """
+        Fetch terms by ID with `include=` requests and add them. Returns the terms found.
+        """
+        ids = sorted(set(ids))
+        found = []
+        for start in range(0, len(ids), MAX_INCLUDE):
+            chunk = ids[start:start + MAX_INCLUDE]
+            found.extend(cls.query().filter(include=chunk).per_page(len(chunk)))
+        self.add(*found)
+        return found
+
+    def get(self, cls, value, parent: int = None):
+        """
+        Returns a term by ID, slug or name (a path such as "Men > Shirts" for categories), None if there is none.
+        Unknown IDs are fetched.
+        """
+        with self._lock:
+            index = self.index(cls)
+            if isinstance(value, int):
+                if value not in index.by_id:
+                    self.fetch(cls, [value])
+                return index.by_id.get(value)
+            if cls is Category and self.separator in value:
+                term = None
+                for name in self._split(value):
+                    term = index.find(name, term.id if term is not None else 0)
+                    if term is None:
+                        return None
+                return term
+            return index.find(value, parent)
+
+    def _split(self, path: str) -> list:
+        return [name.strip() for name in path.split(self.separator) if name.strip()]
+
+    def children(self, category) -> list:
+        """
+        Returns the direct subcategories of a category (or category ID), 0 for the top-level categories.
+        """
+        parent = category if isinstance(category, int) else category.id
+        return sorted((term for term in self.index(Category) if (term.parent or 0) == parent),
+                      key=lambda term: (term.menu_order, term.name))
+
+    def ancestors(self, category) -> list:
+        """
+        Returns the parent categories of a category (or category ID), from the top-level one down.
+        """
+        term = self.get(Category, category) if isinstance(category, int) else category
+        ancestors = []
+        while term is not None and term.parent and len(ancestors) < len(self.index(Category)):
+            term = self.get(Category, term.parent)
+            if term is not None:
+                ancestors.insert(0, term)
+        return ancestors
+
+    def path(self, category) -> str:
+        """
+        Returns the full name of a category, e.g. "Men > Shirts".
+        """
+        term = self.get(Category, category) if isinstance(category, int) else category
+        return f" {self.separator} ".join(item.name for item in self.ancestors(term) + [term])
+
+    def ensure(self, cls, values) -> dict:
+        """
+        Returns the terms of the given names (or slugs, or category paths), creating the missing ones
+        with one batch request per taxonomy (per level for new nested categories). Returns {value: term}.
+        """
+        values = list(dict.fromkeys(values))
+        with self._lock:
+            found = {value: self.get(cls, value) for value in values}
+            missing = [value for value, term in found.items() if term is None]
+            if not missing:
+                return found
+            if cls is Category:
+                paths = {value: self._split(value) for value in missing}
+                for depth in range(max(len(names) for names in paths.values())):
+                    level = {}  # (parent ID, name) -> path prefix
+                    for names in paths.values():
+                        if len(names) > depth:
+                            parent = self.get(Category, f" {self.separator} ".join(names[:depth])) if depth else None
+                            key = (parent.id if parent is not None else 0, names[depth].casefold())
+                            level.setdefault(key, names[:depth + 1])
+                    self._create(cls, [(prefix[-1], parent) for (parent, _), prefix in level.items()
+                                       if self.get(cls, f" {self.separator} ".join(prefix)) is None])
+            else:
+                # Names only differing in case are the same term
+                names = {value.strip().casefold(): value.strip() for value in reversed(missing)}
+                self._create(cls, [(name, None) for name in reversed(list(names.values()))])
+            return {value: self.get(cls, value) for value in values}
+
+    def _create(self, cls, terms: list):
+        """
+        Create (name, parent ID) terms with a batch request and add them. Terms which already exist
+        (created concurrently, or whose name only differs in case) are fetched instead.
+        """
+        if not terms:
+            return
+        objects = [cls(name=name, slug=slugify(name), **({"parent": parent} if cls is Category else {}))
+                   for name, parent in terms]
+        result = cls.save_many(objects)
+        self.add(*result.created)
+        existing = []
+        for error in result.errors:
+            resource_id = (error.data or {}).get("resource_id") if isinstance(error.data, dict) else None
+            if error.code != "term_exists" or resource_id is None:
+                raise Exception(f"Could not create {cls.__name__} {error.item.name!r}: {error.message}")
+            existing.append(resource_id)
+        if existing:
+            self.fetch(cls, existing)
+
+    def assign(self, products, create: bool = True):
+        """
+        Fill in the IDs of the categories and tags of products given by name (or slug, or category path) and
+        replace shipping class names with their slug, creating the missing terms unless `create` is False.
+        Each taxonomy is resolved with at most one batch request for all the products. Returns the products,
+        validated if they were loaded in fast mode.
+        """
+        products = [product.ensure_validated() for product in products]
+        for cls, field in ((Category, "categories"), (ProductTag, "tags")):
+            if cls not in self.indexes:
+                continue
+            unresolved = [term for product in products for term in getattr(product, field) if not term.id]
+            values = [term.name or term.slug for term in unresolved if term.name or term.slug]
+            if not values:
+                continue
+            found = self.ensure(cls, values) if create else {value: self.get(cls, value) for value in values}
+            for term in unresolved:
+                resolved = found.get(term.name or term.slug)
+                if resolved is not None:
+                    term.id, term.name, term.slug = resolved.id, resolved.name, resolved.slug
+
+        if ShippingClass in self.indexes:
+            index = self.index(ShippingClass)
+            names = [product.shipping_class for product in products
+                     if product.shipping_class and product.shipping_class not in index.by_slug]
+            if names:
+                found = self.ensure(ShippingClass, names) if create else \
+                    {name: self.get(ShippingClass, name) for name in names}
+                for product in products:
+                    resolved = found.get(product.shipping_class)
+                    if resolved is not None:
+                        product.shipping_class = resolved.slug
+        return products
@@ -0,0 +1,337 @@
+import asyncio
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter, sleep, time
+from typing import Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING  # gzip/deflate, plus br and zstd when their decoders are installed
+from woocommerce import __version__ as woocommerce_version
+from woocommerce.oauth import OAuth
+
+from .decode import dumps
+from .instrumentation import current_event, record_attempt
+from .ratelimit import RateLimiter, RetryPolicy, THROTTLE_STATUSES, parse_retry_after
+
+try:
+    import httpx  # Optional, install using `pip install wooODM[async]`
+except ImportError:  # pragma: no cover - depends on the environment
+    httpx = None
+
+
+@dataclass
+class PoolStats:
+    """
+    Usage of the connection pool of a Transport, to size it to the number of workers using it.
+    """
+    hosts: int = 0  # Number of hosts with a connection pool
+    max_size: int = 0  # Maximum number of connections kept per host
+    connections: int = 0  # Connections opened so far (each one is a TCP + TLS handshake)
+    idle: int = 0  # Connections currently open and waiting to be reused
+    requests: int = 0  # Requests sent so far
+
+    @property
+    def reuse_ratio(self) -> float:
+        """
+        Share of the requests which were sent over an already open connection.
+        """
+        return 1 - self.connections / self.requests if self.requests else 0.0
+
+
+class BaseTransport:
+    """
+    Builds URLs and authenticates requests exactly like `woocommerce.API` does:
+    HTTP Basic auth over HTTPS (or query string auth if requested), OAuth 1.0a signed URLs over plain HTTP.
+    Args:
+        timeout (float): Default connect and read timeout, in seconds.
+        connect_timeout (float): Seconds to wait for a connection to the store, `timeout` by default.
+        read_timeout (float): Seconds to wait for the store to send data, `timeout` by default.
+        compression (bool): Ask for compressed responses (gzip, and brotli if it is installed).
+        rate_limiter (RateLimiter): Shared token bucket every request waits for, None to send requests right away.
+        retry (RetryPolicy): How failed idempotent requests are retried, None to never retry them.
+    """
+
+    def __init__(self, url, consumer_key, consumer_secret, version="wc/v3", wp_api=True, timeout=5,
+                 verify_ssl=True, query_string_auth=False, user_agent=None, connect_timeout=None,
+                 read_timeout=None, compression=True, rate_limiter: RateLimiter = None,
+                 retry: Optional[RetryPolicy] = RetryPolicy()):
+        self.url = url
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.version = version
+        self.wp_api = wp_api
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout if connect_timeout is not None else timeout
+        self.read_timeout = read_timeout if read_timeout is not None else timeout
+        self.verify_ssl = verify_ssl
+        self.query_string_auth = query_string_auth
+        self.user_agent = user_agent or f"WooCommerce-Python-REST-API/{woocommerce_version}"
+        self.compression = compression
+        self.is_ssl = url.startswith("https")
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.retries = 0  # Number of requests sent again after a failure
+
+    def _get_url(self, endpoint: str) -> str:
+        """
+        Return the full URL of an endpoint, e.g. https://shop.example/wp-json/wc/v3/products.
+        """
+        url = self.url if self.url.endswith("/") else f"{self.url}/"
+        api = "wp-json" if self.wp_api else "wc-api"
+        return f"{url}{api}/{self.version}/{endpoint}"
+
+    def _prepare(self, method: str, endpoint: str, data=None, params: dict = None):
+        """
+        Prepare a request.
+        Returns:
+            tuple: (url, params, auth, headers, body), where auth is a (key, secret) tuple for Basic auth or None.
+        """
+        params = dict(params or {})
+        url = self._get_url(endpoint)
+        auth = None
+        headers = {
+            "user-agent": self.user_agent,
+            "accept": "application/json",
+            "accept-encoding": ACCEPT_ENCODING if self.compression else "identity",
+            "connection": "keep-alive",
+        }
+
+        if self.is_ssl and not self.query_string_auth:
+            auth = (self.consumer_key, self.consumer_secret)
+        elif self.is_ssl and self.query_string_auth:
+            params.update({
+                "consumer_key": self.consumer_key,
+                "consumer_secret": self.consumer_secret,
+            })
+        else:
+            # OAuth signs the full URL, so the parameters have to be part of it
+            if params:
+                url = f"{url}?{urlencode(params)}"
+            url = OAuth(
+                url=url,
+                consumer_key=self.consumer_key,
+                consumer_secret=self.consumer_secret,
+                version=self.version,
+                method=method,
+                oauth_timestamp=int(time()),
+            ).get_oauth_url()
+            params = {}
+
+        body = None
+        if data is not None:
+            # Payloads are encoded once, bytes are sent as they are
+            body = data if isinstance(data, bytes) else dumps(data)
+            headers["content-type"] = "application/json;charset=utf-8"
+
+        return url, params, auth, headers, body
+
+    def _after_response(self, method: str, attempt: int, response) -> Optional[float]:
+        """
+        Report a response to the rate limiter.
+        Returns how many seconds to wait before sending the request again, None if the response should be returned.
+        """
+        status = response.status_code
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if self.rate_limiter is not None:
+            if status in THROTTLE_STATUSES:
+                self.rate_limiter.on_throttle(retry_after)
+            else:
+                self.rate_limiter.on_success()
+        if self.retry is None or status not in self.retry.statuses or not self.retry.should_retry(method, attempt):
+            return None
+        return self.retry.delay(attempt, retry_after)
+
+    def _after_error(self, method: str, attempt: int) -> Optional[float]:
+        """
+        Returns how many seconds to wait before sending a request which could not reach the store again,
+        None if the error should be raised.
+        """
+        if self.retry is None or not self.retry.should_retry(method, attempt):
+            return None
+        return self.retry.delay(attempt)
+
+
+class Transport(BaseTransport):
+    """
+    A drop-in replacement for `woocommerce.API`, which also lets callers add request headers
+    (e.g. If-None-Match for conditional requests).
+    Requests go through a pooled `requests.Session`, so connections (and their TLS handshakes) are kept alive
+    and reused. The session is thread-safe, size the pool to the number of threads sharing the transport.
+    Args:
+        pool_connections (int): Number of hosts to keep a connection pool for.
+        pool_size (int): Maximum number of connections kept open per host.
+        pool_block (bool): Wait for a free connection when the pool is full, instead of opening a throwaway one.
+        **kwargs: Passed on to BaseTransport (timeout, connect_timeout, read_timeout, compression, ...).
+    """
+
+    def __init__(self, url, consumer_key, consumer_secret, pool_connections=10, pool_size=10, pool_block=False,
+                 **kwargs):
+        super().__init__(url, consumer_key, consumer_secret, **kwargs)
+        self.pool_size = pool_size
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_size, pool_block=pool_block)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self._requests = 0
+        self._lock = Lock()
+
+    def request(self, method: str, endpoint: str, data=None, params: dict = None, headers: dict = None):
+        """
+        Send a request, waiting for the rate limiter first. Idempotent requests which failed with a retryable status
+        or a connection error are sent again (see RetryPolicy), the last response is returned.
+        The time spent, the last response and the retries are recorded on the tracked request, if any (see RequestEvent).
+        """
+        event = current_event()
+        attempt = 0
+        while True:
+            attempt += 1
+            # Prepared again for each attempt, OAuth signatures include a timestamp
+            url, request_params, auth, request_headers, body = self._prepare(method, endpoint, data, params)
+            if headers:
+                request_headers.update(headers)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self._lock:
+                self._requests += 1
+            start = perf_counter()
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    params=request_params,
+                    auth=auth,
+                    headers=request_headers,
+                    data=body,
+                    timeout=(self.connect_timeout, self.read_timeout),
+                    verify=self.verify_ssl
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                record_attempt(event, attempt, start)
+                delay = self._after_error(method, attempt)
+                if delay is None:
+                    raise
+            else:
+                record_attempt(event, attempt, start, response)
+                delay = self._after_response(method, attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            with self._lock:
+                self.retries += 1
+            sleep(delay)
+
+    def get(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("GET", endpoint, params=params, headers=headers)
+
+    def post(self, endpoint, data, params: dict = None, headers: dict = None):
+        return self.request("POST", endpoint, data, params, headers)
+
+    def put(self, endpoint, data, params: dict = None, headers: dict = None):
+        return self.request("PUT", endpoint, data, params, headers)
+
+    def delete(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("DELETE", endpoint, params=params, headers=headers)
+
+    def options(self, endpoint, params: dict = None, headers: dict = None):
+        return self.request("OPTIONS", endpoint, params=params, headers=headers)
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Returns the current usage of the connection pool.
+        """
+        stats = PoolStats(max_size=self.pool_size, requests=self._requests)
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue  # Evicted in the meantime
+            stats.hosts += 1
+            stats.connections += pool.num_connections
+            stats.idle += sum(1 for connection in list(pool.pool.queue) if connection is not None)
+        return stats
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+        self.session.close()
+
+
+class AsyncTransport(BaseTransport):
+    """
+    An asyncio counterpart of `woocommerce.API`, backed by a pooled `httpx.AsyncClient`.
+    It exposes the same get/post/put/delete methods, as coroutines.
+    """
+
+    def __init__(self, url, consumer_key, consumer_secret, max_connections=100, max_keepalive_connections=20, **kwargs):
+        if httpx is None:
+            raise ImportError("The async client requires httpx. Install it using `pip install wooODM[async]`.")
+        super().__init__(url, consumer_key, consumer_secret, **kwargs)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._client = None
+
+    @property
+    def client(self):
+        """
+        The underlying connection pool, created on first use.
+        """
+        if self._client is None:
+            timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=timeout, verify=self.verify_ssl)
+        return self._client
+
+    async def request(self, method: str, endpoint: str, data=None, params: dict = None, headers: dict = None):
+        """
+        Async version of Transport.request, with the same rate limiting, retries and recording.
+        """
+        event = current_event()
+        attempt = 0
+        while True:
+            attempt += 1
+            url, request_params, auth, request_headers, body = self._prepare(method, endpoint, data, params)
+            if headers:
+                request_headers.update(headers)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire()
+            start = perf_counter()
+            try:
+                response = await self.client.request(
+                    method, url, params=request_params, auth=auth, headers=request_headers, content=body
+                )
+            except httpx.TransportError:
+                record_attempt(event, attempt, start)
+                delay = self._after_error(method, attempt)
+                if delay is None:
+                    raise
+            else:
+                record_attempt(event, attempt, start, response)
+                delay = self._after_response(method, attempt, response)
+                if delay is None:
+                    return response
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, endpoint, params: dict = None, headers: dict = None):
+        return await self.request("GET", endpoint, params=params, headers=headers)
+
+    async def post(self, endpoint, data, params: dict = None, headers: dict = None):
+        return await self.request("POST", endpoint, data, params, headers)
+
+    async def put(self, endpoint, data, params: dict = None, headers: dict = None):
+        return await self.request("PUT", endpoint, data, params, headers)
+
+    async def delete(self, endpoint, params: dict = None, headers: dict = None):
+        return await self.request("DELETE", endpoint, params=params, headers=headers)
+
+    async def aclose(self):
+        """
+        Close all pooled connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,361 @@
+import base64
+import hashlib
+import hmac
+import queue
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from typing import Any, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from .cache import forget, remember
+from .connection import Connection
+from .core import WooCommerce
+from .customers.customer import Customer
+from .decode import loads
+from .orders.order import Order
+from .products.product import Product
+from .sync import _gmt
+
+MODELS = {"order": Order, "product": Product, "customer": Customer}  # Webhook resource -> model
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 405: "Method Not Allowed",
+           503: "Service Unavailable"}
+
+
+def sign(body: bytes, secret: str) -> str:
+    """
+    Returns the X-WC-Webhook-Signature WooCommerce sends with a body: the base64 HMAC-SHA256 of the body.
+    """
+    return base64.b64encode(hmac.new(secret.encode("utf-8"), body, hashlib.sha256).digest()).decode("ascii")
+
+
+def _modified(value) -> Optional[datetime]:
+    """
+    Returns a date_modified_gmt value (a datetime or its ISO string) as a naive GMT datetime, None if unknown.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return _gmt(value) if isinstance(value, datetime) else None
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Check the X-WC-Webhook-Signature of a delivery, in constant time.
+    """
+    return bool(signature) and hmac.compare_digest(sign(body, secret), signature)
+
+
+@dataclass
+class Delivery:
+    """
+    A webhook delivery, e.g. for the "order.updated" topic.
+    `item` is the payload validated into its model (Order, Product or Customer), None for deletions, whose payload
+    only holds the ID, and for resources without a model (e.g. coupons).
+    Deletions carry no modification date, so they are dated by `received`.
+    """
+    id: Optional[str]  # X-WC-Webhook-Delivery-ID
+    topic: str
+    webhook_id: Optional[str]
+    payload: Any
+    item: Any = None
+    received: Optional[datetime] = None  # When the delivery was received (naive GMT)
+
+    @property
+    def resource(self) -> str:
+        return self.topic.partition(".")[0]
+
+    @property
+    def event(self) -> str:
+        return self.topic.partition(".")[2]
+
+    @property
+    def item_id(self) -> Optional[int]:
+        return self.payload.get("id") if isinstance(self.payload, dict) else None
+
+
+class WebhookReceiver:
+    """
+    Receives WooCommerce webhooks instead of polling the store: deliveries are checked against the webhook secret,
+    parsed into models, written to the read cache and the replica of the connection, and passed on to the handlers
+    registered for their topic.
+
+        receiver = WebhookReceiver(secret)
+
+        @receiver.on("order.created")
+        def new_order(delivery):
+            print(delivery.item.id, delivery.item.total)
+
+        app = receiver          # a WSGI app, e.g. `gunicorn module:app`
+        app = receiver.asgi     # or an ASGI app, e.g. `uvicorn module:app`
+
+    Deliveries are answered as soon as they are verified and queued, `workers` threads process them. When the queue
+    is full, deliveries are refused with 503 so the sender backs off instead of memory growing. WooCommerce delivers
+    again after a timeout, deliveries already received are recognized by their ID and skipped.
+    Workers may process deliveries of the same item out of order, so items older than their cached or replicated
+    copy (by date_modified_gmt) or than their last deletion are not written, and deletions received before
+    the stored copy was modified do not remove it; their handlers are still called.
+    Args:
+        secret (str): The secret of the webhooks.
+        connection: The connection (or its name) whose cache and replica are updated and which the handlers use,
+            the default one if None.
+        workers (int): Number of threads processing deliveries, 0 to process them before answering.
+        max_queue (int): Maximum number of deliveries waiting to be processed.
+        dedup_size (int): Number of delivery IDs remembered to skip duplicates, and of deleted items remembered.
+        update_cache (bool): Write the received items to the read cache (see ModelCache).
+        update_replica (bool): Write the received items to the replica (see Replica).
+    """
+
+    def __init__(self, secret: str, connection=None, workers: int = 4, max_queue: int = 1000,
+                 dedup_size: int = 10000, update_cache: bool = True, update_replica: bool = True):
+        self.secret = secret
+        self.connection = connection
+        self.workers = max(workers, 0)
+        self.update_cache = update_cache
+        self.update_replica = update_replica
+        self.handlers = []  # (topic pattern, handler)
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dedup_size = dedup_size
+        self.received = 0  # Deliveries accepted
+        self.duplicates = 0
+        self.rejected = 0  # Deliveries refused, because of their signature or a full queue
+        self.failed = 0  # Deliveries whose processing raised
+        self.stale = 0  # Deliveries older than the stored copy of their item, not written
+        self.errors = deque(maxlen=100)  # The last (delivery, exception) pairs which failed
+        self._seen = OrderedDict()  # Delivery IDs received, oldest first
+        self._deleted = OrderedDict()  # (model, ID) -> when its last deletion was received, oldest first
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Makes checking and replacing the stored copies atomic
+        self._threads = []
+
+    def on(self, topic: str, handler=None):
+        """
+        Register a handler called with each Delivery of a topic. Topics may contain wildcards, e.g. "order.*" or "*".
+        Can be used as a decorator.
+        """
+        if handler is None:
+            return lambda handler: self.on(topic, handler)
+        self.handlers.append((topic, handler))
+        return handler
+
+    def start(self):
+        """
+        Start the worker threads, done on the first delivery otherwise.
+        """
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"wooODM-webhooks-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """
+        Process the queued deliveries, then stop the worker threads.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self.queue.put(None)
+        for thread in threads:
+            thread.join()
+
+    def join(self):
+        """
+        Wait until every queued delivery was processed.
+        """
+        self.queue.join()
+
+    def _work(self):
+        while True:
+            delivery = self.queue.get()
+            try:
+                if delivery is None:
+                    return
+                self.process(delivery)
+            finally:
+                self.queue.task_done()
+
+    def _is_duplicate(self, delivery_id: Optional[str]) -> bool:
+        if delivery_id is None:
+            return False
+        with self._lock:
+            if delivery_id in self._seen:
+                self._seen.move_to_end(delivery_id)
+                self.duplicates += 1
+                return True
+            self._seen[delivery_id] = None
+            while len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+        return False
+
+    def _forget_delivery(self, delivery_id: Optional[str]):
+        if delivery_id is not None:
+            with self._lock:
+                self._seen.pop(delivery_id, None)
+
+    def receive(self, body: bytes, headers) -> tuple:
+        """
+        Accept a delivery, given its raw body and HTTP headers. Returns the (status, message) to answer with.
+        """
+        headers = CaseInsensitiveDict(headers)
+        topic = headers.get("X-WC-Webhook-Topic")
+        if topic is None and body.startswith(b"webhook_id="):
+            return 200, "pong"  # Sent by WooCommerce when a webhook is created, without a signature
+        if not verify_signature(body, headers.get("X-WC-Webhook-Signature"), self.secret):
+            self.rejected += 1
+            return 401, "invalid signature"
+        if not topic:
+            return 400, "missing topic"
+        try:
+            payload = loads(body)
+        except ValueError:
+            return 400, "invalid JSON"
+
+        delivery = Delivery(headers.get("X-WC-Webhook-Delivery-ID"), topic, headers.get("X-WC-Webhook-ID"), payload,
+                            received=_gmt(datetime.now(timezone.utc)))
+        if self._is_duplicate(delivery.id):
+            return 200, "duplicate"
+        if not self.workers:
+            self.received += 1
+            self.process(delivery)
+            return 200, "processed"
+        if len(self._threads) < self.workers:
+            self.start()
+        try:
+            self.queue.put_nowait(delivery)
+        except queue.Full:
+            self._forget_delivery(delivery.id)  # So it is accepted when delivered again
+            self.rejected += 1
+            return 503, "busy"
+        self.received += 1
+        return 202, "queued"
+
+    def process(self, delivery: Delivery):
+        """
+        Parse a delivery, update the cache and the replica and call its handlers.
+        Errors are counted and kept in `errors`, they do not stop the other handlers.
+        """
+        try:
+            connection = self.connection
+            if not isinstance(connection, Connection):
+                connection = WooCommerce.get_connection(connection)
+            with WooCommerce.using(connection):
+                self._apply(connection, delivery)
+                for pattern, handler in self.handlers:
+                    if fnmatchcase(delivery.topic, pattern):
+                        handler(delivery)
+        except Exception as error:
+            self.failed += 1
+            self.errors.append((delivery, error))
+
+    def _is_stale(self, connection, cls, delivery: Delivery) -> bool:
+        """
+        Returns whether the cache or the replica holds a copy of the item modified after the delivered one
+        (or after the deletion was received), or whether the item was deleted after the delivered one was modified.
+        """
+        if delivery.event == "deleted":
+            modified = delivery.received
+        elif "date_modified_gmt" in cls.model_fields:
+            modified = _modified(delivery.item.date_modified_gmt)
+            deleted = self._deleted.get((cls, delivery.item_id))
+            if modified is not None and deleted is not None and modified <= deleted:
+                return True
+        else:
+            modified = None
+        if modified is None:
+            return False
+        stored = []
+        if self.update_cache and connection.cache is not None:
+            data = connection.cache.backend.get(cls.endpoint(delivery.item_id))
+            stored.append(_modified(data.get("date_modified_gmt")) if isinstance(data, dict) else None)
+        replica = connection.replica
+        if self.update_replica and replica is not None and cls in replica.models:
+            stored.append(_modified(replica.modified(cls, delivery.item_id)))
+        return any(date is not None and modified < date for date in stored)
+
+    def _apply(self, connection, delivery: Delivery):
+        cls = MODELS.get(delivery.resource)
+        if cls is None or delivery.item_id is None:
+            return
+        deleted = delivery.event == "deleted"
+        if deleted:
+            delivery.received = delivery.received or _gmt(datetime.now(timezone.utc))
+        else:
+            delivery.item = cls.model_validate(delivery.payload)._take_snapshot()
+        with self._write_lock:
+            if self._is_stale(connection, cls, delivery):
+                self.stale += 1
+                return
+            if deleted:
+                key = (cls, delivery.item_id)
+                self._deleted[key] = max(delivery.received, self._deleted.pop(key, delivery.received))
+                while len(self._deleted) > self.dedup_size:
+                    self._deleted.popitem(last=False)
+            if self.update_cache:
+                endpoint = cls.endpoint(delivery.item_id)
+                if deleted:
+                    forget(connection, endpoint)
+                else:
+                    remember(connection, cls, endpoint, delivery.item, delivery.payload)
+            replica = connection.replica
+            if self.update_replica and replica is not None and cls in replica.models:
+                if deleted:
+                    replica.delete(cls, [delivery.item_id])
+                else:
+                    replica.write(cls, [delivery.item])
+
+    def __call__(self, environ, start_response):
+        """
+        The WSGI app.
+        """
+        if environ.get("REQUEST_METHOD") != "POST":
+            status, message = 405, "POST only"
+        else:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = environ["wsgi.input"].read(length) if length else b""
+            headers = {name[5:].replace("_", "-"): value for name, value in environ.items() if name.startswith("HTTP_")}
+            status, message = self.receive(body, headers)
+        content = message.encode("utf-8")
+        start_response(f"{status} {REASONS[status]}", [("Content-Type", "text/plain; charset=utf-8"),
+                                                        ("Content-Length", str(len(content)))])
+        return [content]
+
+    async def asgi(self, scope, receive, send):
+        """
+        The ASGI app. Deliveries are verified and queued on the event loop, the workers process them.
+        """
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    self.start()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    self.stop()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        if scope["method"] != "POST":
+            status, message = 405, "POST only"
+        else:
+            body = b""
+            more = True
+            while more:
+                event = await receive()
+                body += event.get("body", b"")
+                more = event.get("more_body", False)
+            headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+            status, message = self.receive(body, headers)
+        content = message.encode("utf-8")
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"text/plain; charset=utf-8"),
+                                (b"content-length", str(len(content)).encode())]})
+        await send({"type": "http.response.body", "body": content})
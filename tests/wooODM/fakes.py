@@ -0,0 +1,181 @@
+"""
+Test doubles of the WooCommerce client, shared by the tests which do not need a real HTTP server (see wooODM.mock).
+"""
+import json
+import threading
+from copy import deepcopy
+
+
+class FakeResponse:
+    """
+    A response holding its decoded payload. With `raw`, it also has the JSON body as `content`,
+    which the fast decoding path reads instead of calling json().
+    """
+    def __init__(self, payload, status_code=200, headers=None, raw=False):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.json_calls = 0
+        if raw:
+            self.content = json.dumps(payload).encode()
+
+    def json(self):
+        self.json_calls += 1
+        return self.payload
+
+
+def page(items: list, params: dict) -> tuple:
+    """
+    Returns the page of `items` selected by the per_page and page parameters of a list request,
+    with the X-WP-Total and X-WP-TotalPages headers WooCommerce sends along.
+    """
+    per_page, number = params.get("per_page", 10), params.get("page", 1)
+    totals = {"X-WP-Total": str(len(items)), "X-WP-TotalPages": str(max(-(-len(items) // per_page), 1))}
+    return items[(number - 1) * per_page:number * per_page], totals
+
+
+class FakeStoreAPI:
+    """
+    Serves the items of a store by endpoint, e.g. {"products": [...], "products/1/variations": [...]}, like
+    WooCommerce: list requests honour per_page/page and the include, status, role (customers only, "customer"
+    by default), modified_after, orderby=modified and _fields parameters, single items are served, updated and deleted by ID, and batch requests create,
+    update and delete items.
+    Requests are recorded in `requests` as (method, endpoint, params or data), and responses in `responses`.
+    Args:
+        data (dict): The items of each list endpoint.
+        headers (bool): Send the X-WP-Total and X-WP-TotalPages headers with list responses.
+        next_id (int): The ID of the last created item.
+        raw (bool): Send responses with a raw JSON body (see FakeResponse).
+    """
+    def __init__(self, data: dict, headers: bool = True, next_id: int = 1000, raw: bool = False):
+        self.data = data
+        self.headers = headers
+        self.next_id = next_id
+        self.raw = raw
+        self.requests = []
+        self.responses = []
+        self.lock = threading.Lock()
+
+    def record(self, method: str, endpoint: str, arguments=None):
+        if method in ("POST", "PUT"):
+            json.dumps(arguments)  # Payloads must be JSON-compatible
+        with self.lock:
+            self.requests.append((method, endpoint, arguments))
+
+    def respond(self, payload, status_code: int = 200, headers: dict = None) -> FakeResponse:
+        response = FakeResponse(payload, status_code, headers, raw=self.raw)
+        with self.lock:
+            self.responses.append(response)
+        return response
+
+    def endpoints(self, method: str = None) -> list:
+        """
+        Returns the endpoints requested (with `method` only), in order.
+        """
+        return [endpoint for verb, endpoint, _ in self.requests if method in (None, verb)]
+
+    def _locate(self, endpoint: str) -> tuple:
+        """
+        Returns the (list endpoint, item ID) of an endpoint, the ID being None for lists.
+        """
+        path = endpoint.rstrip("/")
+        collection, _, last = path.rpartition("/")
+        if last.isdigit() and collection in self.data:
+            return collection, int(last)
+        return path, None
+
+    def item(self, collection: str, item_id: int):
+        """
+        Returns the stored item with this ID, None if there is none.
+        """
+        return next((item for item in self.data.get(collection, []) if item["id"] == item_id), None)
+
+    def _missing(self) -> FakeResponse:
+        return self.respond({"code": "woocommerce_rest_invalid_id", "message": "Invalid ID."}, 404)
+
+    def get(self, endpoint, params=None, **kwargs):
+        params = dict(params or {})
+        self.record("GET", endpoint, params)
+        collection, item_id = self._locate(endpoint)
+        if item_id is not None:
+            item = self.item(collection, item_id)
+            return self._missing() if item is None else self.respond(deepcopy(item))
+
+        items = deepcopy(self.data.get(collection, []))
+        if "include" in params:
+            include = {int(value) for value in str(params["include"]).split(",")}
+            items = [item for item in items if item["id"] in include]
+        if params.get("status") not in (None, "any"):
+            items = [item for item in items if item.get("status") == params["status"]]
+        if collection == "customers" and params.get("role", "customer") != "all":
+            items = [item for item in items if item.get("role", "customer") == params.get("role", "customer")]
+        if "modified_after" in params:
+            items = [item for item in items if item.get("date_modified_gmt", "") > params["modified_after"]]
+        if params.get("orderby") == "modified" or "modified_after" in params:
+            items.sort(key=lambda item: (item.get("date_modified_gmt", ""), item["id"]),
+                       reverse=params.get("order") == "desc")
+        if "_fields" in params:
+            fields = params["_fields"].split(",")
+            items = [{key: value for key, value in item.items() if key in fields} for item in items]
+        items, totals = page(items, params)
+        return self.respond(items, headers=totals if self.headers else None)
+
+    def put(self, endpoint, data, **kwargs):
+        self.record("PUT", endpoint, data)
+        item = self.item(*self._locate(endpoint))
+        if item is None:
+            return self._missing()
+        item.update(data)
+        return self.respond(deepcopy(item))
+
+    def delete(self, endpoint, params=None, **kwargs):
+        self.record("DELETE", endpoint, params)
+        collection, item_id = self._locate(endpoint)
+        item = self.item(collection, item_id)
+        if item is None:
+            return self._missing()
+        self.data[collection].remove(item)
+        return self.respond(item)
+
+    def post(self, endpoint, data, **kwargs):
+        self.record("POST", endpoint, data)
+        collection, _, action = endpoint.rstrip("/").rpartition("/")
+        if action != "batch":
+            return self.respond(self.create(endpoint.rstrip("/"), data), 201)
+        response = {}
+        if "create" in data:
+            response["create"] = [self.create(collection, item) for item in data["create"]]
+        if "update" in data:
+            response["update"] = []
+            for item in data["update"]:
+                stored = self.item(collection, item["id"])
+                if stored is None:
+                    response["update"].append({"id": item["id"], "error": {"code": "invalid_id", "message": "Invalid ID."}})
+                else:
+                    stored.update(item)
+                    response["update"].append(deepcopy(stored))
+        if "delete" in data:
+            response["delete"] = []
+            for item_id in data["delete"]:
+                stored = self.item(collection, item_id)
+                if stored is None:
+                    response["delete"].append({"id": item_id, "error": {"code": "invalid_id", "message": "Invalid ID."}})
+                else:
+                    self.data[collection].remove(stored)
+                    response["delete"].append(stored)
+        return self.respond(response)
+
+    def create(self, collection: str, data: dict) -> dict:
+        """
+        Store a new item, returning it or, for a duplicate SKU, the error WooCommerce answers with.
+        """
+        with self.lock:
+            items = self.data.setdefault(collection, [])
+            if data.get("sku") and any(item.get("sku") == data["sku"] for item in items):
+                return {"id": 0, "error": {"code": "product_invalid_sku", "message": "Duplicate SKU."}}
+            self.next_id += 1
+            item = {**data, "id": self.next_id}
+            if collection == "products":
+                item["permalink"] = f"https://shop/{self.next_id}"
+            items.append(item)
+            return deepcopy(item)
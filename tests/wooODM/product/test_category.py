@@ -2,17 +2,26 @@ import unittest
 import unittest
 from wooODM.products.category import Category
 from wooODM.core import WooCommerce
+from wooODM.mock import MockServer
 
 class TestCategoryModel(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        # Initialize WooCommerce API with dummy credentials for testing
+        # Initialize WooCommerce API with dummy credentials, against a local stand-in store
+        cls.server = MockServer().start()
         WooCommerce.init(
-            url="",
-            consumer_key="",
-            consumer_secret=""
+            url=cls.server.url,
+            consumer_key="ck_test",
+            consumer_secret="cs_test"
         )
+
+    @classmethod
+    def tearDownClass(cls):
+        WooCommerce.get_connection().close()
+        WooCommerce.remove()
+        cls.server.stop()
+
     @classmethod
     def create_test_category(cls, name="Test Category", slug="test-category", description="A category for testing"):
         category = Category(
@@ -0,0 +1,75 @@
+import json
+import unittest
+import httpx
+from wooODM.core import WooCommerce
+from wooODM.products.tag import ProductTag
+from wooODM.orders.notes import OrderNote
+
+
+class TestAsyncModels(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tags = {i: {"id": i, "name": f"Tag {i}", "slug": f"tag-{i}"} for i in range(1, 151)}
+        self.requests = []
+        WooCommerce.init(url="https://shop.example", consumer_key="ck_test", consumer_secret="cs_test")
+        wcapi = WooCommerce.get_async_instance()
+        wcapi._client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    async def asyncTearDown(self):
+        await WooCommerce.aclose()
+
+    def handle(self, request: httpx.Request):
+        self.requests.append(request)
+        path = request.url.path.removeprefix("/wp-json/wc/v3/")
+        if path == "products/tags" and request.method == "GET":
+            per_page, page = int(request.url.params["per_page"]), int(request.url.params["page"])
+            items = list(self.tags.values())[(page - 1) * per_page:page * per_page]
+            total_pages = -(-len(self.tags) // per_page)
+            return httpx.Response(200, json=items, headers={"X-WP-Total": str(len(self.tags)), "X-WP-TotalPages": str(total_pages)})
+        if path == "products/tags" and request.method == "POST":
+            tag = {**json.loads(request.content), "id": 999}
+            return httpx.Response(201, json=tag)
+        if path.startswith("products/tags/"):
+            tag = self.tags.get(int(path.rsplit("/", 1)[1]))
+            if tag is None:
+                return httpx.Response(404, json={"message": "Invalid ID."})
+            return httpx.Response(200, json=tag)
+        if path == "orders/7/notes/1":
+            return httpx.Response(200, json={"id": 1, "note": "Shipped"})
+        return httpx.Response(404, json={"message": "No route was found"})
+
+    async def test_aget_uses_basic_auth(self):
+        tag = await ProductTag.aget(3)
+        self.assertEqual(tag.name, "Tag 3")
+        self.assertEqual(self.requests[0].headers["authorization"], httpx.BasicAuth("ck_test", "cs_test")._auth_header)
+
+    async def test_aget_missing_item_raises(self):
+        with self.assertRaises(Exception):
+            await ProductTag.aget(1000)
+
+    async def test_aall_and_aiter_all(self):
+        tags = await ProductTag.aall(per_page=5, page=2)
+        self.assertEqual([tag.id for tag in tags], [6, 7, 8, 9, 10])
+
+        ids = [tag.id async for tag in await ProductTag.aall(paginate=True)]
+        self.assertEqual(ids, list(range(1, 151)))
+
+    async def test_aall_paginated_fast(self):
+        tags = [tag async for tag in await ProductTag.aall(paginate=True, fast=True)]
+        self.assertEqual(len(tags), 150)
+        self.assertFalse(tags[0].is_validated())
+
+        tags = [tag async for tag in await ProductTag.aall(paginate=True)]
+        self.assertTrue(tags[0].is_validated())
+
+    async def test_asave_creates_item(self):
+        tag = await ProductTag(name="New tag").asave()
+        self.assertEqual(tag.id, 999)
+
+    async def test_double_id_aget(self):
+        note = await OrderNote.aget(7, 1)
+        self.assertEqual((note.id1, note.note), (7, "Shipped"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.products.product import Product
+from wooODM.products.variations import ProductVariation
+from fakes import FakeStoreAPI
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"products": [{"id": i} for i in range(1, 300)]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_save_many_splits_into_batches(self):
+        products = [Product(name=f"New {i}") for i in range(150)] + [Product(id=i, name=f"Old {i}") for i in range(1, 101)]
+        result = Product.save_many(products)
+
+        self.assertTrue(result.ok)
+        self.assertEqual((len(result.created), len(result.updated)), (150, 100))
+        self.assertEqual(self.api.endpoints(), ["products/batch"] * 3)
+        self.assertTrue(all(len(data.get("create", [])) + len(data.get("update", [])) <= 100 for _, _, data in self.api.requests))
+        # Created products are updated with the response, like save() does
+        self.assertEqual(products[0].id, 1001)
+        self.assertEqual(products[0].permalink, "https://shop/1001")
+
+    def test_errors_do_not_fail_the_batch(self):
+        missing = Product(id=5000, name="Missing")
+        products = [Product(id=1, name="Existing"), missing, Product(name="Created")]
+        result = Product.save_many(products)
+
+        self.assertFalse(result.ok)
+        self.assertEqual(len(result.errors), 1)
+        self.assertIs(result.errors[0].item, missing)
+        self.assertEqual((result.errors[0].action, result.errors[0].code), ("update", "invalid_id"))
+        self.assertEqual(len(result.created) + len(result.updated), 2)
+
+    def test_delete_many(self):
+        products = [Product(id=i, name=f"Product {i}") for i in (1, 2, 5000)]
+        result = Product.delete_many(products)
+
+        self.assertEqual(self.api.requests[0][2], {"delete": [1, 2, 5000]})
+        self.assertEqual([product.id for product in result.deleted], [1, 2])
+        self.assertEqual(result.errors[0].item.id, 5000)
+
+    def test_variations_are_grouped_by_parent(self):
+        variations = [ProductVariation(id1=10, sku="a"), ProductVariation(id1=20, sku="b"), ProductVariation(id1=10, sku="c")]
+        result = ProductVariation.save_many(variations)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(self.api.endpoints(), ["products/10/variations/batch", "products/20/variations/batch"])
+        self.assertEqual([variation.id1 for variation in variations], [10, 20, 10])
+        self.assertTrue(all(variation.id for variation in variations))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import time
+import unittest
+from wooODM.cache import MemoryBackend, SQLiteBackend, ModelCache
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.mock import MockServer, MockStore
+from wooODM.products.product import Product
+from wooODM.orders.order import Order
+from fakes import FakeStoreAPI
+
+
+class TestBackends(unittest.TestCase):
+
+    def test_memory_lru_eviction(self):
+        backend = MemoryBackend(max_size=2)
+        backend.set("a", {"id": 1})
+        backend.set("b", {"id": 2})
+        backend.get("a")
+        backend.set("c", {"id": 3})
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), {"id": 1})
+        self.assertEqual(backend.evictions, 1)
+
+    def test_memory_ttl(self):
+        backend = MemoryBackend()
+        backend.set("a", {"id": 1}, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.evictions, 1)
+
+    def test_sqlite_is_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.db")
+            SQLiteBackend(path).set("products/1", {"id": 1, "name": "Shirt"})
+            self.assertEqual(SQLiteBackend(path).get("products/1"), {"id": 1, "name": "Shirt"})
+
+    def test_sqlite_max_size(self):
+        with tempfile.TemporaryDirectory() as directory:
+            backend = SQLiteBackend(os.path.join(directory, "cache.db"), max_size=2)
+            for key in ("a", "b", "c"):
+                backend.set(key, {"key": key})
+                time.sleep(0.001)
+            self.assertEqual(len(backend), 2)
+            self.assertIsNone(backend.get("a"))
+            self.assertEqual(backend.evictions, 1)
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({
+            "products": [{"id": 1, "name": "Shirt", "stock_quantity": 5}],
+            "orders": [{"id": 9, "status": "processing"}],
+        })
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+        self.cache = ModelCache(ttl=60, ttls={Order: 0})
+        WooCommerce.set_cache(self.cache)
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_repeated_get_hits_the_cache(self):
+        first = Product.get(1)
+        second = Product.get(1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_refresh_bypasses_the_cache(self):
+        Product.get(1)
+        Product.get(1, refresh=True)
+        self.assertEqual(len(self.api.requests), 2)
+
+    def test_zero_ttl_disables_caching(self):
+        Order.get(9)
+        Order.get(9)
+        self.assertEqual(len(self.api.requests), 2)
+
+    def test_save_and_delete_invalidate(self):
+        product = Product.get(1)
+        product.stock_quantity = 2
+        product.save()
+        self.assertEqual(Product.get(1).stock_quantity, 2)
+        self.assertEqual(self.api.requests[-1][:2], ("GET", "products/1"))
+
+        product.delete()
+        with self.assertRaisesRegex(Exception, "Invalid ID"):
+            Product.get(1)
+
+    def test_identity_map(self):
+        with WooCommerce.unit_of_work():
+            first = Product.get(1)
+            self.assertIs(Product.get(1), first)
+            first.stock_quantity = 1
+            first.save()
+            self.assertIs(Product.get(1), first)
+        self.assertIsNot(Product.get(1), first)
+        self.assertEqual(self.cache.stats.identity_hits, 2)
+
+
+class TestIdentityMapPerConnection(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = [MockServer(MockStore({"products": [{"id": 1, "name": name}]})).start()
+                        for name in ("US shirt", "EU shirt")]
+        for name, server in zip(("us", "eu"), self.servers):
+            WooCommerce.init(server.url, "ck_test", "cs_test", name=name)
+
+    def tearDown(self):
+        for name, server in zip(("us", "eu"), self.servers):
+            WooCommerce.remove(name)
+            server.stop()
+
+    def test_same_endpoint_on_two_stores(self):
+        with WooCommerce.unit_of_work():
+            with WooCommerce.using("us"):
+                us = Product.get(1)
+            with WooCommerce.using("eu"):
+                eu = Product.get(1)
+                self.assertIs(Product.get(1), eu)
+            with WooCommerce.using("us"):
+                self.assertIs(Product.get(1), us)
+        self.assertEqual((us.name, eu.name), ("US shirt", "EU shirt"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.customers.customer import Customer
+from wooODM.products.product import Product, ImageProperties
+from wooODM.products.variations import ProductVariation
+from fakes import FakeStoreAPI
+
+
+class TestChangeTracking(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({
+            "products": [{
+                "id": 1, "name": "Shirt", "sku": "SHIRT", "stock_quantity": 5, "price_html": "<span>10</span>",
+                "total_sales": 12, "related_ids": [2, 3],
+                "images": [{"id": 7, "src": "https://shop/shirt.png", "date_created": "2024-01-01T10:00:00"}],
+            }],
+            "products/1/variations": [{"id": 2, "sku": "SHIRT-S", "stock_quantity": 1}],
+            "customers": [{"id": 3, "email": "jane@example.com", "username": "jane", "first_name": "Jane", "billing": {"email": ""}}],
+        })
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def puts(self):
+        return [data for method, _, data in self.api.requests if method == "PUT"]
+
+    def test_loaded_item_is_clean(self):
+        product = Product.get(1)
+        self.assertFalse(product.is_dirty())
+        self.assertEqual(product.changed_fields(), set())
+
+    def test_save_without_changes_skips_request(self):
+        product = Product.get(1)
+        self.assertIs(product.save(), product)
+        self.assertEqual(self.puts(), [])
+
+    def test_save_sends_only_changed_fields(self):
+        product = Product.get(1)
+        product.stock_quantity = 3
+        product.save()
+        self.assertEqual(self.puts(), [{"id": 1, "stock_quantity": 3}])
+        # The saved state becomes the new reference
+        self.assertFalse(product.is_dirty())
+
+    def test_nested_list_counts_as_one_field(self):
+        product = Product.get(1)
+        product.images.append(ImageProperties(src="https://shop/back.png"))
+        self.assertEqual(product.changed_fields(), {"images"})
+
+        product.save()
+        self.assertEqual(list(self.puts()[0]), ["id", "images"])
+        self.assertEqual(len(self.puts()[0]["images"]), 2)
+
+    def test_new_items_report_every_field(self):
+        product = Product(name="New")
+        self.assertIn("name", product.changed_fields())
+        self.assertIn("stock_quantity", product.changed_fields())
+
+    def test_snapshot_does_not_affect_equality(self):
+        self.assertEqual(Product.get(1), Product.model_validate(self.api.data["products"][0]))
+
+    def test_double_id_parent_is_not_a_change(self):
+        variation = ProductVariation.get(1, 2)
+        self.assertFalse(variation.is_dirty())
+        variation.stock_quantity = 0
+        variation.save()
+        self.assertEqual(self.puts(), [{"id": 2, "stock_quantity": 0}])
+        self.assertEqual(variation.id1, 1)
+
+
+    def test_customer_without_billing_email(self):
+        customer = Customer.get(3)
+        customer.save()
+        self.assertEqual(self.puts(), [])
+
+        customer.first_name = "Janet"
+        customer.save()
+        self.assertEqual(self.puts(), [{"id": 3, "first_name": "Janet"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from wooODM.conditional import ConditionalStore
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.products.product import Product
+from fakes import FakeStoreAPI
+
+
+class ETagStoreAPI(FakeStoreAPI):
+    """
+    Sends an ETag derived from the content of each response, optionally ignoring conditional headers.
+    The headers of the requests are recorded in `sent_headers`.
+    """
+    def __init__(self, data, honour_etags=True):
+        super().__init__(data)
+        self.honour_etags = honour_etags
+        self.sent_headers = []
+
+    def etag(self, payload):
+        return f'"{hash(repr(payload))}"'
+
+    def get(self, endpoint, params=None, headers=None):
+        self.sent_headers.append(headers)
+        response = super().get(endpoint, params)
+        etag = self.etag(response.payload)
+        if self.honour_etags and headers and headers.get("If-None-Match") == etag:
+            return self.respond(None, 304, {"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.api = ETagStoreAPI({"products": [
+            {"id": 1, "name": "Shirt", "date_modified_gmt": "2024-01-01T10:00:00"},
+            {"id": 2, "name": "Hat", "date_modified_gmt": "2024-01-01T10:00:00"},
+        ]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+        self.store = ConditionalStore()
+        WooCommerce.set_conditional(self.store)
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_get_revalidates_with_etag(self):
+        first = Product.get(1)
+        self.assertIsNone(self.api.sent_headers[0])
+
+        second = Product.get(1)
+        self.assertIn("If-None-Match", self.api.sent_headers[1])
+        self.assertIs(second, first)
+        self.assertEqual(self.store.not_modified, 1)
+
+    def test_changed_item_is_downloaded_again(self):
+        Product.get(1)
+        self.api.item("products", 1).update(name="Blue shirt", date_modified_gmt="2024-02-01T10:00:00")
+        self.assertEqual(Product.get(1).name, "Blue shirt")
+        self.assertEqual(self.store.not_modified, 0)
+
+    def test_pages_are_revalidated(self):
+        first = Product.all(per_page=100)
+        second = Product.all(per_page=100)
+        self.assertEqual(self.api.sent_headers[1]["If-None-Match"], self.api.etag(self.api.data["products"]))
+        self.assertEqual([product.id for product in second], [1, 2])
+        self.assertIs(second[0], first[0])
+
+    def test_date_modified_fallback(self):
+        self.api.honour_etags = False
+        first = Product.all(per_page=100)
+        self.api.item("products", 2).update(name="Cap", date_modified_gmt="2024-02-01T10:00:00")
+        second = Product.all(per_page=100)
+
+        self.assertIs(second[0], first[0])
+        self.assertIsNot(second[1], first[1])
+        self.assertEqual(second[1].name, "Cap")
+        self.assertEqual(self.store.reused, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import unittest
+from wooODM.cache import ModelCache
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.products.tag import ProductTag
+from fakes import FakeStoreAPI
+
+
+def store(name: str) -> FakeStoreAPI:
+    """
+    A store whose tags are all named after it.
+    """
+    return FakeStoreAPI({"products/tags": [{"id": i, "name": name} for i in range(1, 31)]})
+
+
+class TestConnections(unittest.TestCase):
+
+    def setUp(self):
+        self.eu = store("eu")
+        self.us = store("us")
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.eu))
+        WooCommerce.register("us", Connection(self.us))
+
+    def tearDown(self):
+        WooCommerce.remove()
+        WooCommerce.remove("us")
+
+    def test_default_connection(self):
+        self.assertEqual(ProductTag.get(1).name, "eu")
+        self.assertEqual(self.us.requests, [])
+
+    def test_using(self):
+        with WooCommerce.using("us"):
+            self.assertEqual(ProductTag.get(1).name, "us")
+            with WooCommerce.using(WooCommerce.DEFAULT):
+                self.assertEqual(ProductTag.get(2).name, "eu")
+            self.assertIs(WooCommerce.get_instance(), self.us)
+        self.assertEqual(ProductTag.get(3).name, "eu")
+
+    def test_unknown_connection(self):
+        with self.assertRaises(Exception):
+            with WooCommerce.using("asia"):
+                pass
+
+    def test_prefetch_workers_use_the_bound_connection(self):
+        with WooCommerce.using("us"):
+            tags = list(ProductTag.iter_all(per_page=5, workers=4))
+        self.assertEqual(len(tags), 30)
+        self.assertTrue(all(tag.name == "us" for tag in tags))
+        self.assertEqual(self.eu.requests, [])
+
+    def test_threads(self):
+        names = {}
+
+        def work(name):
+            with WooCommerce.using(name):
+                names[name] = [ProductTag.get(i).name for i in range(1, 4)]
+
+        threads = [threading.Thread(target=work, args=(name,)) for name in ("us", WooCommerce.DEFAULT)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(names, {"us": ["us"] * 3, WooCommerce.DEFAULT: ["eu"] * 3})
+
+    def test_asyncio_tasks(self):
+        async def work(name):
+            with WooCommerce.using(name):
+                await asyncio.sleep(0)
+                return WooCommerce.get_instance()
+
+        async def main():
+            return await asyncio.gather(work("us"), work(WooCommerce.DEFAULT), work("us"))
+
+        self.assertEqual(asyncio.run(main()), [self.us, self.eu, self.us])
+
+    def test_caches_are_per_connection(self):
+        WooCommerce.set_cache(ModelCache(ttl=60))
+        ProductTag.get(1)
+        ProductTag.get(1)
+        self.assertEqual(len(self.eu.requests), 1)
+        with WooCommerce.using("us"):
+            self.assertIsNone(WooCommerce.get_cache())
+            ProductTag.get(1)
+            ProductTag.get(1)
+        self.assertEqual(len(self.us.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
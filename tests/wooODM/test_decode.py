@@ -0,0 +1,55 @@
+import unittest
+from wooODM.cache import ModelCache
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.decode import loads, response_json, validate_list
+from wooODM.orders.order import Order
+from wooODM.products.tag import ProductTag
+from fakes import FakeResponse, FakeStoreAPI
+
+
+class TestDecode(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"products/tags": [{"id": i, "name": f"Tag {i}"} for i in range(1, 4)]}, raw=True)
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api, raw_json=True))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_pages_are_validated_from_bytes(self):
+        tags = ProductTag.all()
+        self.assertEqual([tag.name for tag in tags], ["Tag 1", "Tag 2", "Tag 3"])
+        self.assertEqual(self.api.responses[0].json_calls, 0)
+        tags[0].name = "Renamed"
+        self.assertEqual(tags[0].changed_fields(), {"name"})
+
+    def test_get_is_validated_from_bytes(self):
+        self.assertEqual(ProductTag.get(2).name, "Tag 2")
+        self.assertEqual(self.api.responses[0].json_calls, 0)
+
+    def test_cache_still_gets_the_data(self):
+        WooCommerce.set_cache(ModelCache(ttl=60))
+        ProductTag.get(2)
+        self.assertEqual(ProductTag.get(2).name, "Tag 2")
+        self.assertEqual(len(self.api.responses), 1)
+
+    def test_fast_mode_decodes_to_dicts(self):
+        tag = ProductTag.get(2, fast=True)
+        self.assertFalse(tag.is_validated())
+        self.assertEqual(tag.name, "Tag 2")
+
+    def test_disabled_by_default(self):
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+        ProductTag.all()
+        self.assertEqual(self.api.responses[0].json_calls, 1)
+
+    def test_helpers(self):
+        self.assertEqual(loads(b'{"a": [1]}'), {"a": [1]})
+        self.assertEqual(response_json(FakeResponse([1, 2], raw=True)), [1, 2])
+        orders = validate_list(Order, b'[{"id": 1, "date_created_gmt": "2024-01-01T10:00:00"}]')
+        self.assertEqual(orders[0].date_created_gmt.year, 2024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.export import Exporter, pyarrow
+from wooODM.orders.order import Order
+from fakes import FakeStoreAPI
+
+
+def order(order_id):
+    return {
+        "id": order_id,
+        "status": "completed",
+        "total": "12.50",
+        "prices_include_tax": False,
+        "date_created_gmt": "2024-01-03T09:00:00",
+        "billing": {"first_name": "Jane", "email": "jane@example.com"},
+        "line_items": [
+            {"id": order_id * 10, "sku": "SHIRT", "quantity": 2, "meta_data": [{"key": "size", "value": "M"}]},
+            {"id": order_id * 10 + 1, "sku": "HAT", "quantity": 1},
+        ],
+        "meta_data": [{"id": 1, "key": "channel", "value": "web"}],
+        "date_paid_gmt": "",
+    }
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"orders": [order(order_id) for order_id in range(1, 6)]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        WooCommerce.remove()
+        self.directory.cleanup()
+
+    def test_schema(self):
+        exporter = Exporter(Order, children=("line_items", "meta_data"))
+        self.assertEqual(list(exporter.tables), ["order", "order_line_items", "order_meta_data"])
+        main = {column.name: column.kind for column in exporter.tables["order"].columns}
+        self.assertEqual(main["id"], "int")
+        self.assertEqual(main["billing_first_name"], "string")
+        self.assertEqual(main["date_created_gmt"], "datetime")
+        self.assertEqual(main["tax_lines"], "json")  # Not exported as a child table
+        self.assertNotIn("line_items", main)
+
+        line_items = [column.name for column in exporter.tables["order_line_items"].columns]
+        self.assertEqual(line_items[0], "order_id")
+        self.assertIn("meta_data", line_items)
+
+        with self.assertRaises(ValueError):
+            Exporter(Order, children=("billing",))
+
+    def test_pages_are_streamed(self):
+        pages = list(Exporter(Order, per_page=2).pages())
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(len(pages[0]["order"]), 2)
+        self.assertEqual(len(pages[0]["order_line_items"]), 4)
+        self.assertEqual(len(self.api.requests), 3)
+
+        row = pages[0]["order"][0]
+        self.assertEqual((row["id"], row["billing_email"], row["date_paid_gmt"]), (1, "jane@example.com", None))
+        self.assertEqual(pages[0]["order_line_items"][0]["order_id"], 1)
+
+    def test_ndjson(self):
+        counts = Exporter(Order, per_page=2).to_ndjson(self.directory.name, compression="gzip")
+        self.assertEqual((counts["order"], counts["order_line_items"], counts["order_meta_data"]), (5, 10, 5))
+        with gzip.open(os.path.join(self.directory.name, "order_line_items.ndjson.gz"), "rt") as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual([row["order_id"] for row in rows[:3]], [1, 1, 2])
+        self.assertEqual(json.loads(rows[0]["meta_data"]), [{"key": "size", "value": "M"}])
+
+        with self.assertRaises(ValueError):
+            Exporter(Order).to_ndjson(self.directory.name, compression="zstd")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        import pyarrow.parquet
+
+        counts = Exporter(Order, per_page=2).to_parquet(self.directory.name)
+        self.assertEqual(counts["order"], 5)
+
+        file = pyarrow.parquet.ParquetFile(os.path.join(self.directory.name, "order.parquet"))
+        self.assertEqual(file.metadata.num_row_groups, 3)  # One per page
+        table = file.read()
+        self.assertTrue(pyarrow.types.is_timestamp(table.schema.field("date_created_gmt").type))
+        self.assertEqual(table.column("id").to_pylist(), [1, 2, 3, 4, 5])
+
+        line_items = pyarrow.parquet.read_table(os.path.join(self.directory.name, "order_line_items.parquet"))
+        self.assertEqual(line_items.column("sku").to_pylist()[:2], ["SHIRT", "HAT"])
+
+
+if __name__ == "__main__":
+    unittest.main()
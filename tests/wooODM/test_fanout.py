@@ -0,0 +1,88 @@
+import time
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.fanout import VariationLoader
+from wooODM.products.product import Product
+from fakes import FakeStoreAPI
+
+
+def catalog(products: int = 6) -> dict:
+    """
+    Variable products with three variations each, and one without variations.
+    """
+    data = {"products": [
+        {"id": product_id, "name": f"Product {product_id}", "type": "variable",
+         "variations": [product_id * 10 + number for number in range(3)]}
+        for product_id in range(1, products + 1)
+    ]}
+    data["products"].append({"id": 99, "name": "Empty", "type": "variable", "variations": []})
+    for product in data["products"]:
+        data[f"products/{product['id']}/variations"] = [
+            {"id": variation_id, "sku": f"V{variation_id}", "stock_quantity": 1} for variation_id in product["variations"]
+        ]
+    return data
+
+
+class SlowVariationsAPI(FakeStoreAPI):
+    """
+    Answers variation requests slowly, later products first, counting concurrent requests.
+    """
+    def __init__(self, data, delay=0.02):
+        super().__init__(data)
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    def get(self, endpoint, params=None, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if endpoint != "products":
+                time.sleep(self.delay * (7 - int(endpoint.split("/")[1])))  # Later products answer first
+            return super().get(endpoint, params, **kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestVariationLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.api = SlowVariationsAPI(catalog())
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_streams_products_with_their_variations(self):
+        pairs = list(VariationLoader(workers=4, per_page=2))
+        self.assertEqual(sorted(product.id for product, _ in pairs), [1, 2, 3, 4, 5, 6, 99])
+        for product, variations in pairs:
+            self.assertEqual([variation.id for variation in variations], product.variations)
+            self.assertTrue(all(variation.id1 == product.id for variation in variations))
+
+        products = [params for _, endpoint, params in self.api.requests if endpoint == "products"]
+        self.assertEqual(products[0]["type"], "variable")
+        # Two pages per product, nothing for the product without variations
+        self.assertEqual(len([endpoint for endpoint in self.api.endpoints() if endpoint.endswith("/variations/")]), 12)
+        self.assertGreater(self.api.max_active, 1)
+        # Unordered: products arrive as soon as their variations are loaded
+        self.assertNotEqual([product.id for product, _ in pairs], sorted(product.id for product, _ in pairs))
+
+    def test_ordered_and_bounded(self):
+        loader = VariationLoader(workers=2, max_in_flight=2, ordered=True)
+        self.assertEqual([product.id for product, _ in loader], [1, 2, 3, 4, 5, 6, 99])
+        self.assertLessEqual(self.api.max_active, 2)
+
+    def test_given_products(self):
+        products = [Product.model_validate(self.api.item("products", 3))]
+        pairs = list(VariationLoader(products, fast=True))
+        self.assertEqual(len(pairs), 1)
+        self.assertFalse(pairs[0][1][0].is_validated())
+        self.assertEqual((pairs[0][1][0].sku, pairs[0][1][0].id1), ("V30", 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.conditional import ConditionalStore
+from wooODM.fast import Record
+from wooODM.products.product import Product
+from wooODM.products.variations import ProductVariation
+from fakes import FakeStoreAPI
+
+
+def product_data(item_id):
+    return {
+        "id": item_id, "name": f"Product {item_id}", "sku": f"SKU-{item_id}",
+        "date_created": "2024-01-01T10:00:00", "date_modified_gmt": "2024-01-02T10:00:00",
+        "images": [{"id": 1, "src": "https://shop.example/1.png"}],
+        "_links": {"self": []},
+    }
+
+
+class TestFastReads(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"products": [product_data(i) for i in range(1, 4)]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_fast_items_keep_raw_values(self):
+        products = Product.all(fast=True)
+        self.assertIsInstance(products[0], Product)
+        self.assertFalse(products[0].is_validated())
+        self.assertEqual(products[0].sku, "SKU-1")
+        self.assertEqual(products[0].images, [{"id": 1, "src": "https://shop.example/1.png"}])
+        self.assertEqual(products[0].date_created, "2024-01-01T10:00:00")
+        self.assertEqual(products[0].categories, [])  # Defaults are filled in
+        self.assertFalse(hasattr(products[0], "_links"))
+
+    def test_defaults_are_not_shared(self):
+        first, second = Product.all(fast=True)[:2]
+        first.categories.append({"id": 1})
+        self.assertEqual(second.categories, [])
+
+    def test_ensure_validated(self):
+        product = Product.get(1, fast=True)
+        self.assertIs(product.ensure_validated(), product)
+        self.assertTrue(product.is_validated())
+        self.assertEqual(product.date_created, datetime(2024, 1, 1, 10))
+        self.assertEqual(product.images[0].src, "https://shop.example/1.png")
+        self.assertEqual(product, Product.get(1))
+
+    def test_validated_on_save(self):
+        product = Product.get(2, fast=True)
+        product.name = "Renamed"
+        product.save()
+        _, endpoint, data = next(request for request in self.api.requests if request[0] == "PUT")
+        self.assertEqual(endpoint, "products/2")
+        self.assertEqual(data["name"], "Renamed")
+        self.assertEqual(data["images"][0]["src"], "https://shop.example/1.png")
+        self.assertTrue(product.is_validated())
+        self.assertFalse(product.is_dirty())
+
+    def test_double_id_models(self):
+        self.api.data["products/7/variations"] = [{"id": 5, "sku": "VAR-5", "date_created": "2024-01-01T10:00:00"}]
+        variations = ProductVariation.all(7, fast=True)
+        self.assertEqual((variations[0].id1, variations[0].sku), (7, "VAR-5"))
+        self.assertEqual(variations[0].ensure_validated().date_created, datetime(2024, 1, 1, 10))
+        self.assertEqual(variations[0].id1, 7)
+
+    def test_fast_projection_returns_records(self):
+        records = Product.query().fast().only("sku").all()
+        self.assertIsInstance(records[0], Record)
+        self.assertEqual(records[0].as_dict(), {"id": 1, "sku": "SKU-1"})
+        with self.assertRaises(AttributeError):
+            records[0].name = "Not a field"
+
+    def test_conditional_store_keeps_fast_results_apart(self):
+        WooCommerce.set_conditional(ConditionalStore())
+        Product.get(1, fast=True)
+        product = Product.get(1)
+        self.assertTrue(product.is_validated())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.importer import Importer, read_csv, read_ndjson
+from fakes import FakeStoreAPI
+
+
+def catalog() -> dict:
+    return {
+        "products": [{"id": 1, "name": "Shirt", "sku": "SHIRT", "type": "variable", "regular_price": "10"}],
+        "products/1/variations": [{"id": 11, "sku": "SHIRT-S", "regular_price": "10"}],
+    }
+
+
+class TestImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI(catalog(), next_id=100)
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, "import.json")
+        self.errors = os.path.join(self.directory.name, "errors.csv")
+
+    def tearDown(self):
+        WooCommerce.remove()
+        self.directory.cleanup()
+
+    def rows(self):
+        return [
+            {"sku": "SHIRT", "regular_price": "12"},  # Update, only the price is sent
+            {"sku": "HAT", "name": "Hat", "regular_price": "5", "categories": [{"id": 3}]},
+            {"sku": "SHIRT-S", "parent_sku": "SHIRT", "regular_price": "12"},
+            {"sku": "SHIRT-M", "parent_sku": "SHIRT", "regular_price": "12"},
+            {"sku": "CAP-S", "parent_sku": "CAP", "regular_price": "3"},  # Unknown parent
+            {"sku": "MUG"},  # A new product needs a name
+            {"sku": "SOCKS", "name": "Socks", "stock_quantity": "many"},
+        ]
+
+    def read_errors(self):
+        with open(self.errors, newline="") as file:
+            return list(csv.DictReader(file))
+
+    def test_upsert_by_sku(self):
+        result = Importer(errors=self.errors, chunk_size=3, batch_size=2, workers=2).run(self.rows())
+
+        self.assertEqual((result.rows, result.created, result.updated, result.failed), (7, 2, 2, 3))
+        self.assertEqual(self.api.item("products", 1)["regular_price"], "12")
+        self.assertEqual(self.api.item("products", 1)["name"], "Shirt")
+        update = next(data for method, endpoint, data in self.api.requests
+                      if method == "POST" and endpoint == "products/batch" and data.get("update"))
+        self.assertEqual(update["update"], [{"id": 1, "regular_price": "12"}])
+
+        hat = next(product for product in self.api.data["products"] if product["sku"] == "HAT")
+        self.assertEqual(hat["categories"][0]["id"], 3)
+        self.assertEqual(sorted(item["sku"] for item in self.api.data["products/1/variations"]), ["SHIRT-M", "SHIRT-S"])
+        self.assertEqual(self.api.item("products/1/variations", 11)["regular_price"], "12")
+
+        errors = self.read_errors()
+        self.assertEqual([(error["row"], error["code"]) for error in errors],
+                         [("5", "unknown_parent"), ("6", "invalid_row"), ("7", "invalid_row")])
+        # The SKU index is built once, variations are indexed per parent
+        gets = [endpoint for method, endpoint, _ in self.api.requests if method == "GET"]
+        self.assertEqual(gets, ["products", "products/1/variations/"])
+
+    def test_parent_created_in_the_same_chunk(self):
+        rows = [{"sku": "CAP", "name": "Cap", "type": "variable"},
+                {"sku": "CAP-S", "parent_sku": "CAP", "regular_price": "3"}]
+        result = Importer(errors=self.errors).run(rows)
+        self.assertEqual((result.created, result.failed), (2, 0))
+        cap = next(product for product in self.api.data["products"] if product["sku"] == "CAP")
+        self.assertEqual([item["sku"] for item in self.api.data[f"products/{cap['id']}/variations"]], ["CAP-S"])
+
+    def test_resume_from_checkpoint(self):
+        rows = self.rows()
+        importer = Importer(checkpoint=self.checkpoint, errors=self.errors, chunk_size=2, workers=1)
+
+        def crash():
+            yield from rows[:4]
+            raise KeyboardInterrupt()
+
+        with self.assertRaises(KeyboardInterrupt):
+            importer.run(crash())
+        with open(self.checkpoint) as file:
+            self.assertEqual(json.load(file)["rows"], 4)
+
+        self.api.requests = []
+        result = Importer(checkpoint=self.checkpoint, errors=self.errors, chunk_size=2, workers=1).run(rows)
+        self.assertEqual((result.rows, result.created, result.updated, result.failed), (7, 2, 2, 3))
+        posted = [item["sku"] for method, _, data in self.api.requests if method == "POST"
+                  for item in data.get("create", []) + data.get("update", []) if "sku" in item]
+        self.assertNotIn("HAT", posted)
+        self.assertEqual(len(self.read_errors()), 3)
+
+    def test_readers(self):
+        path = os.path.join(self.directory.name, "catalog.csv")
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["sku", "name", "regular_price", "categories", "parent_sku"])
+            writer.writerow(["HAT", "Hat", "5", '[{"id": 3}]', ""])
+            writer.writerow(["SHIRT-L", "", "12", "", "SHIRT"])
+        self.assertEqual(list(read_csv(path))[1], {"sku": "SHIRT-L", "regular_price": "12", "parent_sku": "SHIRT"})
+
+        result = Importer().import_csv(path)
+        self.assertEqual((result.created, result.failed), (2, 0))
+        hat = next(product for product in self.api.data["products"] if product["sku"] == "HAT")
+        self.assertEqual(hat["categories"][0]["id"], 3)
+
+        path = os.path.join(self.directory.name, "catalog.ndjson")
+        with open(path, "w") as file:
+            file.write('{"sku": "HAT", "stock_quantity": 4}\n\n')
+        self.assertEqual(list(read_ndjson(path)), [{"sku": "HAT", "stock_quantity": 4}])
+        self.assertEqual(Importer().import_ndjson(path).updated, 1)
+        self.assertEqual(hat["stock_quantity"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+from wooODM.core import WooCommerce
+from wooODM.instrumentation import Histogram, MetricsCollector, RequestHook, current_event, endpoint_template
+from wooODM.mock import MockServer, MockStore
+from wooODM.products.product import Product
+from wooODM.ratelimit import RetryPolicy
+
+
+class RecordingHook(RequestHook):
+    def __init__(self):
+        self.before = []
+        self.after = []
+
+    def before_request(self, event):
+        self.before.append(event.template)
+
+    def after_request(self, event):
+        self.after.append(event)
+
+
+class TestEndpointTemplate(unittest.TestCase):
+
+    def test_ids_are_replaced(self):
+        self.assertEqual(endpoint_template("products/12"), "products/{id}")
+        self.assertEqual(endpoint_template("products/12/variations/34/"), "products/{id}/variations/{id}")
+        self.assertEqual(endpoint_template("products/batch"), "products/batch")
+        self.assertEqual(endpoint_template("reports/top_sellers"), "reports/top_sellers")
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for number in range(1, 101):
+            histogram.observe(number / 1000)  # 1 ms to 100 ms
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(50), 0.050, delta=0.050 * 0.25)
+        self.assertAlmostEqual(histogram.percentile(99), 0.099, delta=0.099 * 0.25)
+        self.assertEqual(Histogram().percentile(50), 0.0)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        store = MockStore({"products": [{"id": 100 + number, "name": f"Product {number}"} for number in range(15)]})
+        self.server = MockServer(store).start()
+        WooCommerce.init(self.server.url, "ck_test", "cs_test", retry=RetryPolicy(backoff=0))
+
+    def tearDown(self):
+        WooCommerce.get_connection().close()
+        WooCommerce.remove()
+        self.server.stop()
+
+    def test_collector(self):
+        metrics = WooCommerce.add_hook(MetricsCollector())
+        self.assertEqual(len(list(Product.iter_all(per_page=10))), 15)
+        product = Product(name="Shirt").save()
+        product.name = "T-Shirt"
+        product.save()
+        Product.get(product.id, refresh=True)
+        Product.save_many([Product(name="Hat")])
+        product.delete()
+
+        summary = metrics.summary()
+        self.assertEqual(set(summary), {"GET products", "POST products", "PUT products/{id}", "GET products/{id}",
+                                        "POST products/batch", "DELETE products/{id}"})
+        pages = summary["GET products"]
+        self.assertEqual((pages["requests"], pages["errors"], pages["statuses"]), (2, 0, {200: 2}))
+        self.assertGreater(pages["bytes"], 0)
+        self.assertGreater(pages["network"]["p50"], 0)
+        self.assertGreater(pages["validate"]["count"], 0)
+        self.assertEqual(summary["POST products"]["statuses"], {201: 1})
+
+        text = metrics.prometheus()
+        self.assertIn('wooodm_requests_total{method="GET",endpoint="products",status="200"} 2', text)
+        self.assertIn('wooodm_request_duration_seconds_count{method="GET",endpoint="products",phase="network"} 2', text)
+
+        metrics.reset()
+        self.assertEqual(metrics.summary(), {})
+
+    def test_events(self):
+        hook = WooCommerce.add_hook(RecordingHook())
+        Product.get(100)
+        with self.assertRaises(Exception):
+            Product.get(999)
+        self.assertEqual(hook.before, ["products/{id}", "products/{id}"])
+
+        found, missing = hook.after
+        self.assertEqual((found.method, found.endpoint, found.status, found.error), ("GET", "products/100", 200, None))
+        self.assertGreater(found.total, found.network)
+        self.assertGreater(found.decode + found.validate, 0)
+        self.assertEqual(missing.status, 404)
+        self.assertIsNotNone(missing.error)
+
+        WooCommerce.remove_hook(hook)
+        Product.get(101)
+        self.assertEqual(len(hook.after), 2)
+
+    def test_retries(self):
+        hook = WooCommerce.add_hook(RecordingHook())
+        self.server.throttle_every = 2
+        list(Product.iter_all(per_page=5))
+        self.assertEqual(sum(event.retries for event in hook.after), self.server.throttled)
+        self.assertTrue(all(event.status == 200 for event in hook.after))
+
+    def test_raw_json_is_validation_only(self):
+        WooCommerce.get_connection().raw_json = True
+        hook = WooCommerce.add_hook(RecordingHook())
+        Product.all()
+        event, = hook.after
+        self.assertEqual(event.decode, 0)
+        self.assertGreater(event.validate, 0)
+
+    def test_no_hooks(self):
+        seen = []
+        original = Product._parse_get.__func__
+
+        def parse_get(cls, *args, **kwargs):
+            seen.append(current_event())
+            return original(cls, *args, **kwargs)
+
+        Product._parse_get = classmethod(parse_get)
+        try:
+            Product.get(100)
+        finally:
+            Product._parse_get = classmethod(original)
+        self.assertEqual(seen, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
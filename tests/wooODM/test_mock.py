@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.mock import MockServer, MockStore
+from wooODM.orders.notes import OrderNote
+from wooODM.orders.order import Order
+from wooODM.products.product import Product
+from wooODM.products.variations import ProductVariation
+from wooODM.ratelimit import RetryPolicy
+from wooODM.replay import RecordingTransport, ReplayTransport
+from wooODM.transport import Transport
+
+
+def catalog(products: int = 25) -> MockStore:
+    return MockStore({
+        "products": [{"id": 100 + number, "name": f"Product {number}", "sku": f"SKU-{number}"} for number in range(products)],
+        "orders": [{"id": 500, "status": "processing", "line_items": [{"id": 1, "product_id": 100, "quantity": 2}]}],
+    })
+
+
+class TestMockServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockServer(catalog()).start()
+        WooCommerce.init(self.server.url, "ck_test", "cs_test", retry=RetryPolicy(backoff=0))
+
+    def tearDown(self):
+        WooCommerce.get_connection().close()
+        WooCommerce.remove()
+        self.server.stop()
+
+    def test_pagination(self):
+        page = Product.iter_pages(per_page=10).__next__()
+        self.assertEqual((page.total, page.total_pages), (25, 3))
+        self.assertEqual(len(list(Product.iter_all(per_page=10))), 25)
+        self.assertEqual([item.sku for item in Product.query().filter(sku="SKU-3")], ["SKU-3"])
+        self.assertEqual(Product.query().count(), 25)
+
+    def test_crud(self):
+        product = Product(name="Shirt", sku="SHIRT", type="variable").save()
+        self.assertIsNotNone(product.date_created_gmt)
+        self.assertEqual(Product.get(product.id).sku, "SHIRT")
+
+        variation = ProductVariation(id1=product.id, sku="SHIRT-S", regular_price="10").save()
+        self.assertEqual(Product.get(product.id, refresh=True).variations, [variation.id])
+        self.assertEqual(ProductVariation.get(product.id, variation.id).sku, "SHIRT-S")
+
+        product.name = "T-Shirt"
+        product.save()
+        self.assertEqual(self.server.store.collections["products"][product.id]["name"], "T-Shirt")
+
+        note = OrderNote(id1=500, note="Shipped").save()
+        self.assertEqual(OrderNote.all(500)[0].id, note.id)
+
+        product.delete()
+        with self.assertRaises(Exception):
+            Product.get(product.id, refresh=True)
+
+    def test_batch(self):
+        products = [Product(name=f"New {number}") for number in range(3)] + [Product(name="Duplicate", sku="SKU-1")]
+        result = Product.save_many(products)
+        self.assertEqual((len(result.created), len(result.errors)), (3, 1))
+        self.assertEqual(result.errors[0].code, "product_invalid_sku")
+
+    def test_throttling_is_retried(self):
+        self.server.throttle_every = 2
+        self.assertEqual(len(Order.all()), 1)
+        self.assertEqual(len(list(Product.iter_all(per_page=5))), 25)
+        self.assertGreater(self.server.throttled, 0)
+        self.assertEqual(WooCommerce.get_instance().retries, self.server.throttled)
+
+    def test_unknown_routes(self):
+        response = WooCommerce.get_instance().get("coupons")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["code"], "rest_no_route")
+        self.assertEqual(WooCommerce.get_instance().get("products/9999/variations").status_code, 404)
+
+
+class TestRecordReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cassette = os.path.join(self.directory.name, "cassette.jsonl")
+
+    def tearDown(self):
+        WooCommerce.remove()
+        self.directory.cleanup()
+
+    def test_replay_recorded_session(self):
+        with MockServer(catalog()) as server:
+            transport = Transport(server.url, "ck_test", "cs_test")
+            WooCommerce.register(WooCommerce.DEFAULT, Connection(RecordingTransport(transport, self.cassette)))
+            recorded = list(Product.iter_all(per_page=10))
+            Order.get(500)
+            transport.close()
+
+        replay = ReplayTransport(self.cassette)
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(replay))
+        for _ in range(2):  # Replayed as many times as needed
+            self.assertEqual(list(Product.iter_all(per_page=10)), recorded)
+        self.assertEqual(Order.get(500).line_items[0].product_id, 100)
+        self.assertEqual(replay.requests, 7)
+
+        with self.assertRaises(LookupError):
+            Product.get(101)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.products.tag import ProductTag
+from wooODM.orders.notes import OrderNote
+from fakes import FakeStoreAPI
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"products/tags": [{"id": i, "name": f"Tag {i}"} for i in range(1, 251)]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_all_returns_single_page(self):
+        tags = ProductTag.all(per_page=5, page=2)
+        self.assertEqual([tag.id for tag in tags], [6, 7, 8, 9, 10])
+
+    def test_iter_all_walks_every_page(self):
+        ids = [tag.id for tag in ProductTag.iter_all()]
+        self.assertEqual(ids, list(range(1, 251)))
+        self.assertEqual([params["page"] for _, _, params in self.api.requests], [1, 2, 3])
+        self.assertTrue(all(params["per_page"] == 100 for _, _, params in self.api.requests))
+
+    def test_iter_all_is_lazy(self):
+        iterator = ProductTag.all(paginate=True)
+        self.assertEqual(self.api.requests, [])
+        next(iterator)
+        self.assertEqual(len(self.api.requests), 1)
+
+    def test_resume_from_page(self):
+        pages = ProductTag.iter_pages(per_page=100)
+        first = next(pages)
+        self.assertEqual((first.total, first.total_pages, first.next), (250, 3, 2))
+
+        ids = [tag.id for tag in ProductTag.iter_all(page=first.next)]
+        self.assertEqual(ids, list(range(101, 251)))
+
+    def test_iter_all_without_headers(self):
+        self.api.headers = False
+        ids = [tag.id for tag in ProductTag.iter_all(per_page=50)]
+        self.assertEqual(ids, list(range(1, 251)))
+        # The last page was full, so one extra (empty) page is requested to detect the end
+        self.assertEqual(len(self.api.requests), 6)
+
+    def test_double_id_iteration_sets_parent(self):
+        self.api.data["orders/42/notes"] = [{"id": i, "note": f"Note {i}"} for i in range(1, 151)]
+        notes = list(OrderNote.iter_all(42))
+        self.assertEqual(len(notes), 150)
+        self.assertTrue(all(note.id1 == 42 for note in notes))
+        self.assertTrue(all(endpoint == "orders/42/notes/" for endpoint in self.api.endpoints()))
+
+    def test_parallel_pages_in_order(self):
+        self.api.data["products/tags"] = [{"id": i, "name": f"Tag {i}"} for i in range(1, 1001)]
+        pages = list(ProductTag.iter_pages(per_page=50, workers=4))
+        self.assertEqual([page.number for page in pages], list(range(1, 21)))
+        ids = [tag.id for page in pages for tag in page.items]
+        self.assertEqual(ids, list(range(1, 1001)))
+
+    def test_parallel_respects_max_in_flight(self):
+        self.api.data["products/tags"] = [{"id": i, "name": f"Tag {i}"} for i in range(1, 501)]
+        lock = threading.Lock()
+        active, peak = 0, 0
+        get = self.api.get
+
+        def slow_get(endpoint, params=None, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return get(endpoint, params=params, **kwargs)
+
+        self.api.get = slow_get
+        pages = list(ProductTag.iter_pages(per_page=10, workers=8, max_in_flight=3, ordered=False))
+        self.assertEqual(sorted(page.number for page in pages), list(range(1, 51)))
+        self.assertLessEqual(peak, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
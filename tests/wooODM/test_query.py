@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.products.product import Product
+from wooODM.products.variations import ProductVariation
+from wooODM.query import PartialModel
+from fakes import FakeStoreAPI
+
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"products": [
+            {"id": i, "name": f"Product {i}", "sku": f"SKU-{i}", "stock_quantity": i, "status": "publish" if i % 2 else "draft"}
+            for i in range(1, 11)
+        ]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_filters_and_ordering_become_params(self):
+        query = Product.query().filter(status="publish", category=12, include=[1, 2], featured=True,
+                                       after=datetime(2024, 1, 1)).order_by("-modified")
+        list(query)
+        self.assertEqual(self.api.requests[0][2], {
+            "status": "publish", "category": 12, "include": "1,2", "featured": "true", "after": "2024-01-01T00:00:00",
+            "orderby": "modified", "order": "desc", "per_page": 100, "page": 1,
+        })
+
+    def test_queries_are_immutable(self):
+        base = Product.query().filter(status="publish")
+        base.filter(sku="SKU-1")
+        self.assertEqual(base.params(), {"status": "publish"})
+
+    def test_results_are_models(self):
+        products = Product.query().filter(status="publish").all()
+        self.assertEqual([product.id for product in products], [1, 3, 5, 7, 9])
+        self.assertIsInstance(products[0], Product)
+
+    def test_projection_returns_partial_models(self):
+        items = Product.query().only("sku", "stock_quantity").all()
+        self.assertEqual(self.api.requests[0][2]["_fields"], "id,sku,stock_quantity")
+        self.assertIsInstance(items[0], PartialModel)
+        self.assertNotIsInstance(items[0], Product)
+        self.assertEqual((items[0].id, items[0].sku, items[0].stock_quantity), (1, "SKU-1", 1))
+        self.assertFalse(hasattr(items[0], "name"))
+
+    def test_unknown_projection_field(self):
+        with self.assertRaises(ValueError):
+            Product.query().only("colour").all()
+
+    def test_first_and_count(self):
+        self.assertEqual(Product.query().filter(status="draft").first().id, 2)
+        self.assertEqual(Product.query().filter(status="draft").count(), 5)
+
+    def test_count_without_total_header(self):
+        self.api.headers = False
+        self.assertEqual(Product.query().filter(status="draft").per_page(2).count(), 5)
+        self.assertEqual(Product.query().filter(status="trash").count(), 0)
+
+    def test_double_id_query(self):
+        self.api.data["products/7/variations"] = [{"id": 1, "sku": "V-1", "status": "publish"}]
+        variations = ProductVariation.query(7).all()
+        self.assertEqual(self.api.requests[0][1], "products/7/variations/")
+        self.assertEqual(variations[0].id1, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wooODM.ratelimit import RateLimiter, RetryPolicy, parse_retry_after
+from wooODM.transport import Transport
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Throttles the first `throttle` requests with a 429 and Retry-After: 0, then answers normally.
+    """
+    protocol_version = "HTTP/1.1"
+    throttle = 0
+    status = 429
+    requests = []
+
+    def respond(self):
+        self.requests.append(self.command)
+        if len(self.requests) <= self.throttle:
+            body = json.dumps({"message": "Too many requests"}).encode()
+            self.send_response(self.status)
+            self.send_header("Retry-After", "0")
+        else:
+            body = json.dumps([{"id": 1, "name": "Shirt"}]).encode()
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = respond
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_token_bucket(self):
+        clock = Clock()
+        limiter = RateLimiter(rate=2, burst=2, clock=clock)
+        self.assertEqual([limiter.reserve() for _ in range(4)], [0, 0, 0.5, 1.0])
+        clock.now = 10
+        self.assertEqual(limiter.reserve(), 0)
+
+    def test_aimd(self):
+        clock = Clock()
+        limiter = RateLimiter(rate=10, min_rate=1, max_rate=12, increase=1, clock=clock)
+        limiter.on_throttle()
+        self.assertEqual(limiter.rate, 5)
+        limiter.on_throttle()  # Within the cooldown, already in flight
+        self.assertEqual(limiter.rate, 5)
+        for _ in range(5):
+            limiter.on_success()
+        self.assertAlmostEqual(limiter.rate, 6, delta=0.1)
+        for _ in range(1000):
+            limiter.on_success()
+        self.assertEqual(limiter.rate, 12)
+        self.assertEqual(limiter.stats.throttled, 2)
+
+    def test_retry_after_pauses_requests(self):
+        clock = Clock()
+        limiter = RateLimiter(rate=100, clock=clock)
+        limiter.on_throttle(retry_after=3)
+        self.assertEqual(limiter.reserve(), 3)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7"), 7)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_backoff(self):
+        policy = RetryPolicy(retries=3, backoff=1, max_backoff=5)
+        self.assertTrue(policy.should_retry("get", 3))
+        self.assertFalse(policy.should_retry("GET", 4))
+        self.assertFalse(policy.should_retry("POST", 1))
+        self.assertLessEqual(policy.delay(10), 5)
+        self.assertEqual(policy.delay(1, retry_after=2), 2)
+        self.assertIsNone(policy.delay(1, retry_after=3600))
+
+
+class TestRetries(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.requests = []
+        Handler.status = 429
+
+    def test_throttled_get_is_retried(self):
+        Handler.throttle = 2
+        limiter = RateLimiter(rate=1000)
+        transport = Transport(self.url, "ck", "cs", rate_limiter=limiter)
+        response = transport.get("products")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(Handler.requests), 3)
+        self.assertEqual(transport.retries, 2)
+        self.assertEqual(limiter.stats.throttled, 2)
+        self.assertLess(limiter.rate, 1000)
+        transport.close()
+
+    def test_post_is_not_retried(self):
+        Handler.throttle = 1
+        transport = Transport(self.url, "ck", "cs")
+        self.assertEqual(transport.post("products", {"name": "Shirt"}).status_code, 429)
+        self.assertEqual(len(Handler.requests), 1)
+        transport.close()
+
+    def test_gives_up_after_retries(self):
+        Handler.throttle = 10
+        Handler.status = 503
+        transport = Transport(self.url, "ck", "cs", retry=RetryPolicy(retries=2, backoff=0))
+        self.assertEqual(transport.get("products").status_code, 503)
+        self.assertEqual(len(Handler.requests), 3)
+        transport.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
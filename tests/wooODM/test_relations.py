@@ -0,0 +1,88 @@
+import unittest
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.orders.order import Order
+from wooODM.products.product import Product
+from wooODM.relations import prefetch
+from fakes import FakeStoreAPI
+
+DATA = {
+    "orders": [
+        {"id": 100, "customer_id": 7, "line_items": [{"id": 1, "product_id": 1, "variation_id": 11},
+                                                     {"id": 2, "product_id": 2}]},
+        {"id": 101, "customer_id": 0, "line_items": [{"id": 3, "product_id": 1, "variation_id": 12}]},
+        {"id": 102, "customer_id": 8, "line_items": [{"id": 4, "product_id": 3}]},
+    ],
+    "customers": [{"id": 7, "email": "jane@example.com", "username": "jane"},
+                  {"id": 8, "email": "john@example.com", "username": "john", "role": "shop_manager"}],
+    "products": [{"id": 1, "name": "Shirt", "type": "variable", "variations": [11, 12], "upsell_ids": [2, 3]},
+                 {"id": 2, "name": "Hat"}, {"id": 3, "name": "Scarf"}],
+    "products/1/variations": [{"id": 11, "sku": "SHIRT-S"}, {"id": 12, "sku": "SHIRT-M"}],
+}
+
+
+class TestRelations(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI(DATA)
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_lazy_accessors(self):
+        order = Order.get(100)
+        self.assertEqual(order.customer.username, "jane")
+        self.assertEqual(order.line_items[0].product.name, "Shirt")
+        variation = order.line_items[0].variation
+        self.assertEqual((variation.sku, variation.id1), ("SHIRT-S", 1))
+        self.assertIsNone(order.line_items[1].variation)
+
+        requests = len(self.api.requests)
+        order.customer  # Loaded once
+        self.assertEqual(len(self.api.requests), requests)
+
+        order.customer_id = 8  # Reloaded when the ID changes
+        self.assertEqual(order.customer.username, "john")
+        self.assertFalse("customer" in order.model_dump())
+
+        self.assertIsNone(Order.get(101).customer)  # Guest
+
+    def test_lists_of_ids(self):
+        shirt = Product.get(1)
+        self.assertEqual([product.name for product in shirt.upsells], ["Hat", "Scarf"])
+        self.assertEqual([variation.sku for variation in shirt.product_variations], ["SHIRT-S", "SHIRT-M"])
+        self.assertEqual(shirt.cross_sells, [])
+
+    def test_prefetch_query(self):
+        orders = Order.query().prefetch("customer", "line_items.product", "line_items.variation").all()
+        self.assertEqual(len(self.api.requests), 4)  # Orders, customers, products, variations of product 1
+        customers = next(params for _, endpoint, params in self.api.requests if endpoint == "customers")
+        self.assertEqual((customers["include"], customers["role"]), ("7,8", "all"))
+        products = next(params for _, endpoint, params in self.api.requests if endpoint == "products")
+        self.assertEqual(products["include"], "1,2,3")
+
+        self.assertEqual([order.customer.username if order.customer else None for order in orders], ["jane", None, "john"])
+        self.assertEqual(orders[1].line_items[0].variation.sku, "SHIRT-M")
+        self.assertEqual(orders[2].line_items[0].product.name, "Scarf")
+        self.assertEqual(len(self.api.requests), 4)
+
+    def test_prefetch_items(self):
+        products = Product.query().filter(include=[1]).all()
+        prefetch(products, "upsells", "product_variations")
+        self.assertEqual(len(self.api.requests), 3)
+        self.assertEqual([product.id for product in products[0].upsells], [2, 3])
+
+        with self.assertRaises(ValueError):
+            prefetch(products, "colour")
+        with self.assertRaises(ValueError):
+            Order.query().fast().prefetch("line_items.product").all()
+
+    def test_prefetch_fast_items(self):
+        orders = Order.query().fast().prefetch("customer").all()
+        self.assertFalse(orders[0].is_validated())
+        self.assertEqual(orders[0].customer.email, "jane@example.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
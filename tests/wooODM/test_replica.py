@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.customers.customer import Customer
+from wooODM.orders.order import Order
+from wooODM.products.category import Category
+from wooODM.products.product import Product
+from wooODM.products.tag import ProductTag
+from wooODM.products.variations import ProductVariation
+from wooODM.replica import Replica
+from wooODM.sync import SyncCursor
+from fakes import FakeStoreAPI
+
+
+def store() -> dict:
+    return {
+        "products": [
+            {"id": 1, "name": "Shirt", "sku": "SHIRT", "type": "variable", "date_modified_gmt": "2024-01-01T10:00:00"},
+            {"id": 2, "name": "Hat", "sku": "HAT", "status": "draft", "date_modified_gmt": "2024-01-02T10:00:00"},
+        ],
+        "products/1/variations": [
+            {"id": 11, "sku": "SHIRT-S", "date_modified_gmt": "2024-01-01T10:00:00"},
+            {"id": 12, "sku": "SHIRT-M", "date_modified_gmt": "2024-01-01T10:00:00"},
+        ],
+        "products/categories": [{"id": 5, "name": "Clothes", "slug": "clothes"}],
+        "products/tags": [{"id": 6, "name": "Summer", "slug": "summer"}],
+        "customers": [{"id": 7, "email": "jane@example.com", "username": "jane", "date_modified_gmt": "2024-01-01T10:00:00"}],
+        "orders": [
+            {"id": 100, "status": "completed", "date_created_gmt": "2024-01-03T09:00:00",
+             "date_modified_gmt": "2024-01-03T10:00:00",
+             "line_items": [{"id": 1, "product_id": 1, "variation_id": 11, "sku": "SHIRT-S", "quantity": 2}]},
+            {"id": 101, "status": "processing", "date_created_gmt": "2024-01-10T09:00:00",
+             "date_modified_gmt": "2024-01-10T10:00:00",
+             "line_items": [{"id": 2, "product_id": 2, "sku": "HAT", "quantity": 1}]},
+        ],
+    }
+
+
+class TestReplica(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI(store())
+        self.directory = tempfile.TemporaryDirectory()
+        self.replica = Replica(os.path.join(self.directory.name, "replica.db"))
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api, replica=self.replica))
+
+    def tearDown(self):
+        WooCommerce.remove()
+        self.directory.cleanup()
+
+    def test_sync_copies_every_model(self):
+        written = self.replica.sync()
+        self.assertEqual(written, {"Category": 1, "ProductTag": 1, "Product": 2, "Customer": 1, "Order": 2,
+                                   "ProductVariation": 2})
+        self.assertEqual(Product.local().filter(sku="HAT").first().name, "Hat")
+        self.assertEqual(Category.local().first().slug, "clothes")
+        self.assertEqual(ProductTag.local().count(), 1)
+        self.assertEqual(Customer.local().filter(email="jane@example.com").ids(), [7])
+
+        variation = ProductVariation.local(1).filter(sku="SHIRT-M").first()
+        self.assertEqual((variation.id, variation.id1), (12, 1))
+
+    def test_queries(self):
+        self.replica.sync()
+        self.assertEqual(Product.local().filter(status="publish").ids(), [1])
+        self.assertEqual(Product.local().filter(status__in=["publish", "draft"]).order_by("-sku").ids(), [1, 2])
+        self.assertEqual(Product.local().filter(name="Hat").ids(), [2])  # Not indexed, read from the JSON
+        self.assertEqual(Order.local().filter(date_created_gmt__gte=datetime(2024, 1, 5)).ids(), [101])
+
+        shirts = Order.local().filter(line_items__sku="SHIRT-S", date_created_gmt__lt=datetime(2024, 1, 8))
+        self.assertEqual(shirts.count(), 1)
+        order = shirts.first()
+        self.assertEqual(order.line_items[0].quantity, 2)
+        self.assertFalse(order.is_dirty())
+
+        self.assertEqual(self.replica.execute(
+            "SELECT sku, SUM(quantity) FROM wooodm_order_line_item GROUP BY sku ORDER BY sku"
+        ), [("HAT", 1), ("SHIRT-S", 2)])
+
+    def test_fast_queries(self):
+        self.replica.sync()
+        order = Order.local().fast().filter(id=100).first()
+        self.assertFalse(order.is_validated())
+        self.assertEqual(order.line_items[0]["sku"], "SHIRT-S")
+
+    def test_incremental_sync(self):
+        self.replica.sync()
+        self.assertEqual(self.replica.cursor(Order).last_id, 101)
+
+        self.api.data["orders"][0] = {**self.api.data["orders"][0], "status": "refunded",
+                                      "date_modified_gmt": "2024-01-11T10:00:00", "line_items": []}
+        self.api.requests = []
+        written = self.replica.sync()
+        self.assertEqual((written["Order"], written["Product"], written["ProductVariation"]), (1, 0, 0))
+        self.assertEqual(Order.local().filter(status="refunded").ids(), [100])
+        self.assertEqual(Order.local().filter(line_items__sku="SHIRT-S").count(), 0)
+        # The variations of the unchanged variable product are only asked for their changes
+        self.assertEqual([params.get("modified_after") for _, endpoint, params in self.api.requests
+                          if endpoint.startswith("products/1/variations")], ["2024-01-01T09:59:59"])
+
+    def test_variation_only_changes(self):
+        self.replica.sync()
+        self.api.data["products/1/variations"][0].update({"stock_quantity": 3, "date_modified_gmt": "2024-01-05T10:00:00"})
+        written = self.replica.sync()
+        self.assertEqual((written["Product"], written["ProductVariation"]), (0, 1))
+        self.assertEqual(ProductVariation.local(1).filter(sku="SHIRT-S").first().stock_quantity, 3)
+        self.assertEqual(self.replica.cursor(ProductVariation, 1), SyncCursor(datetime(2024, 1, 5, 10), 11))
+
+        # A change of the parent product copies its variations again, dropping the deleted ones
+        del self.api.data["products/1/variations"][1]
+        self.api.data["products"][0]["date_modified_gmt"] = "2024-01-06T10:00:00"
+        self.replica.sync()
+        self.assertEqual(ProductVariation.local(1).ids(), [11])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            Product.local().filter(colour="red")
+
+
+if __name__ == "__main__":
+    unittest.main()
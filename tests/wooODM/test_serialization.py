@@ -0,0 +1,82 @@
+import json
+import unittest
+from datetime import datetime
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce, _read_only_fields
+from wooODM.orders.notes import OrderNote
+from wooODM.products.product import Product, ImageProperties
+from wooODM.products.variations import ProductVariation
+from wooODM.transport import Transport
+from fakes import FakeStoreAPI
+
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"products": [{"id": 10, "name": "Shirt", "sku": "SHIRT"}]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_read_only_fields(self):
+        self.assertIn("date_created_gmt", _read_only_fields(Product))
+        self.assertIn("price", _read_only_fields(Product))
+        self.assertNotIn("regular_price", _read_only_fields(Product))
+        self.assertTrue(Product.model_json_schema()["properties"]["permalink"]["readOnly"])
+
+    def test_create_payload(self):
+        product = Product(name="Shirt", regular_price="9.99", price="9.99", date_on_sale_from=datetime(2024, 5, 1),
+                          images=[ImageProperties(src="https://shop.example/1.png", date_created=datetime(2024, 1, 1))])
+        product.save()
+        _, endpoint, data = self.api.requests[0]
+        self.assertEqual(endpoint, "products")
+        self.assertEqual(data["date_on_sale_from"], "2024-05-01T00:00:00")
+        self.assertEqual(data["images"][0]["date_created"], "2024-01-01T00:00:00")  # Dates inside lists too
+        self.assertNotIn("price", data)  # Read-only
+        self.assertNotIn("sku", data)  # Unset
+        self.assertNotIn("id", data)
+
+    def test_update_sends_cleared_fields(self):
+        product = Product.model_validate({"id": 10, "name": "Shirt", "sku": "SHIRT", "date_on_sale_to": "2024-06-01T00:00:00"})
+        product._take_snapshot()
+        product.date_on_sale_to = None
+        product.name = "Blue shirt"
+        product.save()
+        self.assertEqual(self.api.requests[0][2], {"id": 10, "name": "Blue shirt", "date_on_sale_to": None})
+
+    def test_unloaded_item_sends_no_nulls(self):
+        Product(id=10, name="Renamed").save()
+        _, _, data = self.api.requests[0]
+        self.assertEqual((data["id"], data["name"]), (10, "Renamed"))
+        self.assertNotIn(None, data.values())
+        self.assertEqual(self.api.item("products", 10)["sku"], "SHIRT")
+
+    def test_fast_item_sends_no_nulls(self):
+        product = Product.get(10, fast=True)
+        product.name = "Renamed"
+        product.save()
+        _, _, data = self.api.requests[-1]
+        self.assertEqual((data["name"], data["sku"]), ("Renamed", "SHIRT"))
+        self.assertNotIn(None, data.values())
+
+    def test_double_id_models(self):
+        ProductVariation(id1=3, regular_price="5.00", date_on_sale_to=datetime(2024, 6, 1)).save()
+        method, endpoint, data = self.api.requests[0]
+        self.assertEqual((method, endpoint.rstrip("/")), ("POST", "products/3/variations"))
+        self.assertEqual(data["date_on_sale_to"], "2024-06-01T00:00:00")
+        self.assertNotIn("id1", data)
+
+        note = OrderNote(id1=7, note="Shipped")
+        note.save()
+        self.assertEqual(self.api.requests[1][2], {"note": "Shipped", "customer_note": False, "added_by_user": False})
+
+    def test_payload_is_encoded_once(self):
+        transport = Transport("https://shop.example", "ck", "cs")
+        body = transport._prepare("POST", "products", {"name": "Café"})[4]
+        self.assertEqual(json.loads(body), {"name": "Café"})
+        self.assertIs(transport._prepare("POST", "products", body)[4], body)
+
+
+if __name__ == "__main__":
+    unittest.main()
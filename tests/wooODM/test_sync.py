@@ -0,0 +1,104 @@
+import unittest
+from datetime import datetime, timezone, timedelta
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.mock import MockServer, MockStore
+from wooODM.orders.order import Order
+from wooODM.products.product import Product
+from wooODM.products.tag import ProductTag
+from wooODM.sync import SyncCursor
+from fakes import FakeStoreAPI
+
+
+def order(order_id, modified):
+    return {"id": order_id, "status": "processing", "date_modified_gmt": modified}
+
+
+class TestChangedSince(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeStoreAPI({"orders": [
+            order(1, "2024-01-01T10:00:00"),
+            order(2, "2024-01-02T10:00:00"),
+            order(3, "2024-01-02T10:00:00"),
+            order(4, "2024-01-03T10:00:00"),
+        ]})
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(self.api))
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_full_sync_then_delta(self):
+        stream = Order.changed_since()
+        self.assertEqual([item.id for item in stream], [1, 2, 3, 4])
+        self.assertEqual(stream.cursor, SyncCursor(datetime(2024, 1, 3, 10), 4))
+        self.assertEqual(self.api.requests[0][2]["orderby"], "modified")
+        self.assertNotIn("modified_after", self.api.requests[0][2])
+
+        self.api.data["orders"].append(order(5, "2024-01-04T10:00:00"))
+        stream = Order.changed_since(stream.cursor)
+        self.assertEqual([item.id for item in stream], [5])
+        self.assertEqual(self.api.requests[-1][2]["dates_are_gmt"], "true")
+
+    def test_ties_are_resolved_by_id(self):
+        cursor = SyncCursor(datetime(2024, 1, 2, 10), 2)
+        self.assertEqual([item.id for item in Order.changed_since(cursor)], [3, 4])
+
+    def test_resume_delivers_same_second_items_with_lower_ids(self):
+        stream = Order.changed_since()
+        self.assertEqual([item.id for item in stream], [1, 2, 3, 4])
+        # Order 0 is modified in the same second as order 4, after the sync read it
+        self.api.data["orders"].append(order(0, "2024-01-03T10:00:00"))
+        cursor = SyncCursor.parse(str(stream.cursor))
+        self.assertEqual([item.id for item in Order.changed_since(cursor)], [0])
+        cursor = SyncCursor.from_dict(stream.cursor.to_dict())
+        self.assertEqual([item.id for item in Order.changed_since(cursor)], [0])
+
+    def test_cursor_advances_while_consuming(self):
+        # 12:00 at UTC+2 is 10:00 GMT, when order 1 was modified
+        stream = Order.changed_since(SyncCursor.since(datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))))
+        items = iter(stream)
+        self.assertEqual(next(items).id, 1)
+        self.assertEqual(stream.cursor, SyncCursor(datetime(2024, 1, 1, 10), 1))
+        self.assertEqual(next(items).id, 2)
+        self.assertEqual(stream.cursor, SyncCursor(datetime(2024, 1, 2, 10), 2))
+        self.assertEqual(self.api.requests[0][2]["modified_after"], "2024-01-01T09:59:59")
+
+    def test_cursor_round_trip(self):
+        cursor = SyncCursor(datetime(2024, 1, 2, 10, 30), 42, frozenset({7, 42}))
+        self.assertEqual(SyncCursor.parse(str(cursor)).seen, {7, 42})
+        self.assertEqual(SyncCursor.from_dict(cursor.to_dict()).seen, {7, 42})
+        self.assertEqual(SyncCursor.parse("2024-01-02T10:30:00|42"), cursor)
+
+    def test_models_without_modification_date(self):
+        with self.assertRaises(Exception):
+            ProductTag.changed_since()
+
+
+class TestChangedSinceWhileModified(unittest.TestCase):
+
+    def setUp(self):
+        products = [{"id": number, "name": f"Product {number}", "date_modified_gmt": f"2024-01-0{number}T10:00:00"}
+                    for number in range(1, 6)]
+        self.server = MockServer(MockStore({"products": products})).start()
+        WooCommerce.init(self.server.url, "ck_test", "cs_test")
+
+    def tearDown(self):
+        WooCommerce.get_connection().close()
+        WooCommerce.remove()
+        self.server.stop()
+
+    def test_items_modified_during_the_sync_do_not_hide_others(self):
+        stream = Product.changed_since(per_page=2)
+        seen = []
+        for item in stream:
+            seen.append(item.id)
+            if item.id == 2:
+                # Moves product 1 to the end of the ordering, offset pagination would skip product 3
+                self.server.store.update("products", 1, {"name": "Renamed"})
+        self.assertEqual(seen, [1, 2, 3, 4, 5, 1])
+        self.assertEqual(list(Product.changed_since(stream.cursor)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
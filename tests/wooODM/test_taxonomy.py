@@ -0,0 +1,130 @@
+import asyncio
+import unittest
+from wooODM.core import WooCommerce
+from wooODM.mock import MockServer, MockStore
+from wooODM.orders.order import Order
+from wooODM.products.category import Category
+from wooODM.products.product import Product
+from wooODM.products.tag import ProductTag
+from wooODM.taxonomy import ShippingClass, Taxonomy, slugify
+
+
+def store() -> MockStore:
+    return MockStore({
+        "products/categories": [
+            {"id": 10, "name": "Men", "slug": "men"},
+            {"id": 11, "name": "Shirts", "slug": "men-shirts", "parent": 10},
+            {"id": 12, "name": "Women", "slug": "women"},
+            {"id": 13, "name": "Shirts", "slug": "women-shirts", "parent": 12},
+        ],
+        "products/tags": [{"id": 20, "name": "Summer", "slug": "summer"}],
+        "products/shipping_classes": [{"id": 30, "name": "Bulky items", "slug": "bulky"}],
+        "products/attributes": [{"id": 40, "name": "Color", "slug": "pa_color"}],
+        "products": [{"id": 50, "name": "Scarf", "categories": [{"id": 12, "name": "Women", "slug": "women"}]}],
+        "orders": [{"id": 500, "status": "processing"}],
+    })
+
+
+class TestTaxonomy(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockServer(store()).start()
+        WooCommerce.init(self.server.url, "ck_test", "cs_test")
+        self.taxonomy = WooCommerce.set_taxonomy(Taxonomy())
+
+    def tearDown(self):
+        WooCommerce.get_connection().close()
+        WooCommerce.remove()
+        self.server.stop()
+
+    def test_slugify(self):
+        self.assertEqual(slugify(" Men's Shirts "), "men-s-shirts")
+
+    def test_lookups(self):
+        taxonomy = self.taxonomy.load()
+        requests = self.server.requests
+        self.assertEqual(taxonomy.get(Category, 11).name, "Shirts")
+        self.assertEqual(taxonomy.get(Category, "women-shirts").id, 13)
+        self.assertEqual(taxonomy.get(Category, "Women > shirts").id, 13)
+        self.assertEqual(taxonomy.get(Category, "Shirts", parent=12).id, 13)
+        self.assertEqual(taxonomy.get(ProductTag, "SUMMER").id, 20)
+        self.assertEqual(taxonomy.get(ShippingClass, "Bulky items").slug, "bulky")
+        self.assertIsNone(taxonomy.get(ProductTag, "Winter"))
+        self.assertEqual(self.server.requests, requests)  # Answered from memory
+
+        self.assertEqual([term.id for term in taxonomy.children(0)], [10, 1, 12])
+        self.assertEqual([term.id for term in taxonomy.ancestors(13)], [12])
+        self.assertEqual(taxonomy.path(13), "Women > Shirts")
+
+    def test_unknown_ids_are_fetched(self):
+        self.taxonomy.load(Category)
+        self.server.store.load({"products/categories": [{"id": 14, "name": "Hats", "slug": "hats", "parent": 10}]})
+        self.assertEqual(self.taxonomy.get(Category, 14).name, "Hats")
+        self.assertEqual(self.taxonomy.path(14), "Men > Hats")
+
+    def test_ensure_creates_missing_terms_in_one_batch(self):
+        self.taxonomy.load(ProductTag)
+        requests = self.server.requests
+        found = self.taxonomy.ensure(ProductTag, ["Summer", "Winter", "Sale", "winter"])
+        self.assertEqual(self.server.requests, requests + 1)
+        self.assertEqual(found["Summer"].id, 20)
+        self.assertEqual(found["Winter"].slug, "winter")
+        self.assertEqual(found["winter"].id, found["Winter"].id)
+        self.assertEqual(len(self.server.store.items("products/tags")), 3)
+
+    def test_ensure_category_paths(self):
+        found = self.taxonomy.ensure(Category, ["Kids > Shirts > Long sleeves", "Men > Shirts", "Kids"])
+        self.assertEqual(found["Men > Shirts"].id, 11)
+        kids = found["Kids"]
+        self.assertEqual(kids.parent, 0)
+        self.assertEqual(self.taxonomy.path(found["Kids > Shirts > Long sleeves"]), "Kids > Shirts > Long sleeves")
+        self.assertEqual(self.taxonomy.ancestors(found["Kids > Shirts > Long sleeves"])[0].id, kids.id)
+
+    def test_existing_terms_are_fetched(self):
+        self.taxonomy.load(ProductTag)
+        self.server.store.load({"products/tags": [{"id": 21, "name": "Winter", "slug": "winter"}]})
+        self.assertEqual(self.taxonomy.ensure(ProductTag, ["Winter"])["Winter"].id, 21)
+
+    def test_products_are_assigned_ids_before_save(self):
+        products = [
+            Product(name="Shirt", categories=[{"name": "Men > Shirts"}], tags=[{"name": "Summer"}, {"name": "Sale"}],
+                    shipping_class="Bulky items"),
+            Product(name="Blouse", categories=[{"name": "Women > Blouses"}], tags=[{"name": "sale"}]),
+        ]
+        result = Product.save_many(products)
+        self.assertTrue(result.ok)
+        shirt, blouse = (self.server.store.collections["products"][product.id] for product in products)
+        self.assertEqual([category["id"] for category in shirt["categories"]], [11])
+        self.assertEqual(shirt["shipping_class"], "bulky")
+        self.assertEqual(shirt["tags"][1]["id"], blouse["tags"][0]["id"])
+        blouses = self.taxonomy.get(Category, "Women > Blouses")
+        self.assertEqual((blouse["categories"][0]["id"], blouses.parent), (blouses.id, 12))
+
+        product = Product(name="Polo", categories=[{"name": "Men > Shirts"}]).save()
+        self.assertEqual(product.categories[0].id, 11)
+
+    def test_fast_product_save(self):
+        product = Product.get(50, fast=True)
+        product.tags = [{"name": "Winter"}]
+        product.save()
+        tags = self.server.store.collections["products"][50]["tags"]
+        self.assertEqual(tags[0]["id"], self.taxonomy.get(ProductTag, "Winter").id)
+
+    def test_asave(self):
+        async def create():
+            try:
+                return await Product(name="Polo", categories=[{"name": "Men > Shirts"}]).asave()
+            finally:
+                await WooCommerce.aclose()
+
+        self.assertEqual(asyncio.run(create()).categories[0].id, 11)
+
+    def test_order_save(self):
+        order = Order.get(500)
+        order.status = "completed"
+        order.save()
+        self.assertEqual(self.server.store.collections["orders"][500]["status"], "completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
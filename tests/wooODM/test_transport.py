@@ -0,0 +1,88 @@
+import gzip
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wooODM.core import WooCommerce
+from wooODM.products.product import Product
+from wooODM.transport import Transport
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Answers every request with a gzipped product list, over keep-alive connections.
+    """
+    protocol_version = "HTTP/1.1"
+    seen_headers = []
+
+    def do_GET(self):
+        self.seen_headers.append({key.lower(): value for key, value in self.headers.items()})
+        body = json.dumps([{"id": 1, "name": "Shirt"}]).encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.seen_headers = []
+
+    def tearDown(self):
+        WooCommerce.remove()
+
+    def test_connections_are_reused(self):
+        transport = Transport(self.url, "ck", "cs", pool_size=4)
+        for _ in range(5):
+            self.assertEqual(transport.get("products").json()[0]["name"], "Shirt")
+        stats = transport.pool_stats()
+        self.assertEqual((stats.hosts, stats.connections, stats.idle, stats.requests), (1, 1, 1, 5))
+        self.assertEqual(stats.max_size, 4)
+        self.assertAlmostEqual(stats.reuse_ratio, 0.8)
+        transport.close()
+
+    def test_compression_and_keep_alive_headers(self):
+        transport = Transport(self.url, "ck", "cs")
+        transport.get("products")
+        self.assertIn("gzip", Handler.seen_headers[0]["accept-encoding"])
+        self.assertEqual(Handler.seen_headers[0]["connection"], "keep-alive")
+
+        transport = Transport(self.url, "ck", "cs", compression=False)
+        transport.get("products")
+        self.assertEqual(Handler.seen_headers[1]["accept-encoding"], "identity")
+
+    def test_timeouts(self):
+        transport = Transport(self.url, "ck", "cs", timeout=7, connect_timeout=2)
+        self.assertEqual((transport.connect_timeout, transport.read_timeout), (2, 7))
+
+    def test_init_passes_transport_options(self):
+        WooCommerce.init(self.url, "ck", "cs", pool_size=32, read_timeout=30)
+        self.assertEqual(WooCommerce.get_instance().read_timeout, 30)
+        self.assertEqual(Product.all()[0].name, "Shirt")
+        self.assertEqual(WooCommerce.pool_stats().max_size, 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from wsgiref.util import setup_testing_defaults
+from wooODM.cache import ModelCache
+from wooODM.connection import Connection
+from wooODM.core import WooCommerce
+from wooODM.orders.order import Order
+from wooODM.products.product import Product
+from wooODM.replica import Replica
+from wooODM.webhooks import Delivery, WebhookReceiver, sign, verify_signature
+
+SECRET = "whsec_test"
+
+
+def delivery(topic: str, payload: dict, delivery_id: str = "1", secret: str = SECRET) -> tuple:
+    body = json.dumps(payload).encode()
+    headers = {
+        "X-WC-Webhook-Topic": topic,
+        "X-WC-Webhook-Signature": sign(body, secret),
+        "X-WC-Webhook-Delivery-ID": delivery_id,
+        "X-WC-Webhook-ID": "9",
+    }
+    return body, headers
+
+
+ORDER = {"id": 100, "status": "processing", "total": "25.00",
+         "line_items": [{"id": 1, "product_id": 1, "sku": "SHIRT", "quantity": 2}]}
+
+
+class TestSignature(unittest.TestCase):
+
+    def test_signature(self):
+        body = b'{"id": 1}'
+        self.assertTrue(verify_signature(body, sign(body, SECRET), SECRET))
+        self.assertFalse(verify_signature(body, sign(body, "other"), SECRET))
+        self.assertFalse(verify_signature(body + b" ", sign(body, SECRET), SECRET))
+        self.assertFalse(verify_signature(body, None, SECRET))
+
+
+class TestWebhookReceiver(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.replica = Replica(os.path.join(self.directory.name, "replica.db"))
+        self.cache = ModelCache()
+        WooCommerce.register(WooCommerce.DEFAULT, Connection(cache=self.cache, replica=self.replica))
+        self.receiver = WebhookReceiver(SECRET, workers=0)
+        self.deliveries = []
+        self.receiver.on("order.*", self.deliveries.append)
+
+    def tearDown(self):
+        WooCommerce.remove()
+        self.directory.cleanup()
+
+    def test_delivery_updates_cache_and_replica(self):
+        self.assertEqual(self.receiver.receive(*delivery("order.created", ORDER)), (200, "processed"))
+        received, = self.deliveries
+        self.assertIsInstance(received.item, Order)
+        self.assertEqual((received.resource, received.event, received.item.total), ("order", "created", "25.00"))
+        self.assertEqual(Order.get(100).status, "processing")  # Answered by the cache, there is no client
+        self.assertEqual(self.replica.query(Order).ids(), [100])
+
+        self.receiver.receive(*delivery("order.deleted", {"id": 100}, delivery_id="2"))
+        self.assertIsNone(self.deliveries[-1].item)
+        self.assertEqual(self.replica.query(Order).ids(), [])
+        self.assertEqual(len(self.cache.backend), 0)
+
+    def test_duplicates_are_skipped(self):
+        self.receiver.receive(*delivery("order.updated", ORDER))
+        self.assertEqual(self.receiver.receive(*delivery("order.updated", ORDER)), (200, "duplicate"))
+        self.assertEqual((len(self.deliveries), self.receiver.duplicates), (1, 1))
+
+    def test_older_deliveries_do_not_overwrite_newer_ones(self):
+        newer = {**ORDER, "status": "completed", "date_modified_gmt": "2024-01-02T10:00:00"}
+        older = {**ORDER, "status": "processing", "date_modified_gmt": "2024-01-02T09:00:00"}
+        self.receiver.receive(*delivery("order.updated", newer, delivery_id="2"))
+        self.receiver.receive(*delivery("order.updated", older, delivery_id="1"))  # Processed late
+        self.assertEqual(Order.get(100).status, "completed")
+        self.assertEqual(self.replica.query(Order).filter(status="completed").ids(), [100])
+        self.assertEqual((self.receiver.stale, len(self.deliveries)), (1, 2))
+
+        self.cache.clear()  # Also checked against the replica
+        self.receiver.receive(*delivery("order.updated", older, delivery_id="3"))
+        self.assertEqual(self.replica.query(Order).filter(status="completed").ids(), [100])
+
+    def test_deletions_in_reverse_order(self):
+        self.receiver.receive(*delivery("order.created", {**ORDER, "date_modified_gmt": "2024-01-02T09:00:00"}))
+        update = Delivery("2", "order.updated", "9", {**ORDER, "status": "completed", "date_modified_gmt": "2024-01-02T10:00:00"},
+                          received=datetime(2024, 1, 2, 10, 0, 1))
+        delete = Delivery("3", "order.deleted", "9", {"id": 100}, received=datetime(2024, 1, 2, 11))
+        # Two workers picked both up, the one with the deletion finished first
+        workers = [threading.Thread(target=self.receiver.process, args=(item,)) for item in (delete, update)]
+        for worker in workers:
+            worker.start()
+            worker.join()
+        self.assertEqual(self.replica.query(Order).ids(), [])
+        self.assertEqual(len(self.cache.backend), 0)
+        self.assertEqual((self.receiver.stale, len(self.deliveries)), (1, 3))
+
+        # The order was restored after its deletion, which is processed late
+        restore = Delivery("4", "order.updated", "9", {**ORDER, "status": "processing", "date_modified_gmt": "2024-01-02T12:00:00"},
+                           received=datetime(2024, 1, 2, 12, 0, 1))
+        late = Delivery("5", "order.deleted", "9", {"id": 100}, received=datetime(2024, 1, 2, 11, 30))
+        for item in (restore, late):
+            self.receiver.process(item)
+        self.assertEqual(self.replica.query(Order).filter(status="processing").ids(), [100])
+        self.assertEqual(Order.get(100).status, "processing")
+        self.assertEqual(self.receiver.stale, 2)
+
+    def test_rejected(self):
+        self.assertEqual(self.receiver.receive(*delivery("order.created", ORDER, secret="other"))[0], 401)
+        body, headers = delivery("order.created", ORDER)
+        self.assertEqual(self.receiver.receive(b"not json", {**headers, "X-WC-Webhook-Signature": sign(b"not json", SECRET)})[0], 400)
+        self.assertEqual(self.receiver.receive(b"webhook_id=9", {}), (200, "pong"))
+        self.assertEqual(self.deliveries, [])
+
+    def test_handlers_by_topic(self):
+        products = []
+        self.receiver.on("product.updated", products.append)
+        self.receiver.on("product.updated", lambda delivery: 1 / 0)
+        self.receiver.receive(*delivery("product.updated", {"id": 1, "name": "Shirt", "sku": "SHIRT"}))
+        self.assertIsInstance(products[0].item, Product)
+        self.assertEqual(self.deliveries, [])
+        self.assertEqual(self.receiver.failed, 1)
+        self.assertIsInstance(self.receiver.errors[0][1], ZeroDivisionError)
+
+    def test_bounded_queue(self):
+        started, release = threading.Event(), threading.Event()
+        receiver = WebhookReceiver(SECRET, workers=1, max_queue=1)
+        receiver.on("*", lambda delivery: started.set() or release.wait(5))
+        self.assertEqual(receiver.receive(*delivery("order.updated", ORDER, delivery_id="0"))[0], 202)
+        started.wait(5)  # Processed by the worker, the queue is empty
+        statuses = [receiver.receive(*delivery("order.updated", ORDER, delivery_id=str(number)))[0]
+                    for number in range(1, 5)]
+        self.assertEqual(statuses, [202, 503, 503, 503])
+        release.set()
+        receiver.join()
+        # Refused deliveries are accepted when delivered again
+        self.assertEqual(receiver.receive(*delivery("order.updated", ORDER, delivery_id="4"))[0], 202)
+        receiver.stop()
+        self.assertEqual(receiver.failed, 0)
+
+    def test_wsgi(self):
+        body, headers = delivery("order.created", ORDER)
+        environ = {"REQUEST_METHOD": "POST", "CONTENT_LENGTH": str(len(body)), "wsgi.input": io.BytesIO(body),
+                   **{"HTTP_" + name.upper().replace("-", "_"): value for name, value in headers.items()}}
+        setup_testing_defaults(environ)
+        statuses = []
+        content = self.receiver(environ, lambda status, headers: statuses.append(status))
+        self.assertEqual((statuses, content), (["200 OK"], [b"processed"]))
+        self.assertEqual(len(self.deliveries), 1)
+
+    def test_asgi(self):
+        body, headers = delivery("order.created", ORDER)
+        scope = {"type": "http", "method": "POST",
+                 "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()]}
+        chunks = [{"type": "http.request", "body": body[:10], "more_body": True},
+                  {"type": "http.request", "body": body[10:]}]
+        sent = []
+
+        async def receive():
+            return chunks.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.receiver.asgi(scope, receive, send))
+        self.assertEqual((sent[0]["status"], sent[1]["body"]), (200, b"processed"))
+        self.assertEqual(len(self.deliveries), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()